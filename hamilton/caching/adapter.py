@@ -0,0 +1,375 @@
+import logging
+import pickle
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from hamilton import graph_types
+from hamilton.caching import fingerprinting, planning, serialization
+from hamilton.caching.metrics import CacheMetrics
+from hamilton.caching.singleflight import SingleFlight
+from hamilton.caching.stores import MISSING, DiskStore, MemoryStore
+from hamilton.graph_types import HamiltonGraph
+from hamilton.lifecycle import GraphExecutionHook, NodeExecutionMethod
+from hamilton.lifecycle import base as lifecycle_base
+
+if TYPE_CHECKING:
+    from hamilton import graph, node
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCacheAdapter(
+    NodeExecutionMethod, GraphExecutionHook, lifecycle_base.BaseDoLoadCachedResults
+):
+    """Caches node results in a bounded, in-process memory tier, in front of a size-capped disk tier.
+    Cached nodes are never executed -- the result is looked up in memory, then on disk (promoting
+    it to memory), and only computed (then stored in both tiers) on a miss.
+
+    Keys are built as in the CacheAdapter: from the node's source code hash and the fingerprints
+    of its inputs (see hamilton.caching.fingerprinting). Results are stored on disk in a format
+    picked by their type (see hamilton.caching.serialization) -- e.g. dataframes as feather files,
+    numpy arrays as .npy files that are memory-mapped on load -- falling back to pickle. The size
+    on disk is used to account for results in both tiers (the pickled size, if memory-only).
+
+    Keys are computed before execution, and the requested nodes are looked up first: nodes upstream
+    of cache hits are only executed if a cache miss needs them (see hamilton.caching.planning).
+
+    Both tiers are thread-safe, and the disk tier can be shared between processes -- so this works
+    with the parallel task executors (e.g. MultiProcessingExecutor, RayTaskExecutor, as long as the
+    workers share the disk tier's directory). Workers each get their own (initially empty) memory
+    tier. The first worker to miss a result claims it, and the others wait for it to be stored
+    rather than computing it too (see `DiskStore.claim`). Likewise, threads that miss the same
+    result wait for the first one's computation (see hamilton.caching.singleflight).
+
+    Hits, misses, bytes read/written and time spent are recorded in `metrics` (see
+    hamilton.caching.metrics), for the nodes executed in this process.
+
+    .. code-block:: python
+
+        from hamilton import driver
+        from hamilton.caching.adapter import TieredCacheAdapter
+
+        cache = TieredCacheAdapter(
+            path="./hamilton-cache",
+            max_memory_bytes=512 * 1024**2,
+            max_disk_bytes=10 * 1024**3,
+            eviction_policy="lru",
+        )
+        dr = driver.Builder().with_modules(my_module).with_adapters(cache).build()
+        dr.execute(["my_node"], inputs={...})
+        cache.disk.sizes_by_node()  # {"my_node": ..., ...}
+        cache.metrics.summary()  # CacheStats(hits=..., misses=..., ...)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = "./hamilton-cache",
+        cache_vars: Optional[List[str]] = None,
+        max_memory_bytes: Optional[int] = 256 * 1024**2,
+        max_memory_entries: Optional[int] = None,
+        max_disk_bytes: Optional[int] = 1024**3,
+        eviction_policy: str = "lru",
+        ttl: Optional[float] = None,
+        formats: Sequence[str] = serialization.DEFAULT_FORMATS,
+        wait_timeout: Optional[float] = None,
+        claim_timeout: Optional[float] = None,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        """Initializes the cache.
+
+        :param path: Directory of the disk tier. None means memory-only.
+        :param cache_vars: Nodes for which to store/load results. None means all nodes.
+        :param max_memory_bytes: Capacity of the memory tier, in bytes. None means unbounded.
+        :param max_memory_entries: Maximum number of results in memory. None means unbounded.
+        :param max_disk_bytes: Capacity of the disk tier, in bytes. None means unbounded.
+        :param eviction_policy: Which results to evict first when a tier is full:
+            "lru" (least recently used), "lfu" (least frequently used) or "ttl" (oldest).
+        :param ttl: Time (in seconds) after which results expire. None means never.
+            This is required for the "ttl" eviction policy.
+        :param formats: Formats to store results in on disk, in order of preference.
+            Pickle is the fallback for results that can't be stored in any of these.
+        :param wait_timeout: Maximum time (in seconds) to wait for a result another thread/process
+            is computing, after which it is computed anyway. None means as long as it's running.
+        :param claim_timeout: Time (in seconds) after which a result being computed by a process on
+            another host is assumed to be abandoned. None means never.
+        :param metrics: Metrics to record hits/misses in, e.g. to share them between caches.
+            None means new ones.
+        """
+        self.cache_vars = cache_vars if cache_vars else []
+        self.memory = MemoryStore(
+            max_size_bytes=max_memory_bytes,
+            max_entries=max_memory_entries,
+            eviction_policy=eviction_policy,
+            ttl=ttl,
+        )
+        self.disk = (
+            DiskStore(
+                path,
+                max_size_bytes=max_disk_bytes,
+                eviction_policy=eviction_policy,
+                ttl=ttl,
+                formats=formats,
+                claim_timeout=claim_timeout,
+            )
+            if path is not None
+            else None
+        )
+        self.wait_timeout = wait_timeout
+        self.in_flight = SingleFlight()
+        self.metrics = metrics if metrics is not None else CacheMetrics()
+        # run_id -> (task_id, node_name) -> fingerprint of the node's output, see CacheAdapter.
+        # This is by run, as runs may share the adapter (E.G. concurrent calls to execute())
+        self.fingerprints: Dict[str, Dict[Tuple[Optional[str], str], str]] = {}
+
+    def run_before_graph_execution(self, *, graph: HamiltonGraph, **kwargs):
+        """Set `cache_vars` to all nodes if received None during `__init__`"""
+        if self.cache_vars == []:
+            self.cache_vars = [n.name for n in graph.nodes]
+
+    def run_after_graph_execution(self, *, run_id: str, **kwargs):
+        """Drops the fingerprints of the run."""
+        self.fingerprints.pop(run_id, None)
+
+    def do_load_cached_results(
+        self,
+        *,
+        run_id: str,
+        graph: "graph.FunctionGraph",
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Loads the cached results needed to compute `final_vars` before executing anything, so
+        that nodes upstream of cache hits are pruned. The keys computed here are reused as
+        fingerprints during execution of the same run."""
+        cache_vars = set(self.cache_vars)
+        cache_keys = planning.get_cache_keys(graph, final_vars, inputs, overrides, cache_vars)
+        fingerprints = self.fingerprints.setdefault(run_id, {})
+        fingerprints.update({(None, name): key for name, key in cache_keys.items()})
+
+        def load(node_: "node.Node") -> Any:
+            if node_.name not in cache_vars or node_.name not in cache_keys:
+                return MISSING
+            return self._load(run_id, cache_keys[node_.name], node_.name)
+
+        return planning.load_cached_results(graph, final_vars, overrides, load)
+
+    def _load(self, run_id: str, cache_key: str, node_name: str) -> Any:
+        """Looks a result up in the memory tier, then the disk tier (promoting it to memory).
+        Hits are recorded in the metrics, misses are recorded once computed."""
+        start = time.perf_counter()
+        size = None
+        result = self.memory.get(cache_key)
+        if result is MISSING and self.disk is not None:
+            result, size = self.disk.load(cache_key)
+            if result is not MISSING:
+                self.memory.set(cache_key, result, node_name, size)
+        if result is not MISSING:
+            self.metrics.record_hit(run_id, node_name, time.perf_counter() - start, size)
+        return result
+
+    def run_to_execute_node(
+        self,
+        *,
+        node_name: str,
+        node_callable: Any,
+        node_kwargs: Dict[str, Any],
+        task_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        **kwargs,
+    ) -> Any:
+        """Looks the result up in the memory tier, then the disk tier. On a miss, computes it
+        and stores it in both -- unless another thread/process is computing it already, in which
+        case this waits for its result."""
+        if node_name not in self.cache_vars:
+            return node_callable(**node_kwargs)
+
+        fingerprints = self.fingerprints.setdefault(run_id, {})
+        input_fingerprints = {
+            name: fingerprints[(task_id, name)]
+            for name in node_kwargs
+            if (task_id, name) in fingerprints
+        }
+        cache_key = fingerprinting.create_key(
+            graph_types.hash_source_code(node_callable, strip=True), node_kwargs, input_fingerprints
+        )
+        fingerprints[(task_id, node_name)] = cache_key
+
+        result = self._load(run_id, cache_key, node_name)
+        if result is not MISSING:
+            return result
+        # threads of this process that miss the same result wait for the first one
+        start = time.perf_counter()
+        computed = []
+
+        def compute() -> Any:
+            computed.append(True)
+            return self._compute(run_id, cache_key, node_name, node_callable, node_kwargs)
+
+        result = self.in_flight.do(cache_key, compute)
+        if not computed:
+            self.metrics.record_hit(run_id, node_name, time.perf_counter() - start)
+        return result
+
+    def _compute(
+        self,
+        run_id: str,
+        cache_key: str,
+        node_name: str,
+        node_callable: Any,
+        node_kwargs: Dict[str, Any],
+    ) -> Any:
+        """Computes a result and stores it in both tiers, or waits for another process that is
+        computing it already."""
+        # it may have been stored since we looked it up
+        result = self._load(run_id, cache_key, node_name)
+        if result is not MISSING:
+            return result
+        claimed = self.disk is not None and self.disk.claim(cache_key)
+        if self.disk is not None and not claimed:
+            # another thread/process is computing it
+            start = time.perf_counter()
+            result, size = self.disk.wait(cache_key, self.wait_timeout)
+            if result is not MISSING:
+                self.memory.set(cache_key, result, node_name, size)
+                self.metrics.record_hit(run_id, node_name, time.perf_counter() - start, size)
+                return result
+
+        try:
+            start = time.perf_counter()
+            result = node_callable(**node_kwargs)
+            self.metrics.record_miss(run_id, node_name, time.perf_counter() - start)
+            start = time.perf_counter()
+            try:
+                if self.disk is not None:
+                    size = self.disk.set(cache_key, result, node_name)
+                else:
+                    size = len(pickle.dumps(result))
+            except Exception as e:
+                logger.warning(f"Not caching {node_name}, its result could not be serialized: {e}")
+                return result
+        finally:
+            if claimed:
+                self.disk.release(cache_key)
+        if size is not None:
+            self.memory.set(cache_key, result, node_name, size)
+            self.metrics.record_store(
+                run_id,
+                node_name,
+                time.perf_counter() - start,
+                size if self.disk is not None else None,
+            )
+        return result
+
+
+class SingleFlightAdapter(lifecycle_base.BaseDoNodeExecute, lifecycle_base.BasePostGraphExecute):
+    """Deduplicates identical computations that are in flight at the same time: while a node is
+    being computed, other calls to the same node with the same inputs (e.g. from other threads of
+    a MultiThreadingExecutor, or concurrent `execute` calls sharing the adapter) wait for its result
+    rather than computing it again. Nothing is cached once the computation completes.
+
+    Computations are keyed on their fingerprint -- the node's name and source code hash, and the
+    fingerprints of its inputs (see hamilton.caching.fingerprinting). As in the CacheAdapter, the
+    fingerprints of results computed earlier in a run are reused, so only external inputs are hashed.
+
+    This works with both the default and the task-based executors, within a process. Caching
+    adapters can't be combined with it (they execute nodes themselves), but the TieredCacheAdapter
+    deduplicates its cache misses in the same way.
+
+    .. code-block:: python
+
+        from hamilton import driver
+        from hamilton.caching.adapter import SingleFlightAdapter
+
+        dr = driver.Builder().with_modules(my_module).with_adapters(SingleFlightAdapter()).build()
+        # e.g. from many threads at once
+        dr.execute(["my_node"], inputs={...})
+    """
+
+    def __init__(self):
+        self.in_flight = SingleFlight()
+        # run_id -> (task_id, node_name) -> fingerprint of the node's output
+        self.fingerprints: Dict[str, Dict[Tuple[Optional[str], str], str]] = {}
+
+    def __getstate__(self) -> dict:
+        # fingerprints are per-process, copies (e.g. sent to task executors) start without any
+        state = self.__dict__.copy()
+        state["fingerprints"] = {}
+        return state
+
+    def do_node_execute(
+        self,
+        *,
+        run_id: str,
+        node_: "node.Node",
+        kwargs: Dict[str, Any],
+        task_id: Optional[str] = None,
+    ) -> Any:
+        """Executes the node, or waits for an identical computation that is in flight."""
+        fingerprints = self.fingerprints.setdefault(run_id, {})
+        try:
+            input_fingerprints = {
+                name: fingerprints[(task_id, name)]
+                for name in kwargs
+                if (task_id, name) in fingerprints
+            }
+            fingerprint = fingerprinting.combine(
+                node_.name,
+                fingerprinting.create_key(
+                    graph_types.hash_source_code(node_.callable, strip=True),
+                    kwargs,
+                    input_fingerprints,
+                ),
+            )
+        except Exception as e:
+            logger.debug(f"Could not fingerprint {node_.name}, executing it as-is: {e}")
+            return node_(**kwargs)
+        fingerprints[(task_id, node_.name)] = fingerprint
+        return self.in_flight.do(fingerprint, lambda: node_(**kwargs))
+
+    def post_graph_execute(self, *, run_id: str, **kwargs):
+        """Drops the fingerprints of the run."""
+        self.fingerprints.pop(run_id, None)
+
+
+class CacheMetricsHook(GraphExecutionHook):
+    """Exports the cache metrics of each run once it completes, e.g. to a metrics backend or an
+    experiment tracker. By default, the summary is logged.
+
+    .. code-block:: python
+
+        from hamilton import driver
+        from hamilton.caching.adapter import CacheMetricsHook, TieredCacheAdapter
+
+        cache = TieredCacheAdapter()
+        export = CacheMetricsHook(
+            cache.metrics, export=lambda run_id, metrics: print(run_id, metrics["summary"])
+        )
+        dr = driver.Builder().with_modules(my_module).with_adapters(cache, export).build()
+    """
+
+    def __init__(
+        self,
+        metrics: CacheMetrics,
+        export: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        """Initializes the hook.
+
+        :param metrics: Metrics of the cache, e.g. the `metrics` attribute of a caching adapter.
+        :param export: Called with the run ID and the metrics of the run (see
+            `CacheMetrics.to_dict`) after each run. None means logging the summary.
+        """
+        self.metrics = metrics
+        self.export = export if export is not None else self._log
+
+    @staticmethod
+    def _log(run_id: str, metrics: Dict[str, Any]):
+        logger.info(f"Cache metrics of run {run_id}: {metrics['summary']}")
+
+    def run_before_graph_execution(self, **kwargs):
+        """Placeholder required to subclass `GraphExecutionHook`"""
+        pass
+
+    def run_after_graph_execution(self, *, run_id: str, **kwargs):
+        """Exports the metrics of the run."""
+        self.export(run_id, self.metrics.to_dict(run_id))
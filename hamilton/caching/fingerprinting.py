@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import operator
+import pickle
+from collections.abc import Mapping, Sequence, Set
+from functools import singledispatch
+from typing import Any, Callable, Collection, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+"""
+Content-addressed fingerprinting of values, used to build cache keys.
+
+A fingerprint is a hex digest that only depends on the content (and type) of a value, so it is
+stable across processes and runs. The base implementation pickles the value -- libraries with
+large buffers (pandas, numpy, pyarrow) register cheaper, zero-copy implementations below.
+Containers are pickled in a single pass too, with only the elements that need a hasher of their
+own (E.G. arrays, mappings) replaced by their fingerprints.
+
+Fingerprints compose: the fingerprint of a node's output is derived from the node's code hash and
+the fingerprints of its inputs (see `combine`), so data never needs to be re-hashed downstream.
+
+To support a new type:
+
+@hash_value.register(MyType)
+def hash_my_type(obj: MyType, depth: int = 0) -> str:
+    ...
+"""
+
+MAX_DEPTH = 4  # past this depth, containers are hashed as a whole through pickle
+
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _type_name(obj: Any) -> bytes:
+    return f"{type(obj).__module__}.{type(obj).__qualname__}".encode()
+
+
+def combine(*fingerprints: str) -> str:
+    """Combines fingerprints (e.g. a code hash and the input fingerprints) into a single one.
+
+    :param fingerprints: Fingerprints to combine, order matters.
+    :return: The combined fingerprint.
+    """
+    return _digest(*(fingerprint.encode() for fingerprint in fingerprints))
+
+
+def create_key(
+    code_hash: str,
+    inputs: Dict[str, Any],
+    input_fingerprints: Optional[Dict[str, str]] = None,
+) -> str:
+    """Creates the cache key of a node call from its code hash and the fingerprints of its inputs.
+    Inputs that already have a fingerprint (e.g. outputs of upstream cached nodes) are not hashed
+    again. The key is itself the fingerprint of the node's output.
+
+    :param code_hash: Hash of the node's source code.
+    :param inputs: Inputs to the node, by name.
+    :param input_fingerprints: Known fingerprints of (some of) the inputs, by name.
+    :return: The cache key.
+    """
+    input_fingerprints = input_fingerprints if input_fingerprints is not None else {}
+    fingerprints = [code_hash]
+    for name, value in inputs.items():
+        fingerprint = input_fingerprints.get(name)
+        if fingerprint is None:
+            fingerprint = hash_value(value)
+        fingerprints.append(combine(name, fingerprint))
+    return combine(*fingerprints)
+
+
+@singledispatch
+def hash_value(obj: Any, depth: int = 0) -> str:
+    """Fingerprints a value. This falls back to hashing the pickled value.
+
+    :param obj: Value to fingerprint.
+    :param depth: Current depth of container recursion -- you should not need to pass this.
+    :return: A hex digest of the value.
+    """
+    return _digest(_type_name(obj), pickle.dumps(obj))
+
+
+@hash_value.register(type(None))
+@hash_value.register(bool)
+@hash_value.register(int)
+@hash_value.register(float)
+@hash_value.register(complex)
+@hash_value.register(str)
+def hash_primitive(obj: Any, depth: int = 0) -> str:
+    """Fingerprints a primitive through its repr, which is exact for these types."""
+    return _digest(_type_name(obj), repr(obj).encode())
+
+
+@hash_value.register(bytes)
+@hash_value.register(bytearray)
+@hash_value.register(memoryview)
+def hash_bytes(obj: Any, depth: int = 0) -> str:
+    """Fingerprints a bytes-like object directly from its buffer."""
+    return _digest(_type_name(obj), obj)
+
+
+# Elements of these types are pickled along with the container that holds them, in a single pass
+_PICKLED_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes})
+
+
+def _element(obj: Any, depth: int) -> Any:
+    """Stands in for an element of a container when pickling it. Elements of primitive types are
+    pickled as they are, and lists/tuples are inlined. Others (E.G. arrays, mappings) go by their
+    fingerprint, so that the hashers registered for them apply."""
+    if type(obj) in _PICKLED_TYPES:
+        return obj
+    if type(obj) in (list, tuple) and depth + 1 < MAX_DEPTH:
+        return type(obj).__name__, list(_elements(obj, depth + 1))
+    return "fingerprint", hash_value(obj, depth + 1)
+
+
+def _elements(obj: Collection, depth: int) -> Collection:
+    if set(map(type, obj)) <= _PICKLED_TYPES:
+        return obj
+    return [_element(item, depth) for item in obj]
+
+
+def _sorted(items: list, key: Callable[[Any], Any] = lambda item: item) -> list:
+    """Sorts the elements of an unordered container, so its fingerprint does not depend on their
+    order. Elements that cannot be compared with each other are sorted by type and repr."""
+    try:
+        return sorted(items)
+    except TypeError:
+        return sorted(items, key=lambda item: (_type_name(key(item)), repr(key(item))))
+
+
+@hash_value.register(Mapping)
+def hash_mapping(obj: Mapping, depth: int = 0) -> str:
+    """Fingerprints a mapping from its sorted (key, value) pairs, independently of insertion
+    order."""
+    if depth >= MAX_DEPTH:
+        return hash_value.dispatch(object)(obj)
+    items = list(zip(_elements(obj.keys(), depth), _elements(obj.values(), depth)))
+    # keys are unique, so sorting the pairs never compares the values
+    return _digest(_type_name(obj), pickle.dumps(_sorted(items, key=operator.itemgetter(0))))
+
+
+@hash_value.register(Sequence)
+def hash_sequence(obj: Sequence, depth: int = 0) -> str:
+    """Fingerprints a sequence (list, tuple, ...) from its elements, in order."""
+    if depth >= MAX_DEPTH:
+        return hash_value.dispatch(object)(obj)
+    return _digest(_type_name(obj), pickle.dumps(list(_elements(obj, depth))))
+
+
+@hash_value.register(Set)
+def hash_set(obj: Set, depth: int = 0) -> str:
+    """Fingerprints a set from its sorted elements."""
+    if depth >= MAX_DEPTH:
+        return hash_value.dispatch(object)(obj)
+    return _digest(_type_name(obj), pickle.dumps(_sorted(list(_elements(obj, depth)))))
+
+
+try:
+    import numpy as np  # conditional import to avoid numpy dependency
+
+    @hash_value.register(np.ndarray)
+    def hash_numpy(obj: np.ndarray, depth: int = 0) -> str:
+        """Fingerprints an array by hashing its buffer, without copying if it is contiguous.
+        Object arrays hold pointers, not data, so they go through pickle.
+        """
+        if obj.dtype.hasobject:
+            return hash_value.dispatch(object)(obj)
+        header = f"{obj.dtype.str}:{obj.shape}".encode()
+        return _digest(
+            _type_name(obj), header, np.ascontiguousarray(obj).reshape(-1).view(np.uint8)
+        )
+
+    @hash_value.register(np.generic)
+    def hash_numpy_scalar(obj: np.generic, depth: int = 0) -> str:
+        """Fingerprints a numpy scalar."""
+        return _digest(_type_name(obj), repr(obj).encode())
+
+except ImportError:
+    pass
+
+try:
+    import pandas as pd  # conditional import to avoid pandas dependency
+
+    @hash_value.register(pd.DataFrame)
+    @hash_value.register(pd.Series)
+    @hash_value.register(pd.Index)
+    def hash_pandas(obj: Any, depth: int = 0) -> str:
+        """Fingerprints a pandas object through `hash_pandas_object`, which hashes the values
+        (and index) column-wise in vectorized code. The column names and dtypes are included,
+        as they are not part of the row hashes.
+        """
+        try:
+            row_hashes = pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index))
+        except TypeError:
+            # unhashable values, e.g. lists in cells
+            return hash_value.dispatch(object)(obj)
+        if isinstance(obj, pd.DataFrame):
+            header = f"{list(obj.columns)!r}:{list(obj.dtypes.astype(str))!r}"
+        else:
+            header = f"{obj.name!r}:{obj.dtype!s}"
+        return _digest(_type_name(obj), header.encode(), row_hashes.to_numpy())
+
+except ImportError:
+    pass
+
+try:
+    import pyarrow as pa  # conditional import to avoid pyarrow dependency
+
+    def _hash_arrow_array(digest, array: pa.Array):
+        # buffers of a sliced array are shared with its parent, so the offset/length are needed
+        digest.update(f"{array.type}:{array.offset}:{len(array)}".encode())
+        for buffer in array.buffers():
+            if buffer is not None:
+                digest.update(buffer)
+
+    @hash_value.register(pa.Array)
+    @hash_value.register(pa.ChunkedArray)
+    def hash_arrow_array(obj: Any, depth: int = 0) -> str:
+        """Fingerprints an arrow array by hashing its buffers in place."""
+        digest = hashlib.sha256(_type_name(obj))
+        for chunk in obj.chunks if isinstance(obj, pa.ChunkedArray) else [obj]:
+            _hash_arrow_array(digest, chunk)
+        return digest.hexdigest()
+
+    @hash_value.register(pa.Table)
+    @hash_value.register(pa.RecordBatch)
+    def hash_arrow_table(obj: Any, depth: int = 0) -> str:
+        """Fingerprints an arrow table/record batch by hashing its column buffers in place."""
+        digest = hashlib.sha256(_type_name(obj))
+        digest.update(str(obj.schema).encode())
+        for column in obj.columns:
+            for chunk in column.chunks if isinstance(column, pa.ChunkedArray) else [column]:
+                _hash_arrow_array(digest, chunk)
+        return digest.hexdigest()
+
+except ImportError:
+    pass
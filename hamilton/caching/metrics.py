@@ -0,0 +1,192 @@
+import collections
+import dataclasses
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+"""
+Metrics of the caching adapters: hits and misses, bytes read and written, time spent loading,
+storing and computing results, and an estimate of the compute time that hits saved.
+
+They are recorded per run and per node, so that they can be queried once `execute` returns, e.g.
+to decide which nodes are worth caching:
+
+.. code-block:: python
+
+    dr.execute(["my_node"], inputs={...})
+    cache.metrics.summary()  # totals of the last run
+    cache.metrics.by_node()  # per-node stats of the last run
+"""
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Counters of a node (or of a whole run). Times are in seconds.
+
+    Byte counts only include results whose size the cache knows without measuring it (e.g. files
+    on disk). `time_saved` is the estimated compute time of the hits, minus the time spent loading
+    them -- a negative value means loading is slower than computing. Hits of nodes that were never
+    computed (as far as the metrics know) count as saving nothing.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    load_time: float = 0.0
+    store_time: float = 0.0
+    compute_time: float = 0.0
+    time_saved: float = 0.0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups that were hits, None if nothing was looked up."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            **{
+                field.name: getattr(self, field.name) + getattr(other, field.name)
+                for field in dataclasses.fields(self)
+            }
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counters as a (JSON-serializable) dictionary, including the hit rate."""
+        return {**dataclasses.asdict(self), "hit_rate": self.hit_rate}
+
+
+class CacheMetrics:
+    """Records the metrics of a cache, by run and by node. Thread-safe.
+
+    The compute time of a node is estimated from all its misses recorded here (across runs), so
+    the same metrics can be shared between adapters/drivers to improve the `time_saved` estimates.
+
+    Copies (e.g. sent to other processes by task executors) start empty: only what happens in the
+    process the metrics were created in is recorded.
+    """
+
+    def __init__(self, max_runs: Optional[int] = 100):
+        """Initializes the metrics.
+
+        :param max_runs: Number of runs to keep the metrics of (the most recent ones).
+            None means all of them.
+        """
+        self.max_runs = max_runs
+        # run_id -> node_name -> stats, in order of the runs' first record
+        self._runs: Dict[str, Dict[str, CacheStats]] = collections.OrderedDict()
+        # node_name -> (total compute time, number of computations)
+        self._compute_times: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        return {"max_runs": self.max_runs}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def _stats(self, run_id: str, node_name: str) -> CacheStats:
+        if run_id not in self._runs:
+            self._runs[run_id] = {}
+            if self.max_runs is not None and len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        return self._runs[run_id].setdefault(node_name, CacheStats())
+
+    def record_hit(
+        self, run_id: str, node_name: str, load_time: float, bytes_read: Optional[int] = None
+    ):
+        """Records a result loaded from cache.
+
+        :param run_id: ID of the run.
+        :param node_name: Name of the node.
+        :param load_time: Time spent loading the result.
+        :param bytes_read: Size of the result, if known.
+        """
+        with self._lock:
+            stats = self._stats(run_id, node_name)
+            stats.hits += 1
+            stats.load_time += load_time
+            stats.bytes_read += bytes_read or 0
+
+    def record_miss(self, run_id: str, node_name: str, compute_time: float):
+        """Records a result that was computed, as it wasn't found in cache.
+
+        :param run_id: ID of the run.
+        :param node_name: Name of the node.
+        :param compute_time: Time spent computing the result.
+        """
+        with self._lock:
+            stats = self._stats(run_id, node_name)
+            stats.misses += 1
+            stats.compute_time += compute_time
+            total, count = self._compute_times.get(node_name, (0.0, 0))
+            self._compute_times[node_name] = (total + compute_time, count + 1)
+
+    def record_store(
+        self, run_id: str, node_name: str, store_time: float, bytes_written: Optional[int] = None
+    ):
+        """Records a result stored in cache.
+
+        :param run_id: ID of the run.
+        :param node_name: Name of the node.
+        :param store_time: Time spent storing the result.
+        :param bytes_written: Size of the result, if known.
+        """
+        with self._lock:
+            stats = self._stats(run_id, node_name)
+            stats.store_time += store_time
+            stats.bytes_written += bytes_written or 0
+
+    def estimated_compute_time(self, node_name: str) -> Optional[float]:
+        """Mean time a node took to compute, None if it wasn't computed."""
+        total, count = self._compute_times.get(node_name, (0.0, 0))
+        return total / count if count else None
+
+    @property
+    def run_ids(self) -> List[str]:
+        """IDs of the runs metrics are kept for, from the oldest to the most recent."""
+        return list(self._runs)
+
+    def by_node(self, run_id: Optional[str] = None) -> Dict[str, CacheStats]:
+        """Stats of each node, for a run.
+
+        :param run_id: ID of the run. None means the most recent one.
+        :return: Node name -> stats. Empty if nothing was recorded for the run.
+        """
+        with self._lock:
+            if run_id is None:
+                run_id = next(reversed(self._runs), None)
+            by_node = {}
+            for node_name, stats in self._runs.get(run_id, {}).items():
+                stats = dataclasses.replace(stats)
+                compute_time = self.estimated_compute_time(node_name)
+                if stats.hits and compute_time is not None:
+                    stats.time_saved = stats.hits * compute_time - stats.load_time
+                by_node[node_name] = stats
+            return by_node
+
+    def summary(self, run_id: Optional[str] = None) -> CacheStats:
+        """Totals of all nodes, for a run.
+
+        :param run_id: ID of the run. None means the most recent one.
+        :return: The stats of the run.
+        """
+        return sum(self.by_node(run_id).values(), CacheStats())
+
+    def to_dict(self, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stats of a run as a (JSON-serializable) dictionary, e.g. to export them.
+
+        :param run_id: ID of the run. None means the most recent one.
+        :return: The totals ("summary") and the stats of each node ("nodes").
+        """
+        by_node = self.by_node(run_id)
+        return {
+            "summary": sum(by_node.values(), CacheStats()).to_dict(),
+            "nodes": {node_name: stats.to_dict() for node_name, stats in by_node.items()},
+        }
+
+    def clear(self):
+        """Drops all metrics, including the compute time estimates."""
+        with self._lock:
+            self._runs.clear()
+            self._compute_times.clear()
@@ -0,0 +1,112 @@
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, List
+
+from hamilton import graph_types, node
+from hamilton.caching import fingerprinting
+from hamilton.caching.stores import MISSING
+from hamilton.execution import graph_functions
+
+if TYPE_CHECKING:
+    from hamilton import graph
+
+logger = logging.getLogger(__name__)
+
+"""
+Cache-aware execution planning, used by the caching adapters to implement `do_load_cached_results`.
+
+Cache keys can be computed before executing anything -- they only depend on the code of the nodes
+and on the fingerprints of the inputs/overrides (see hamilton.caching.fingerprinting). So the
+cache can be queried for the requested nodes first, and only if a node is a miss do we need to
+look further upstream. Everything upstream of the hits that no miss depends on is never executed.
+"""
+
+
+def get_cache_keys(
+    graph: "graph.FunctionGraph",
+    final_vars: List[str],
+    inputs: Dict[str, Any],
+    overrides: Dict[str, Any],
+    cache_vars: Collection[str],
+) -> Dict[str, str]:
+    """Computes the cache keys of the nodes to execute, as the CacheAdapter computes them at
+    runtime (see `fingerprinting.create_key`) -- inputs and overrides are fingerprinted by value.
+
+    Nodes that aren't in `cache_vars` are only fingerprinted by value at runtime, so neither they,
+    nor anything downstream of them, get a key.
+
+    :param graph: Graph that is being executed
+    :param final_vars: Variables we are extracting from the graph
+    :param inputs: Inputs to the graph
+    :param overrides: Overrides to graph execution
+    :param cache_vars: Nodes that are cached
+    :return: The cache keys, by node name. This includes the fingerprints of inputs and overrides.
+    """
+    # resolved the same way as the driver does before executing, so this is memoized
+    sorted_nodes = graph.get_sorted_upstream_nodes(final_vars, inputs, overrides)
+    inputs = inputs if inputs is not None else {}
+    overrides = overrides if overrides is not None else {}
+    values = graph_functions.combine_config_and_inputs(graph.config, inputs)
+    keys = {}
+    for node_ in sorted_nodes:
+        if node_.name in overrides:
+            keys[node_.name] = fingerprinting.hash_value(overrides[node_.name])
+            continue
+        if node_.user_defined:
+            if node_.name in values:
+                keys[node_.name] = fingerprinting.hash_value(values[node_.name])
+            continue
+        if node_.name not in cache_vars:
+            continue
+        # same kwargs, in the same order, as in execute_plan -- optional inputs that aren't
+        # provided are not passed
+        kwarg_names = [
+            dependency.name
+            for dependency in node_.dependencies
+            if not dependency.user_defined
+            or dependency.name in values
+            or dependency.name in overrides
+        ]
+        if any(name not in keys for name in kwarg_names):
+            continue
+        keys[node_.name] = fingerprinting.create_key(
+            graph_types.hash_source_code(node_.callable, strip=True),
+            dict.fromkeys(kwarg_names),  # values aren't needed, all the inputs have a fingerprint
+            {name: keys[name] for name in kwarg_names},
+        )
+    return keys
+
+
+def load_cached_results(
+    graph: "graph.FunctionGraph",
+    final_vars: List[str],
+    overrides: Dict[str, Any],
+    load: Callable[[node.Node], Any],
+) -> Dict[str, Any]:
+    """Loads the cached results needed to compute `final_vars`, walking the graph from the
+    requested nodes upstream. Traversal stops at cache hits, so only the hits that a miss (or the
+    caller) depends on are loaded, and everything upstream of them is skipped.
+
+    :param graph: Graph that is being executed
+    :param final_vars: Variables we are extracting from the graph
+    :param overrides: Overrides to graph execution
+    :param load: Loads the result of a node, returning `MISSING` on a cache miss
+    :return: The loaded results, by node name
+    """
+    overrides = overrides if overrides is not None else {}
+    results = {}
+    visited = set()
+    stack = [graph.nodes[name] for name in final_vars if name in graph.nodes]
+    while len(stack) > 0:
+        node_ = stack.pop()
+        if node_.name in visited:
+            continue
+        visited.add(node_.name)
+        if node_.user_defined or node_.name in overrides:
+            continue
+        result = load(node_)
+        if result is not MISSING:
+            results[node_.name] = result
+            continue
+        stack.extend(node_.dependencies)
+    logger.debug(f"Loaded {len(results)} result(s) from cache before execution: {sorted(results)}")
+    return results
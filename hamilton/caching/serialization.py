@@ -0,0 +1,125 @@
+import dataclasses
+import functools
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from hamilton import function_modifiers  # noqa: F401 -- loads the plugins' data adapters
+from hamilton import registry
+from hamilton.io.data_adapters import DataLoader, DataSaver
+
+logger = logging.getLogger(__name__)
+
+"""
+Format-aware storage of cached results, reusing the DataSaver/DataLoader classes registered in
+hamilton.registry (the same ones that power @load_from/@save_to and materializers).
+
+The format of a result is picked by its type: the first of `formats` that has a registered saver
+and loader applicable to it is used, and `pickle` is the fallback for everything else (or if
+writing in the preferred format fails, e.g. a dataframe with non-string column names and parquet).
+"""
+
+# Formats to try, in order of preference, before falling back to pickle
+DEFAULT_FORMATS = ("npy", "feather", "parquet")
+FALLBACK_FORMAT = "pickle"
+
+# Extra arguments for the loaders, by format. Loaders that don't have the argument don't get it.
+# - .npy files are memory-mapped (copy-on-write, so the result is still writeable)
+# - dataframes are loaded with the dtypes they were saved with, not nullable ones
+LOADER_KWARGS: Dict[str, Dict[str, Any]] = {
+    "npy": {"mmap_mode": "c"},
+    "feather": {"dtype_backend": None},
+    "parquet": {"dtype_backend": None},
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class StoredResult:
+    """Reference to a result saved to a file by `save`. The type is stored (by reference, when
+    pickled) as the loaders need it."""
+
+    path: str
+    format: str
+    type_: Type
+
+
+def _find_adapter(adapters: List[Type[Any]], type_: Type) -> Optional[Type[Any]]:
+    # same resolution as function_modifiers.adapters.resolve_adapter_class: most recently registered
+    # first, and adapters that apply to Any last
+    for adapter_cls in reversed(adapters):
+        if adapter_cls.applies_to(type_):
+            return adapter_cls
+    for adapter_cls in reversed(adapters):
+        if Any in adapter_cls.applicable_types():
+            return adapter_cls
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_formats(type_: Type, formats: Sequence[str] = DEFAULT_FORMATS) -> Tuple[str, ...]:
+    """Gives the formats a result of a given type can be stored in, in order of preference.
+    The fallback format is always last.
+
+    :param type_: Type of the result
+    :param formats: Formats to consider, in order of preference
+    :return: The applicable formats
+    """
+    applicable = []
+    for format_ in formats:
+        if format_ == FALLBACK_FORMAT:
+            continue
+        saver_cls = _find_adapter(registry.SAVER_REGISTRY.get(format_, []), type_)
+        loader_cls = _find_adapter(registry.LOADER_REGISTRY.get(format_, []), type_)
+        if saver_cls is not None and loader_cls is not None:
+            applicable.append(format_)
+    return tuple(applicable) + (FALLBACK_FORMAT,)
+
+
+def _saver(format_: str, type_: Type, path: str) -> DataSaver:
+    saver_cls = _find_adapter(registry.SAVER_REGISTRY[format_], type_)
+    return saver_cls(path=path)
+
+
+def _loader(format_: str, type_: Type, path: str) -> DataLoader:
+    loader_cls = _find_adapter(registry.LOADER_REGISTRY[format_], type_)
+    fields = {field.name for field in dataclasses.fields(loader_cls)}
+    kwargs = {k: v for k, v in LOADER_KWARGS.get(format_, {}).items() if k in fields}
+    return loader_cls(path=path, **kwargs)
+
+
+def save(value: Any, path: str, formats: Sequence[str] = DEFAULT_FORMATS) -> StoredResult:
+    """Saves a result in the preferred format for its type. The file is written atomically, so
+    concurrent readers never see a partially written result.
+
+    :param value: Result to save
+    :param path: Path to save to, without extension -- the format is appended
+    :param formats: Formats to consider, in order of preference, see `get_formats`
+    :return: A reference to the stored result, to pass to `load`
+    """
+    type_ = type(value)
+    for format_ in get_formats(type_, tuple(formats)):
+        final_path = f"{path}.{format_}"
+        # unique to the writer, as others may save the same result concurrently. The extension is
+        # kept, as some savers (e.g. np.save) append it otherwise
+        temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp.{format_}"
+        try:
+            _saver(format_, type_, temp_path).save_data(value)
+            os.replace(temp_path, final_path)
+            return StoredResult(final_path, format_, type_)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if format_ == FALLBACK_FORMAT:
+                raise
+            logger.debug(f"Could not save {type_} as {format_}, trying the next format: {e}")
+
+
+def load(stored: StoredResult) -> Any:
+    """Loads a result saved with `save`.
+
+    :param stored: Reference to the stored result
+    :return: The result
+    """
+    value, _ = _loader(stored.format, stored.type_, stored.path).load_data(stored.type_)
+    return value
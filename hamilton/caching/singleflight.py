@@ -0,0 +1,61 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+"""
+Single-flight deduplication of concurrent computations, keyed on their fingerprint (see
+hamilton.caching.fingerprinting).
+
+While a computation is in flight, later callers with the same key wait on its future rather than
+computing it again -- they get its result, or its exception. Nothing is kept once it completes:
+this complements caches, which only help once a result has been stored.
+"""
+
+
+class SingleFlight:
+    """A group of in-flight computations, by key. Thread-safe.
+
+    Copies (e.g. sent to other processes) start with nothing in flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def __getstate__(self) -> dict:
+        return {}
+
+    def __setstate__(self, state: dict):
+        self.__init__()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Calls `fn`, unless a call with the same key is in flight, in which case this waits for
+        it and returns its result (or raises its exception).
+
+        :param key: Key of the computation, e.g. its fingerprint.
+        :param fn: Computation to run.
+        :return: The result of the computation.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+        if not is_leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def __len__(self) -> int:
+        """Number of computations in flight."""
+        return len(self._in_flight)
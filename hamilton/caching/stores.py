@@ -0,0 +1,581 @@
+import collections
+import contextlib
+import dataclasses
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from hamilton.caching import serialization
+
+logger = logging.getLogger(__name__)
+
+"""
+Bounded result stores, used as the tiers of the TieredCacheAdapter (see hamilton.caching.adapter).
+
+Both stores track the size of every entry and the node it belongs to, and evict entries according
+to an eviction policy once they go over capacity:
+
+- "lru": least recently accessed entries are evicted first
+- "lfu": least frequently accessed entries are evicted first (ties are broken by recency)
+- "ttl": oldest entries are evicted first
+
+Independently of the policy, entries older than `ttl` seconds (if set) are treated as missing.
+"""
+
+EVICTION_POLICIES = ("lru", "lfu", "ttl")
+
+MISSING = object()  # sentinel for cache misses, as None is a valid result
+
+MAX_POLL_INTERVAL = 1.0  # in seconds, when waiting on a result claimed by someone else
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    """Metadata about a stored result."""
+
+    key: str
+    node_name: str
+    size: int  # in bytes
+    created_at: float
+    last_accessed_at: float
+    hits: int = 0
+
+
+def _validate_policy(eviction_policy: str, ttl: Optional[float]):
+    if eviction_policy not in EVICTION_POLICIES:
+        raise ValueError(
+            f"Eviction policy {eviction_policy} is not supported. "
+            f"Supported policies are {EVICTION_POLICIES}."
+        )
+    if eviction_policy == "ttl" and ttl is None:
+        raise ValueError("The ttl eviction policy requires a ttl (in seconds).")
+
+
+def _is_alive(pid: int) -> bool:
+    """Whether a process (on this host) is running."""
+    if os.name == "nt":
+        return True  # os.kill would terminate it -- claims only expire through their timeout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # running, as another user
+    return True
+
+
+def _eviction_order(eviction_policy: str) -> Callable[[CacheEntry], Tuple]:
+    """Key to sort entries by, first evicted first."""
+    if eviction_policy == "lru":
+        return lambda entry: (entry.last_accessed_at,)
+    if eviction_policy == "lfu":
+        return lambda entry: (entry.hits, entry.last_accessed_at)
+    return lambda entry: (entry.created_at,)
+
+
+class MemoryStore:
+    """In-process store that holds results as-is. Thread-safe.
+
+    Sizes are not measured here (that would be costly for arbitrary objects) -- they are passed in
+    by the caller, which usually knows the serialized size of the result.
+    """
+
+    def __init__(
+        self,
+        max_size_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        eviction_policy: str = "lru",
+        ttl: Optional[float] = None,
+    ):
+        """Initializes the store.
+
+        :param max_size_bytes: Maximum total size of the entries. None means unbounded.
+        :param max_entries: Maximum number of entries. None means unbounded.
+        :param eviction_policy: One of "lru", "lfu", "ttl".
+        :param ttl: Time (in seconds) after which entries expire. None means never.
+        """
+        _validate_policy(eviction_policy, ttl)
+        self.max_size_bytes = max_size_bytes
+        self.max_entries = max_entries
+        self.eviction_policy = eviction_policy
+        self.ttl = ttl
+        self._eviction_order = _eviction_order(eviction_policy)
+        self._entries: Dict[str, CacheEntry] = {}
+        self._values: Dict[str, Any] = {}
+        self._size_bytes = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> dict:
+        # the memory tier is per-process: copies (e.g. sent to task executors) start empty
+        state = self.__dict__.copy()
+        for attr in ("_eviction_order", "_lock"):
+            state[attr] = None
+        state["_entries"] = {}
+        state["_values"] = {}
+        state["_size_bytes"] = 0
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._eviction_order = _eviction_order(self.eviction_policy)
+        self._lock = threading.RLock()
+
+    def _is_expired(self, entry: CacheEntry, now: float) -> bool:
+        return self.ttl is not None and now - entry.created_at > self.ttl
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Gets a result, returning `default` if it is not stored (or expired).
+
+        :param key: Key of the result.
+        :param default: Value to return on a miss.
+        :return: The result, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            now = time.time()
+            if self._is_expired(entry, now):
+                self._delete(key)
+                return default
+            entry.last_accessed_at = now
+            entry.hits += 1
+            return self._values[key]
+
+    def set(self, key: str, value: Any, node_name: str, size: int):
+        """Stores a result, evicting others if this goes over capacity. A result that is larger
+        than the capacity of the store on its own is not stored.
+
+        :param key: Key of the result.
+        :param value: Result to store.
+        :param node_name: Name of the node that produced the result, for size accounting.
+        :param size: Size of the result, in bytes.
+        """
+        if self.max_size_bytes is not None and size > self.max_size_bytes:
+            logger.debug(f"Not storing {node_name} in memory: {size} bytes is over capacity.")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._delete(key)
+            now = time.time()
+            self._entries[key] = CacheEntry(key, node_name, size, now, now)
+            self._values[key] = value
+            self._size_bytes += size
+            self._evict(key)
+
+    def delete(self, key: str):
+        """Removes a result, if present.
+
+        :param key: Key of the result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._delete(key)
+
+    def clear(self):
+        """Removes all results."""
+        with self._lock:
+            self._entries.clear()
+            self._values.clear()
+            self._size_bytes = 0
+
+    def _delete(self, key: str):
+        entry = self._entries.pop(key)
+        del self._values[key]
+        self._size_bytes -= entry.size
+
+    def _is_over_capacity(self) -> bool:
+        return (self.max_size_bytes is not None and self._size_bytes > self.max_size_bytes) or (
+            self.max_entries is not None and len(self._entries) > self.max_entries
+        )
+
+    def _evict(self, new_key: str):
+        """Evicts expired entries, then entries in policy order, until under capacity.
+        The entry that was just stored is not evicted to make room for itself."""
+        if not self._is_over_capacity():
+            return
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if self._is_expired(entry, now)]:
+            self._delete(key)
+        if not self._is_over_capacity():
+            return
+        for entry in sorted(self._entries.values(), key=self._eviction_order):
+            if entry.key == new_key:
+                continue
+            self._delete(entry.key)
+            if not self._is_over_capacity():
+                return
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored results, in bytes."""
+        return self._size_bytes
+
+    def sizes_by_node(self) -> Dict[str, int]:
+        """Total size of the stored results, in bytes, by node name."""
+        sizes = collections.Counter()
+        with self._lock:
+            for entry in self._entries.values():
+                sizes[entry.node_name] += entry.size
+        return dict(sizes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskStore:
+    """Size-capped store of results, in a directory. Results are saved in a format picked by their
+    type (see hamilton.caching.serialization), so e.g. numpy arrays are memory-mapped on load.
+    Safe to share between threads and processes -- the metadata lives in a sqlite database
+    (which does the locking), and results are written to files atomically.
+
+    Callers that share the store can avoid computing the same result twice: the first to `claim`
+    a key computes and stores it, then `release`s the claim, while the others `wait` for it.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            node_name TEXT NOT NULL,
+            path TEXT NOT NULL,
+            format TEXT NOT NULL,
+            type BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """
+    _CLAIMS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS claims (
+            key TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            pid INTEGER NOT NULL,
+            thread INTEGER NOT NULL,
+            claimed_at REAL NOT NULL
+        )
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
+        ttl: Optional[float] = None,
+        formats: Sequence[str] = serialization.DEFAULT_FORMATS,
+        claim_timeout: Optional[float] = None,
+    ):
+        """Initializes the store, creating the directory if needed.
+
+        :param path: Directory to store the results in.
+        :param max_size_bytes: Maximum total size of the entries. None means unbounded.
+        :param eviction_policy: One of "lru", "lfu", "ttl".
+        :param ttl: Time (in seconds) after which entries expire. None means never.
+        :param formats: Formats to store results in, in order of preference. Pickle is the fallback.
+        :param claim_timeout: Time (in seconds) after which a claim is considered abandoned. Claims
+            of processes that died on the same host are always considered abandoned -- this is
+            for processes on other hosts, sharing the directory. None means never.
+        """
+        _validate_policy(eviction_policy, ttl)
+        self.path = path
+        self.formats = tuple(formats)
+        self.max_size_bytes = max_size_bytes
+        self.eviction_policy = eviction_policy
+        self.ttl = ttl
+        self.claim_timeout = claim_timeout
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+        with self._transaction() as connection:
+            connection.execute(self._SCHEMA)
+            connection.execute(self._CLAIMS_SCHEMA)
+
+    def __getstate__(self) -> dict:
+        # connections and locks can't be pickled -- they are recreated lazily
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_connection"] = None
+        state["_connection_pid"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # connections must not be shared with forked processes
+        if self._connection is None or self._connection_pid != os.getpid():
+            self._connection = sqlite3.connect(
+                os.path.join(self.path, "index.db"),
+                timeout=30,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _file_path(self, key: str) -> str:
+        # the format is appended by serialization.save
+        return os.path.join(self.path, key[:2], key)
+
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def load(self, key: str) -> Tuple[Any, int]:
+        """Loads a result, along with its size on disk. Gives (MISSING, 0) if it is not stored
+        (or expired).
+
+        :param key: Key of the result.
+        :return: A tuple of the result and its size, in bytes.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT path, format, type, size, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING, 0
+            path, format_, type_, size, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                expired = True
+            else:
+                connection.execute(
+                    "UPDATE entries SET last_accessed_at = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+                expired = False
+        if expired:
+            self._remove_files([path])
+            return MISSING, 0
+        try:
+            value = serialization.load(
+                serialization.StoredResult(path, format_, pickle.loads(type_))
+            )
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            with self._transaction() as connection:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return MISSING, 0
+        return value, size
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Gets a result, returning `default` if it is not stored (or expired).
+
+        :param key: Key of the result.
+        :param default: Value to return on a miss.
+        :return: The result, or default.
+        """
+        value, _ = self.load(key)
+        return default if value is MISSING else value
+
+    def set(self, key: str, value: Any, node_name: str) -> Optional[int]:
+        """Stores a result, in the format picked for its type by hamilton.caching.serialization,
+        then evicts others if this goes over capacity. A result that is larger than the capacity
+        of the store on its own is not kept.
+
+        :param key: Key of the result.
+        :param value: Result to store.
+        :param node_name: Name of the node that produced the result, for size accounting.
+        :return: The size of the stored result, in bytes, or None if it was not kept.
+        """
+        file_path = self._file_path(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        stored = serialization.save(value, file_path, self.formats)
+        size = os.path.getsize(stored.path)
+        if self.max_size_bytes is not None and size > self.max_size_bytes:
+            logger.debug(f"Not storing {node_name} on disk: {size} bytes is over capacity.")
+            self._remove_files([stored.path])
+            return None
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, node_name, path, format, type, size, created_at, last_accessed_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    key,
+                    node_name,
+                    stored.path,
+                    stored.format,
+                    pickle.dumps(stored.type_),
+                    size,
+                    now,
+                    now,
+                ),
+            )
+            evicted = self._evict(connection, key, now)
+        self._remove_files(evicted)
+        return size
+
+    def _is_abandoned(self, host: str, pid: int, claimed_at: float, now: float) -> bool:
+        if self.claim_timeout is not None and now - claimed_at > self.claim_timeout:
+            return True
+        return host == socket.gethostname() and not _is_alive(pid)
+
+    def claim(self, key: str) -> bool:
+        """Claims the computation of a result, so that other threads/processes sharing the store
+        wait for it (see `wait`) rather than computing it too. Release it with `release` once the
+        result is stored -- or if computing it failed.
+
+        :param key: Key of the result.
+        :return: Whether the claim was acquired. This is False if the result is already stored,
+            or if someone else holds a claim on it that isn't abandoned.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (self.ttl is None or now - row[0] <= self.ttl):
+                return False
+            row = connection.execute(
+                "SELECT host, pid, claimed_at FROM claims WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not self._is_abandoned(*row, now):
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO claims (key, host, pid, thread, claimed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, socket.gethostname(), os.getpid(), threading.get_ident(), now),
+            )
+        return True
+
+    def release(self, key: str):
+        """Releases a claim acquired with `claim`. Claims held by others are left as they are.
+
+        :param key: Key of the result.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM claims WHERE key = ? AND host = ? AND pid = ? AND thread = ?",
+                (key, socket.gethostname(), os.getpid(), threading.get_ident()),
+            )
+
+    def wait(self, key: str, timeout: Optional[float] = None) -> Tuple[Any, int]:
+        """Waits for a result claimed by someone else to be stored, then loads it (see `load`).
+        Gives (MISSING, 0) if the claim is released or abandoned without the result being stored
+        (e.g. computing it failed), or after `timeout` seconds.
+
+        :param key: Key of the result.
+        :param timeout: Maximum time to wait, in seconds. None means as long as the claim holds.
+        :return: A tuple of the result and its size, in bytes.
+        """
+        start = time.time()
+        poll_interval = 0.01
+        while True:
+            value, size = self.load(key)
+            if value is not MISSING:
+                return value, size
+            now = time.time()
+            with self._transaction() as connection:
+                row = connection.execute(
+                    "SELECT host, pid, claimed_at FROM claims WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None or self._is_abandoned(*row, now):
+                # it may have been stored right before the claim was released
+                return self.load(key)
+            if timeout is not None and now - start > timeout:
+                return MISSING, 0
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL)
+
+    def delete(self, key: str):
+        """Removes a result, if present.
+
+        :param key: Key of the result.
+        """
+        with self._transaction() as connection:
+            paths = [
+                path
+                for (path,) in connection.execute("SELECT path FROM entries WHERE key = ?", (key,))
+            ]
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._remove_files(paths)
+
+    def clear(self):
+        """Removes all results."""
+        with self._transaction() as connection:
+            paths = [path for (path,) in connection.execute("SELECT path FROM entries")]
+            connection.execute("DELETE FROM entries")
+        self._remove_files(paths)
+
+    def _evict(self, connection: sqlite3.Connection, new_key: str, now: float) -> List[str]:
+        """Deletes expired entries, then entries in policy order, until the store is under capacity.
+        The entry that was just stored is not evicted to make room for itself. Returns the paths of
+        the evicted results, which are removed once the transaction is committed."""
+        if self.max_size_bytes is None:
+            return []
+        (size_bytes,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if size_bytes <= self.max_size_bytes:
+            return []
+        order_by = {
+            "lru": "last_accessed_at",
+            "lfu": "hits, last_accessed_at",
+            "ttl": "created_at",
+        }[self.eviction_policy]
+        if self.ttl is not None:
+            order_by = f"(created_at >= {now - self.ttl}), {order_by}"  # expired entries first
+        evicted = []
+        for key, path, size in connection.execute(
+            f"SELECT key, path, size FROM entries WHERE key != ? ORDER BY {order_by}", (new_key,)
+        ).fetchall():
+            if size_bytes <= self.max_size_bytes:
+                break
+            evicted.append((key, path))
+            size_bytes -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+        return [path for _, path in evicted]
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored results, in bytes."""
+        with self._transaction() as connection:
+            (size_bytes,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return size_bytes
+
+    def sizes_by_node(self) -> Dict[str, int]:
+        """Total size of the stored results, in bytes, by node name."""
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT node_name, SUM(size) FROM entries GROUP BY node_name"
+            ).fetchall()
+        return dict(rows)
+
+    def __contains__(self, key: str) -> bool:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._transaction() as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
@@ -1,5 +1,7 @@
 # code in this module should no depend on much
-from typing import Any, Callable, List, Optional, Set, Tuple, Union
+import collections
+import threading
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional, Set, Tuple, Union
 
 
 def convert_output_value(
@@ -56,3 +58,78 @@ def convert_output_values(
         error_str = f"{len(errors)} errors encountered:\n  " + "\n  ".join(errors)
         raise ValueError(error_str)
     return final_values
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for an LRUCache -- mirrors functools.lru_cache's cache_info()."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """Small, thread-safe, bounded least-recently-used cache with hit/miss counters.
+    We use this to memoize per-request-shape work (graph traversal, validation, etc...)
+    where we can't use functools.lru_cache as the arguments are not hashable.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """Initializes the cache.
+
+        :param maxsize: Maximum number of entries to hold. Least recently used entries are evicted first.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Gets an item from the cache, marking it as recently used. Counts a hit or a miss.
+
+        :param key: Key to look up
+        :param default: Value to return if the key is not present
+        :return: The cached value, or the default
+        """
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """Puts an item in the cache, evicting the least recently used item if we are over capacity.
+
+        :param key: Key to store
+        :param value: Value to store
+        """
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Gives the statistics of the cache.
+
+        :return: hits, misses, maxsize, and current size
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._cache
@@ -16,7 +16,7 @@ from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple,
 import pandas as pd
 
 from hamilton import common, graph_types, htypes
-from hamilton.execution import executors, graph_functions, grouping, state
+from hamilton.execution import executors, graph_functions, grouping, scheduling, state
 from hamilton.graph_types import HamiltonNode
 from hamilton.io import materialization
 from hamilton.io.materialization import ExtractorFactory, MaterializerFactory
@@ -151,8 +151,24 @@ class DefaultGraphExecutor(GraphExecutor):
         run_id: str,
     ) -> Dict[str, Any]:
         """Basic executor for a function graph. Does no task-based execution, just does a DFS
-        and executes the graph in order, in memory."""
+        and executes the graph in order, in memory.
+
+        If an adapter loads cached results (do_load_cached_results), they are treated as computed,
+        so the subgraphs upstream of them are pruned from the execution plan."""
         memoized_computation = dict()  # memoized storage
+        if self.adapter is not None and self.adapter.does_method(
+            "do_load_cached_results", is_async=False
+        ):
+            memoized_computation.update(
+                self.adapter.call_lifecycle_method_sync(
+                    "do_load_cached_results",
+                    run_id=run_id,
+                    graph=fg,
+                    final_vars=final_vars,
+                    inputs=inputs,
+                    overrides=overrides,
+                )
+            )
         nodes = [fg.nodes[node_name] for node_name in final_vars if node_name in fg.nodes]
         fg.execute(nodes, memoized_computation, overrides, inputs, run_id=run_id)
         outputs = {
@@ -175,17 +191,36 @@ class TaskBasedGraphExecutor(GraphExecutor):
         execution_manager: executors.ExecutionManager,
         grouping_strategy: grouping.GroupingStrategy,
         adapter: lifecycle_base.LifecycleAdapterSet,
+        max_expansion_in_flight: Optional[int] = None,
+        stream_collect: bool = False,
+        ordered_collect: bool = False,
+        result_cache_factory: Callable[[Dict[str, Any]], state.ResultCache] = None,
+        task_prioritizer: Optional[scheduling.TaskPrioritizer] = None,
     ):
         """Executor for task-based execution. This enables grouping of nodes into tasks, as
         well as parallel execution/dynamic spawning of nodes.
 
         :param execution_manager: Utility to assign task executors to node groups
         :param grouping_strategy: Utility to group nodes into tasks
-        :param result_builder: Utility to build the final result"""
+        :param result_builder: Utility to build the final result
+        :param max_expansion_in_flight: If set, stream Parallelizable[] items, realizing tasks for
+            at most this many at a time. See ExecutionState for more details.
+        :param stream_collect: Whether to stream results into Collect[] nodes as they are produced.
+        :param ordered_collect: Whether streamed results are collected in order, rather than as
+            they complete.
+        :param result_cache_factory: Creates the result cache for each execution, given the
+            initial results (inputs/overrides). Defaults to DictBasedResultCache.
+        :param task_prioritizer: Decides which ready task to run first. Defaults to running them in
+            the order they become ready."""
 
         self.execution_manager = execution_manager
         self.grouping_strategy = grouping_strategy
         self.adapter = adapter
+        self.max_expansion_in_flight = max_expansion_in_flight
+        self.stream_collect = stream_collect
+        self.ordered_collect = ordered_collect
+        self.result_cache_factory = result_cache_factory or state.DictBasedResultCache
+        self.task_prioritizer = task_prioritizer
 
     def execute(
         self,
@@ -202,7 +237,27 @@ class TaskBasedGraphExecutor(GraphExecutor):
         2. Creates an execution state and a results cache
         3. Runs it to completion, populating the results cache
         4. Returning the results from the results cache
+
+        If an adapter loads cached results (do_load_cached_results), they are treated as overrides,
+        so the tasks upstream of them are pruned from the plan. Results of nodes that are repeated
+        per item of a Parallelizable[] node only exist per item, so they are not loaded by name.
         """
+        if self.max_expansion_in_flight is not None:
+            requested_expanders = [
+                var
+                for var in final_vars
+                if var in fg.nodes and fg.nodes[var].node_role == node.NodeType.EXPAND
+            ]
+            if len(requested_expanders) > 0:
+                raise ValueError(
+                    f"Cannot request Parallelizable[] nodes {requested_expanders} as outputs with "
+                    f"streaming expansion, as their items are not retained. Request the Collect[] "
+                    f"nodes downstream of them instead, or disable streaming expansion."
+                )
+        overrides = {
+            **overrides,
+            **self._load_cached_results(fg, final_vars, overrides, inputs, run_id),
+        }
         inputs = graph_functions.combine_config_and_inputs(fg.config, inputs)
         (
             transform_nodes_required_for_execution,
@@ -220,19 +275,62 @@ class TaskBasedGraphExecutor(GraphExecutor):
         # Instantiate a result cache so we can use later
         # Pass in inputs so we can pre-populate the results cache
         prehydrated_results = {**overrides, **inputs}
-        results_cache = state.DictBasedResultCache(prehydrated_results)
+        results_cache = self.result_cache_factory(prehydrated_results)
         # Create tasks from the grouped nodes, filtering/pruning as we go
         tasks = grouping.create_task_plan(grouped_nodes, final_vars, overrides, self.adapter)
         # Create a task graph and execution state
         execution_state = state.ExecutionState(
-            tasks, results_cache, run_id
+            tasks,
+            results_cache,
+            run_id,
+            max_expansion_in_flight=self.max_expansion_in_flight,
+            stream_collect=self.stream_collect,
+            ordered_collect=self.ordered_collect,
+            task_priorities=(
+                self.task_prioritizer.prioritize(tasks)
+                if self.task_prioritizer is not None
+                else None
+            ),
         )  # Stateful storage for the DAG
         # Blocking call to run through until completion
         executors.run_graph_to_completion(execution_state, self.execution_manager)
-        # Read the final variables from the result cache
-        raw_result = results_cache.read(final_vars)
+        # Read the final variables from the result cache -- only these are materialized here
+        raw_result = state.resolve_deferred_results(results_cache.read(final_vars))
         return raw_result
 
+    def _load_cached_results(
+        self,
+        fg: graph.FunctionGraph,
+        final_vars: List[str],
+        overrides: Dict[str, Any],
+        inputs: Dict[str, Any],
+        run_id: str,
+    ) -> Dict[str, Any]:
+        """Loads results from the adapters' caches (do_load_cached_results), if any can.
+
+        :return: The loaded results that can stand in for their nodes, by node name
+        """
+        if self.adapter is None or not self.adapter.does_method(
+            "do_load_cached_results", is_async=False
+        ):
+            return {}
+        loaded = self.adapter.call_lifecycle_method_sync(
+            "do_load_cached_results",
+            run_id=run_id,
+            graph=fg,
+            final_vars=final_vars,
+            inputs=inputs,
+            overrides=overrides,
+        )
+        per_item = sorted(
+            name
+            for name in loaded
+            if name in fg.nodes and grouping.is_in_parallel_block(fg.nodes[name])
+        )
+        if len(per_item) > 0:
+            logger.debug(f"Not using cached results for nodes in parallel blocks: {per_item}")
+        return {name: value for name, value in loaded.items() if name not in per_item}
+
 
 class Driver:
     """This class orchestrates creating and executing the DAG to create a dataframe.
@@ -258,6 +356,9 @@ class Driver:
         dr = driver.Driver(config, module, adapter=adapter)
     """
 
+    # Number of request shapes (final vars + input/override keys) to memoize node resolution for
+    UPSTREAM_NODE_CACHE_SIZE = 128
+
     @staticmethod
     def normalize_adapter_input(
         adapter: Optional[
@@ -380,6 +481,7 @@ class Driver:
         """
 
         self.driver_run_id = uuid.uuid4()
+        self._upstream_node_cache = common.LRUCache(maxsize=self.UPSTREAM_NODE_CACHE_SIZE)
         adapter = self.normalize_adapter_input(adapter, use_legacy_adapter=_use_legacy_adapter)
         if adapter.does_hook("pre_do_anything", is_async=False):
             adapter.call_all_lifecycle_hooks_sync("pre_do_anything")
@@ -494,33 +596,74 @@ class Driver:
         if nodes_set is None:
             nodes_set = set(fn_graph.nodes.values())
         (all_inputs,) = (graph_functions.combine_config_and_inputs(fn_graph.config, inputs),)
+        errors = Driver._find_missing_inputs(user_nodes, all_inputs.keys(), nodes_set)
+        errors += Driver._find_input_type_errors(adapter, user_nodes, all_inputs)
+        Driver._raise_input_errors(errors)
+
+    @staticmethod
+    def _find_missing_inputs(
+        user_nodes: Collection[node.Node],
+        input_keys: Collection[str],
+        nodes_set: Collection[node.Node],
+    ) -> List[str]:
+        """Finds required inputs that are not provided. This only depends on the *keys* of the inputs,
+        so its result can be memoized per request shape.
+
+        :param user_nodes: The required nodes we need for computation.
+        :param input_keys: The names of all inputs provided (config + runtime inputs).
+        :param nodes_set: the set of nodes to use for validation.
+        :return: A list of error messages, one for each missing input.
+        """
         errors = []
         for user_node in user_nodes:
-            if user_node.name not in all_inputs:
+            if user_node.name not in input_keys:
                 if graph_functions.node_is_required_by_anything(user_node, nodes_set):
                     errors.append(
                         f"Error: Required input {user_node.name} not provided "
                         f"for nodes: {[node.name for node in user_node.depended_on_by]}."
                     )
+        return errors
+
+    @staticmethod
+    def _find_input_type_errors(
+        adapter: lifecycle_base.LifecycleAdapterSet,
+        user_nodes: Collection[node.Node],
+        all_inputs: Dict[str, Any],
+    ) -> List[str]:
+        """Finds inputs whose values do not match the type of the node they are provided for.
+
+        :param adapter: The adapter to use for validation.
+        :param user_nodes: The required nodes we need for computation.
+        :param all_inputs: All inputs provided (config + runtime inputs).
+        :return: A list of error messages, one for each mismatched input.
+        """
+        errors = []
+        for user_node in user_nodes:
+            if user_node.name not in all_inputs:
+                continue
+            valid = all_inputs[user_node.name] is None
+            if adapter.does_method("do_validate_input", is_async=False):
+                # For now this is an or-gate, as are the rest.
+                # We may consider changing this/adding another method or type
+                valid |= adapter.call_lifecycle_method_sync(
+                    "do_validate_input",
+                    node_type=user_node.type,
+                    input_value=all_inputs[user_node.name],
+                )
             else:
-                valid = all_inputs[user_node.name] is None
-                if adapter.does_method("do_validate_input", is_async=False):
-                    # For now this is an or-gate, as are the rest.
-                    # We may consider changing this/adding another method or type
-                    valid |= adapter.call_lifecycle_method_sync(
-                        "do_validate_input",
-                        node_type=user_node.type,
-                        input_value=all_inputs[user_node.name],
-                    )
-                else:
-                    valid |= htypes.check_input_type(user_node.type, all_inputs[user_node.name])
-                if not valid:
-                    errors.append(
-                        f"Error: Type requirement mismatch. Expected {user_node.name}:{user_node.type} "  # noqa: E231
-                        f"got {all_inputs[user_node.name]}:{type(all_inputs[user_node.name])} instead."  # noqa: E231
-                    )
+                valid |= htypes.check_input_type(user_node.type, all_inputs[user_node.name])
+            if not valid:
+                errors.append(
+                    f"Error: Type requirement mismatch. Expected {user_node.name}:{user_node.type} "  # noqa: E231
+                    f"got {all_inputs[user_node.name]}:{type(all_inputs[user_node.name])} instead."  # noqa: E231
+                )
+        return errors
+
+    @staticmethod
+    def _raise_input_errors(errors: List[str]):
+        """Raises a ValueError listing all input validation errors, if there are any."""
         if errors:
-            errors.sort()
+            errors = sorted(errors)
             error_str = f"{len(errors)} errors encountered: \n  " + "\n  ".join(errors)
             raise ValueError(error_str)
 
@@ -640,9 +783,8 @@ class Driver:
         """
         function_graph = _fn_graph if _fn_graph is not None else self.graph
         run_id = str(uuid.uuid4())
-        nodes, user_nodes = function_graph.get_upstream_nodes(final_vars, inputs, overrides)
-        Driver.validate_inputs(
-            function_graph, self.adapter, user_nodes, inputs, nodes
+        nodes, user_nodes = self._resolve_upstream_nodes(
+            function_graph, final_vars, inputs, overrides
         )  # TODO -- validate within the function graph itself
         if display_graph:  # deprecated flow.
             logger.warning(
@@ -693,6 +835,58 @@ class Driver:
                 )
         return results
 
+    def _resolve_upstream_nodes(
+        self,
+        function_graph: graph.FunctionGraph,
+        final_vars: List[str],
+        inputs: Optional[Dict[str, Any]],
+        overrides: Optional[Dict[str, Any]],
+    ) -> Tuple[Set[node.Node], Set[node.Node]]:
+        """Resolves the nodes required to compute final_vars, and validates the inputs against them.
+
+        The node resolution and the check for missing inputs only depend on the final vars and the
+        keys of the inputs/overrides, so we memoize them (see upstream_node_cache_info()) when
+        executing against the driver's own graph. Checking the types of the inputs depends on their
+        values, so it is always done.
+
+        :param function_graph: Graph to resolve against
+        :param final_vars: Final variables to compute
+        :param inputs: Runtime inputs to the DAG
+        :param overrides: Overrides to run
+        :return: A tuple of (all nodes required, user-defined nodes required)
+        :raises ValueError: if the inputs are not valid
+        """
+        cache_key = (
+            frozenset(final_vars),
+            frozenset(inputs) if inputs is not None else None,
+            frozenset(overrides) if overrides is not None else None,
+        )
+        use_cache = function_graph is self.graph
+        resolved = self._upstream_node_cache.get(cache_key) if use_cache else None
+        if resolved is None:
+            nodes, user_nodes = function_graph.get_upstream_nodes_memoized(
+                final_vars, inputs, overrides
+            )
+            input_keys = set(function_graph.config) | set(inputs if inputs is not None else {})
+            missing_input_errors = Driver._find_missing_inputs(user_nodes, input_keys, nodes)
+            resolved = (nodes, user_nodes, missing_input_errors)
+            if use_cache:
+                self._upstream_node_cache.put(cache_key, resolved)
+        nodes, user_nodes, missing_input_errors = resolved
+        all_inputs = graph_functions.combine_config_and_inputs(
+            function_graph.config, inputs if inputs is not None else {}
+        )
+        type_errors = Driver._find_input_type_errors(self.adapter, user_nodes, all_inputs)
+        Driver._raise_input_errors(missing_input_errors + type_errors)
+        return nodes, user_nodes
+
+    def upstream_node_cache_info(self) -> common.CacheInfo:
+        """Gives hit/miss statistics for the memoized node resolution/validation in execute().
+
+        :return: hits, misses, maxsize, and current size of the cache
+        """
+        return self._upstream_node_cache.cache_info()
+
     @capture_function_usage
     def list_available_variables(
         self, *, tag_filter: Dict[str, Union[Optional[str], List[str]]] = None
@@ -1681,6 +1875,11 @@ class Builder:
         self.remote_executor = None
         self.grouping_strategy = None
         self.result_builder = None
+        self.max_expansion_in_flight = None
+        self.stream_collect = False
+        self.ordered_collect = False
+        self.result_cache_factory = None
+        self.task_prioritizer = None
 
     def _require_v2(self, message: str):
         if not self.v2_executor:
@@ -1819,6 +2018,94 @@ class Builder:
         self.grouping_strategy = grouping_strategy
         return self
 
+    def with_streaming_expansion(self, max_in_flight: int = 100) -> "Builder":
+        """Streams the results of Parallelizable[] nodes -- rather than materializing every item
+        before spawning any tasks, tasks are spawned as the generator yields, with at most
+        max_in_flight items being processed at a time. This lets long/large expansions start work
+        immediately, and bounds the memory the controller needs.
+
+        Note that this requires the expander to run in the same process as the driver (which it
+        does with the default local executor), as generators cannot be serialized. As the items
+        are not retained, the Parallelizable[] node itself cannot be requested as an output.
+
+        :param max_in_flight: Maximum number of items to have tasks in flight for, per expander.
+        :return: self
+        """
+        self._require_v2("Cannot stream expansion without first enabling the V2 Driver")
+        self._require_field_unset("max_expansion_in_flight", "Cannot set streaming expansion twice")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        self.max_expansion_in_flight = max_in_flight
+        return self
+
+    def with_streaming_collect(self, ordered: bool = False) -> "Builder":
+        """Streams results into Collect[] nodes -- rather than waiting for every result and
+        passing them in as a list, the collector runs alongside the tasks it collects from, and
+        receives an iterator that yields their results as they complete. Results are evicted from
+        the driver's memory as they're consumed, so (along with with_streaming_expansion) memory
+        scales with the number of items in flight, not the total.
+
+        Note that the collector blocks while waiting on results, so it is run in its own thread.
+        If you use a custom execution manager, it will have to do the same for tasks with
+        stream_collect set (see DefaultExecutionManager).
+
+        :param ordered: Whether to yield results in the order of the Parallelizable[] items,
+            rather than the order in which they complete. Out-of-order results are buffered.
+        :return: self
+        """
+        self._require_v2("Cannot stream collect without first enabling the V2 Driver")
+        self._require_field_unset(
+            "stream_collect", "Cannot set streaming collect twice", unset_value=False
+        )
+        self.stream_collect = True
+        self.ordered_collect = ordered
+        return self
+
+    def with_result_cache(
+        self, result_cache_factory: Callable[[Dict[str, Any]], state.ResultCache]
+    ) -> "Builder":
+        """Sets the result cache, which stores the results of tasks in the driver's process.
+        This is called for each execution, with the initial results (inputs/overrides). By
+        default this is an in-memory DictBasedResultCache -- to spill results to disk instead, use:
+
+        .. code-block:: python
+
+            from hamilton.execution import state
+
+            builder.with_result_cache(
+                functools.partial(state.DiskSpillingResultCache, max_memory_bytes=2**30)
+            )
+
+        :param result_cache_factory: Callable taking the initial results and returning a
+            ResultCache.
+        :return: self
+        """
+        self._require_v2("Cannot set result cache without first enabling the V2 Driver")
+        self._require_field_unset("result_cache_factory", "Cannot set result cache twice")
+        self.result_cache_factory = result_cache_factory
+        return self
+
+    def with_task_prioritizer(self, task_prioritizer: scheduling.TaskPrioritizer) -> "Builder":
+        """Sets a task prioritizer, which decides which of the tasks that are ready to run is
+        submitted first -- E.G. the start of the critical path, from the runtimes of previous runs:
+
+        .. code-block:: python
+
+            from hamilton.execution import scheduling
+
+            profile = scheduling.NodeRuntimeProfile("./.hamilton_profile.json")
+            builder.with_adapters(scheduling.NodeRuntimeProfiler(profile)).with_task_prioritizer(
+                scheduling.CriticalPathPrioritizer(profile)
+            )
+
+        :param task_prioritizer: Task prioritizer to use.
+        :return: self
+        """
+        self._require_v2("Cannot set task prioritizer without first enabling the V2 Driver")
+        self._require_field_unset("task_prioritizer", "Cannot set task prioritizer twice")
+        self.task_prioritizer = task_prioritizer
+        return self
+
     def build(self) -> Driver:
         """Builds the driver -- note that this can return a different class, so you'll likely
         want to have a sense of what it returns.
@@ -1848,6 +2135,11 @@ class Builder:
                 execution_manager=execution_manager,
                 grouping_strategy=grouping_strategy,
                 adapter=lifecycle_base.LifecycleAdapterSet(*adapter),
+                max_expansion_in_flight=self.max_expansion_in_flight,
+                stream_collect=self.stream_collect,
+                ordered_collect=self.ordered_collect,
+                result_cache_factory=self.result_cache_factory,
+                task_prioritizer=self.task_prioritizer,
             )
 
         return Driver(
@@ -1875,6 +2167,11 @@ class Builder:
         new_builder.local_executor = self.local_executor
         new_builder.remote_executor = self.remote_executor
         new_builder.grouping_strategy = self.grouping_strategy
+        new_builder.max_expansion_in_flight = self.max_expansion_in_flight
+        new_builder.stream_collect = self.stream_collect
+        new_builder.ordered_collect = self.ordered_collect
+        new_builder.result_cache_factory = self.result_cache_factory
+        new_builder.task_prioritizer = self.task_prioritizer
         return new_builder
 
 
@@ -1,14 +1,32 @@
 import abc
+import asyncio
+import collections
+import contextvars
 import dataclasses
 import functools
+import inspect
 import logging
+import os
+import queue
+import threading
 from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from hamilton import node
-from hamilton.execution.graph_functions import execute_subdag
+from hamilton.execution import shared_memory_transport
+from hamilton.execution.graph_functions import (
+    compile_execution_plan,
+    execute_plan_async,
+    execute_subdag,
+)
 from hamilton.execution.grouping import NodeGroupPurpose, TaskImplementation
-from hamilton.execution.state import ExecutionState, GraphState, TaskState
+from hamilton.execution.state import (
+    ExecutionState,
+    GraphState,
+    TaskQueue,
+    TaskState,
+    resolve_deferred_results,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +39,22 @@ class TaskFuture:
     get_state: Callable[[], TaskState]
     get_result: Callable[[], Any]
 
+    def add_done_callback(self, callback: Callable[[], None]) -> bool:
+        """Registers a callback to be called (with no arguments) once the task is complete.
+        This allows the scheduler to block until there is work to do, rather than polling.
+
+        The default implementation can only handle tasks that are already complete (E.G. tasks
+        run synchronously at submit time). Subclasses wrapping asynchronous computation should
+        override this.
+
+        :param callback: Callback to call once the task is complete. May be called from any thread.
+        :return: Whether the callback was registered -- if not, the caller has to poll get_state().
+        """
+        if TaskState.is_terminal(self.get_state()):
+            callback()
+            return True
+        return False
+
 
 class TaskExecutor(abc.ABC):
     """Abstract class for a task executor. All this does is submit a task and return a future.
@@ -60,7 +94,13 @@ class TaskExecutor(abc.ABC):
         pass
 
 
+# Whether the expander currently executing should hand its generator back as is, to be streamed
+_stream_expansion = contextvars.ContextVar("stream_expansion", default=False)
+
+
 def new_callable(*args, _callable=None, **kwargs):
+    if _stream_expansion.get():
+        return iter(_callable(*args, **kwargs))
     return list(_callable(*args, **kwargs))
 
 
@@ -77,6 +117,117 @@ def _modify_callable(node_source: node.NodeType, callabl: Callable):
     return callabl
 
 
+def _prepare_task(task: TaskImplementation) -> TaskImplementation:
+    """Prepares a task for execution, see base_execute_task.
+
+    :param task: Task to prepare
+    :return: The task, with its inputs resolved
+    """
+    # Inputs produced by tasks of an executor that defers its results (E.G. to an object store)
+    task = dataclasses.replace(task, dynamic_inputs=resolve_deferred_results(task.dynamic_inputs))
+    # We do this as an edge case to force the callable to return a list if it is an expand,
+    # and would normally return a generator. That said, we will likely remove this in the future --
+    # its an implementation detail, and a true queuing system between nodes/controller would mean
+    # we wouldn't need to do this, and instead could just use the generator aspect.
+    # Furthermore, in most cases the user wouldn't be calling an expand on a "remote" node,
+    # but it is a supported use-case. If the task streams its expansion, we leave the generator
+    # be, and the controller consumes it as it realizes tasks.
+    for node_ in task.nodes:
+        if not getattr(node_, "callable_modified", False):
+            node_._callable = _modify_callable(node_.node_role, node_.callable)
+        setattr(node_, "callable_modified", True)
+    return task
+
+
+def _select_task_outputs(task: TaskImplementation, results: Dict[str, Any]) -> Dict[str, Any]:
+    """Selects the results a task returns, see base_execute_task."""
+    # This selection is for GC
+    # We also need to get the override values
+    # This way if its overridden we can ensure it gets passed to the right one
+    return {
+        key: value
+        for key, value in results.items()
+        if key in task.outputs_to_compute or key in task.overrides
+    }
+
+
+def get_task_overrides(task: TaskImplementation) -> Dict[str, Any]:
+    """Gives the overrides a task returns along with its outputs (see base_execute_task) -- those of
+    its nodes and of their dependencies. These are known before the task runs, so executors that
+    return outputs without fetching them can return these directly.
+
+    :param task: Task to get the overrides of
+    :return: The overrides, by name
+    """
+    names = {node_.name for node_ in task.nodes}
+    names.update(dependency.name for node_ in task.nodes for dependency in node_.dependencies)
+    return {key: value for key, value in task.overrides.items() if key in names}
+
+
+class _TaskLifecycle:
+    """Calls the pre/post-task-execute hooks of a task's adapter around its execution, and logs its
+    errors. While it runs, this also tells expanders whether to stream their results (see
+    new_callable). This is a context manager for base_execute_task, and an asynchronous one for
+    base_execute_task_async, which also calls the asynchronous hooks. Set the results on it.
+    """
+
+    def __init__(self, task: TaskImplementation):
+        self.task = task
+        self.hook_kwargs = dict(run_id=task.run_id, task_id=task.task_id, nodes=task.nodes)
+        self.results = None
+        self._stream_expansion_token = None
+
+    def _pre_task_execute_kwargs(self) -> Dict[str, Any]:
+        return dict(
+            self.hook_kwargs, inputs=self.task.dynamic_inputs, overrides=self.task.overrides
+        )
+
+    def _post_task_execute_kwargs(self, error: Optional[BaseException]) -> Dict[str, Any]:
+        return dict(self.hook_kwargs, results=self.results, success=error is None, error=error)
+
+    def __enter__(self) -> "_TaskLifecycle":
+        if self.task.adapter.does_hook("pre_task_execute", is_async=False):
+            self.task.adapter.call_all_lifecycle_hooks_sync(
+                "pre_task_execute", **self._pre_task_execute_kwargs()
+            )
+        self._stream_expansion_token = _stream_expansion.set(self.task.stream_expansion)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_value is not None:
+                logger.exception(self.task.task_id)
+                logger.exception(
+                    f"Exception executing task {self.task.task_id}, with nodes: "
+                    f"{[item.name for item in self.task.nodes]}"
+                )
+            if self.task.adapter.does_hook("post_task_execute", is_async=False):
+                self.task.adapter.call_all_lifecycle_hooks_sync(
+                    "post_task_execute", **self._post_task_execute_kwargs(exc_value)
+                )
+        finally:
+            _stream_expansion.reset(self._stream_expansion_token)
+
+    async def __aenter__(self) -> "_TaskLifecycle":
+        self.__enter__()
+        if self.task.adapter.does_hook("pre_task_execute", is_async=True):
+            try:
+                await self.task.adapter.call_all_lifecycle_hooks_async(
+                    "pre_task_execute", **self._pre_task_execute_kwargs()
+                )
+            except BaseException:
+                _stream_expansion.reset(self._stream_expansion_token)
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
+        if self.task.adapter.does_hook("post_task_execute", is_async=True):
+            await self.task.adapter.call_all_lifecycle_hooks_async(
+                "post_task_execute", **self._post_task_execute_kwargs(exc_value)
+            )
+
+
 def base_execute_task(task: TaskImplementation) -> Dict[str, Any]:
     """This is a utility function to execute a base task. In an ideal world this would be recursive,
     (as in we can use the same task execution/management system as we would otherwise)
@@ -90,30 +241,9 @@ def base_execute_task(task: TaskImplementation) -> Dict[str, Any]:
     :param task: task to execute.
     :return: a diciontary of the results of all the nodes in that task's nodes to compute.
     """
-    # We do this as an edge case to force the callable to return a list if it is an expand,
-    # and would normally return a generator. That said, we will likely remove this in the future --
-    # its an implementation detail, and a true queuing system between nodes/controller would mean
-    # we wouldn't need to do this, and instead could just use the generator aspect.
-    # Furthermore, in most cases the user wouldn't be calling an expand on a "remote" node,
-    # but it is a supported use-case.
-    for node_ in task.nodes:
-        if not getattr(node_, "callable_modified", False):
-            node_._callable = _modify_callable(node_.node_role, node_.callable)
-        setattr(node_, "callable_modified", True)
-    if task.adapter.does_hook("pre_task_execute", is_async=False):
-        task.adapter.call_all_lifecycle_hooks_sync(
-            "pre_task_execute",
-            run_id=task.run_id,
-            task_id=task.task_id,
-            nodes=task.nodes,
-            inputs=task.dynamic_inputs,
-            overrides=task.overrides,
-        )
-    error = None
-    success = True
-    results = None
-    try:
-        results = execute_subdag(
+    task = _prepare_task(task)
+    with _TaskLifecycle(task) as lifecycle:
+        lifecycle.results = execute_subdag(
             nodes=task.nodes,
             inputs=task.dynamic_inputs,
             adapter=task.adapter,
@@ -121,34 +251,51 @@ def base_execute_task(task: TaskImplementation) -> Dict[str, Any]:
             run_id=task.run_id,
             task_id=task.task_id,
         )
-    except Exception as e:
-        logger.exception(task.task_id)
-        error = e
-        success = False
-        logger.exception(
-            f"Exception executing task {task.task_id}, with nodes: {[item.name for item in task.nodes]}"
+    return _select_task_outputs(task, lifecycle.results)
+
+
+async def base_execute_task_async(
+    task: TaskImplementation, sync_executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """Executes a task on the running event loop -- the asynchronous counterpart of
+    base_execute_task. Nodes that are coroutine functions are awaited on the loop, and synchronous
+    nodes are executed in `sync_executor` (see graph_functions.execute_node_async). Tasks with no
+    coroutine nodes are entirely executed in `sync_executor` by base_execute_task, unless the
+    adapter has asynchronous hooks/methods to call.
+
+    :param task: task to execute.
+    :param sync_executor: Executor to run synchronous nodes in. None means the loop's default.
+    :return: a dictionary of the results of all the nodes in that task's nodes to compute.
+    """
+    has_async_hooks = any(
+        task.adapter.does_hook(hook_name, is_async=True)
+        for hook_name in (
+            "pre_task_execute",
+            "post_task_execute",
+            "pre_node_execute",
+            "post_node_execute",
         )
-        raise e
-    finally:
-        if task.adapter.does_hook("post_task_execute", is_async=False):
-            task.adapter.call_all_lifecycle_hooks_sync(
-                "post_task_execute",
-                run_id=task.run_id,
-                task_id=task.task_id,
-                nodes=task.nodes,
-                results=results,
-                success=success,
-                error=error,
-            )
-    # This selection is for GC
-    # We also need to get the override values
-    # This way if its overridden we can ensure it gets passed to the right one
-    final_retval = {
-        key: value
-        for key, value in results.items()
-        if key in task.outputs_to_compute or key in task.overrides
-    }
-    return final_retval
+    ) or task.adapter.does_method("do_node_execute", is_async=True)
+    if not has_async_hooks and not any(
+        inspect.iscoroutinefunction(node_.callable) for node_ in task.nodes
+    ):
+        return await asyncio.get_running_loop().run_in_executor(
+            sync_executor, base_execute_task, task
+        )
+    task = _prepare_task(task)
+    async with _TaskLifecycle(task) as lifecycle:
+        overrides = {**task.dynamic_inputs, **task.overrides}
+        plan = compile_execution_plan(task.nodes, task.dynamic_inputs.keys(), (), overrides.keys())
+        lifecycle.results = await execute_plan_async(
+            plan,
+            task.dynamic_inputs,
+            adapter=task.adapter,
+            overrides=overrides,
+            run_id=task.run_id,
+            task_id=task.task_id,
+            sync_executor=sync_executor,
+        )
+    return _select_task_outputs(task, lifecycle.results)
 
 
 class SynchronousLocalTaskExecutor(TaskExecutor):
@@ -179,6 +326,45 @@ class SynchronousLocalTaskExecutor(TaskExecutor):
         pass
 
 
+class ThreadPerTaskExecutor(TaskExecutor):
+    """Runs every task in its own thread, with no limit on how many run at once. This is meant
+    for tasks that block on the completion of others (E.G. streaming collectors), so that they
+    never take capacity away from the tasks they are waiting on."""
+
+    def submit_task(self, task: TaskImplementation) -> TaskFuture:
+        """Starts a thread to run the task.
+
+        :param task: Task to submit
+        :return: The future associated with the task
+        """
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(base_execute_task(task))
+            except Exception as e:
+                future.set_exception(e)
+
+        # Daemon, so that if the graph fails before the task is unblocked, we don't hang on exit
+        threading.Thread(target=run, name=f"hamilton-{task.task_id}", daemon=True).start()
+        return TaskFutureWrappingPythonFuture(future)
+
+    def can_submit_task(self) -> bool:
+        """We can always submit a task, as we start a new thread for each.
+
+        :return: True
+        """
+        return True
+
+    def init(self):
+        pass
+
+    def finalize(self):
+        pass
+
+
 class TaskFutureWrappingPythonFuture(TaskFuture):
     """Wraps a python future in a TaskFuture"""
 
@@ -208,6 +394,15 @@ class TaskFutureWrappingPythonFuture(TaskFuture):
         out = self.future.result()
         return out
 
+    def add_done_callback(self, callback: Callable[[], None]) -> bool:
+        """Registers a callback with the underlying future.
+
+        :param callback: Callback to call once the task is complete
+        :return: True, as python futures (and anything that quacks like them) support callbacks
+        """
+        self.future.add_done_callback(lambda _: callback())
+        return True
+
 
 class PoolExecutor(TaskExecutor, abc.ABC):
     """Base class for a pool-based executor (threadpool executor/multiprocessing executor).
@@ -277,17 +472,212 @@ class MultiThreadingExecutor(PoolExecutor):
         return ThreadPoolExecutor(max_workers=self.max_tasks)
 
 
+def execute_task_with_shared_memory(
+    task: TaskImplementation, min_shared_memory_bytes: int
+) -> Dict[str, Any]:
+    """Executes a task in a worker process, mapping its inputs from shared memory, and copying its
+    large results into shared memory. See shared_memory_transport for more details.
+
+    :param task: Task to execute, whose inputs may be shared memory handles
+    :param min_shared_memory_bytes: Minimum size of a result to place in shared memory
+    :return: The results of the task, with large ones replaced by shared memory handles
+    """
+    task = dataclasses.replace(
+        task,
+        dynamic_inputs=shared_memory_transport.attach_values(task.dynamic_inputs, lambda shm: None),
+        overrides=shared_memory_transport.attach_values(task.overrides, lambda shm: None),
+    )
+    results = base_execute_task(task)
+    segments = []
+    try:
+        return shared_memory_transport.share_values(results, min_shared_memory_bytes, segments)
+    except Exception:
+        for shm in segments:
+            shared_memory_transport.unlink(shm)
+        raise
+    finally:
+        # The driver maps (and takes ownership of) these, so we don't need them anymore
+        for shm in segments:
+            shm.close()
+
+
+class TaskFutureWrappingSharedMemoryFuture(TaskFutureWrappingPythonFuture):
+    """Wraps a python future whose result may contain shared memory handles, mapping them on
+    the way out. We unlink them as soon as they are mapped, so they're freed once unused."""
+
+    def __init__(self, future: Future):
+        super(TaskFutureWrappingSharedMemoryFuture, self).__init__(future)
+        self._result = None
+        self._resolved = False
+
+    def get_result(self):
+        """Gets the result, mapping any values in shared memory. This is non-blocking.
+
+        :return: None if there is no result, else the result
+        """
+        if not self.future.done():
+            return None
+        if not self._resolved:
+            self._result = shared_memory_transport.attach_values(
+                self.future.result(), shared_memory_transport.unlink
+            )
+            self._resolved = True
+        return self._result
+
+
 class MultiProcessingExecutor(PoolExecutor):
     """Basic synchronous/local task executor that runs tasks
     in the same process, at submit time. Note that this is
     not yet augmented to handle the right serialization,
     so use at your own risk. We will be fixing shortly,
     but the dask/ray parallelism and the multithreading
-    parallelism executors serialize correctly."""
+    parallelism executors serialize correctly.
+
+    Large numpy arrays, pandas dataframes and pyarrow tables can be passed to/from workers through
+    shared memory rather than pickled, by setting min_shared_memory_bytes. Workers then map
+    their inputs rather than copying them, and likewise for the driver with their results.
+    """
+
+    def __init__(self, max_tasks: int, min_shared_memory_bytes: Optional[int] = None):
+        """Initializes the executor.
+
+        :param max_tasks: Maximum number of tasks to run at once
+        :param min_shared_memory_bytes: If set, inputs/results at least this large (of supported
+            types) are passed through shared memory. Not supported on Windows.
+        """
+        super(MultiProcessingExecutor, self).__init__(max_tasks)
+        if min_shared_memory_bytes is not None and os.name == "nt":
+            raise ValueError("Passing values through shared memory is not supported on Windows.")
+        self.min_shared_memory_bytes = min_shared_memory_bytes
 
     def create_pool(self) -> ProcessPoolExecutor:
         return ProcessPoolExecutor(max_workers=self.max_tasks)
 
+    def submit_task(self, task: TaskImplementation) -> TaskFuture:
+        """Submits a task, passing its large inputs through shared memory if enabled.
+
+        :param task: Task to submit
+        :return: The future associated with the task
+        """
+        if self.min_shared_memory_bytes is None:
+            return super(MultiProcessingExecutor, self).submit_task(task)
+        segments = []
+        try:
+            task = dataclasses.replace(
+                task,
+                dynamic_inputs=shared_memory_transport.share_values(
+                    task.dynamic_inputs, self.min_shared_memory_bytes, segments
+                ),
+                overrides=shared_memory_transport.share_values(
+                    task.overrides, self.min_shared_memory_bytes, segments
+                ),
+            )
+            future = self.pool.submit(
+                execute_task_with_shared_memory, task, self.min_shared_memory_bytes
+            )
+        except Exception:
+            for shm in segments:
+                shared_memory_transport.unlink(shm)
+            raise
+        finally:
+            # The worker maps these, we just need to unlink them once it is done
+            for shm in segments:
+                shm.close()
+
+        def unlink_segments(_):
+            for shm in segments:
+                shared_memory_transport.unlink(shm)
+
+        future.add_done_callback(unlink_segments)
+        self.active_futures.append(future)
+        return TaskFutureWrappingSharedMemoryFuture(future)
+
+
+class AsyncioTaskExecutor(TaskExecutor):
+    """Runs tasks on an asyncio event loop, in a thread of its own. Nodes that are coroutine
+    functions (`async def`) are awaited on the loop, so that many I/O-bound tasks (E.G. HTTP
+    requests, database reads) can be in flight at once, without a thread each. Synchronous nodes
+    run in a thread pool, so they don't block the loop.
+
+    Both the synchronous and the asynchronous node/task lifecycle hooks are called. Note that, as
+    with the AsyncDriver, decorators that wrap coroutine functions (E.G. @check_output) are not
+    supported.
+
+    .. code-block:: python
+
+        dr = (
+            driver.Builder()
+            .with_modules(my_async_module)
+            .enable_dynamic_execution(allow_experimental_mode=True)
+            .with_remote_executor(executors.AsyncioTaskExecutor(max_concurrency=1000))
+            .build()
+        )
+    """
+
+    def __init__(self, max_concurrency: int = 1000, max_sync_workers: Optional[int] = None):
+        """Initializes the executor.
+
+        :param max_concurrency: Maximum number of tasks to run at once -- the others wait on the
+            loop, which costs next to nothing.
+        :param max_sync_workers: Number of threads to run synchronous nodes in. None means the
+            default of ThreadPoolExecutor.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self.max_sync_workers = max_sync_workers
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sync_pool: Optional[ThreadPoolExecutor] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def init(self):
+        self.loop = asyncio.new_event_loop()
+        self.sync_pool = ThreadPoolExecutor(max_workers=self.max_sync_workers)
+        self._loop_thread = threading.Thread(
+            target=self.loop.run_forever, name="hamilton-asyncio", daemon=True
+        )
+        self._loop_thread.start()
+
+    def finalize(self):
+        async def cancel_pending_tasks():
+            # Tasks can be left pending if the graph failed
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(cancel_pending_tasks(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join()
+        self.loop.close()
+        self.sync_pool.shutdown()
+        self.loop, self.sync_pool, self._loop_thread, self._semaphore = None, None, None, None
+
+    async def _execute_task(self, task: TaskImplementation) -> Dict[str, Any]:
+        if self._semaphore is None:
+            # Created here, as it has to be on the loop (prior to python 3.10)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await base_execute_task_async(task, self.sync_pool)
+
+    def submit_task(self, task: TaskImplementation) -> TaskFuture:
+        """Schedules the task on the loop.
+
+        :param task: Task to submit
+        :return: The future associated with the task
+        """
+        return TaskFutureWrappingPythonFuture(
+            asyncio.run_coroutine_threadsafe(self._execute_task(task), self.loop)
+        )
+
+    def can_submit_task(self) -> bool:
+        """We can always submit a task, as tasks beyond max_concurrency wait on the loop.
+
+        :return: True
+        """
+        return True
+
 
 class ExecutionManager(abc.ABC):
     """Manages execution per task. This enables you to have different executors for different
@@ -340,17 +730,21 @@ class DefaultExecutionManager(ExecutionManager):
             local_executor = SynchronousLocalTaskExecutor()
         if remote_executor is None:
             remote_executor = MultiProcessingExecutor(max_tasks=5)
-        super().__init__([local_executor, remote_executor])
+        streaming_collect_executor = ThreadPerTaskExecutor()
+        super().__init__([local_executor, remote_executor, streaming_collect_executor])
         self.local_executor = local_executor
         self.remote_executor = remote_executor
+        self.streaming_collect_executor = streaming_collect_executor
 
     def get_executor_for_task(self, task: TaskImplementation) -> TaskExecutor:
         """Simple implementation that returns the local executor for single task executions,
+        and runs streaming collectors in their own threads, as they block on other tasks.
 
         :param task: Task to get executor for
         :return: A local task if this is a "single-node" task, a remote task otherwise
         """
-
+        if task.stream_collect:
+            return self.streaming_collect_executor
         if task.purpose == NodeGroupPurpose.EXECUTE_BLOCK:
             return self.remote_executor
         return self.local_executor
@@ -359,46 +753,84 @@ class DefaultExecutionManager(ExecutionManager):
 def run_graph_to_completion(
     execution_state: ExecutionState,
     execution_manager: ExecutionManager,
+    poll_interval_seconds: float = 0.01,
 ):
-    """Blocking call to run the graph until it is complete. Note that this employs a while loop.
-    With the way we handle futures, we should be able to have this event-driven, allowing us
-    to only query when the state is updated, and use that to trigger a new update.
+    """Blocking call to run the graph until it is complete. This is event-driven -- we submit
+    everything we can, then block until one of the tasks in flight completes (signaled by a
+    callback from its future), and use that to trigger the next update.
 
-    For now, the while loop is fine.
+    Futures that do not support completion callbacks (see TaskFuture.add_done_callback) are
+    polled every `poll_interval_seconds`, as are executors that cannot take any more tasks.
 
+    :param execution_state: State of the execution, tells us what to run next
+    :param execution_manager: Manager that gives us the executor for each task
+    :param poll_interval_seconds: How often to poll futures that do not support callbacks
     :return: Nothing, the execution state/result cache can give us the data
     """
     task_futures = {}
+    polled_task_ids = set()  # tasks whose futures we cannot get a callback from
+    completed_task_ids = queue.SimpleQueue()  # pushed to by the futures' callbacks
+    # Tasks released while their executor was full, by executor. They go to it first once it has
+    # room -- in the meantime, tasks for other executors are still submitted
+    parked_tasks = collections.defaultdict(lambda: TaskQueue(execution_state.task_queue.priorities))
+
+    def submit(task: TaskImplementation, task_executor: TaskExecutor):
+        try:
+            submitted = task_executor.submit_task(task)
+        except Exception as e:
+            logger.exception(
+                f"Exception submitting task {task.task_id}, with nodes: "
+                f"{[item.name for item in task.nodes]}"
+            )
+            raise e
+        task_futures[task.task_id] = submitted
+        if not submitted.add_done_callback(functools.partial(completed_task_ids.put, task.task_id)):
+            polled_task_ids.add(task.task_id)
+
     execution_manager.init()
     try:
         while not GraphState.is_terminal(execution_state.get_graph_state()):
-            # get the next task from the queue
+            # Submit everything we can
+            for task_executor, tasks in parked_tasks.items():
+                while len(tasks) > 0 and task_executor.can_submit_task():
+                    submit(tasks.popleft(), task_executor)
             next_task = execution_state.release_next_task()
-            if next_task is not None:
+            while next_task is not None:
                 task_executor = execution_manager.get_executor_for_task(next_task)
-                if task_executor.can_submit_task():
-                    try:
-                        submitted = task_executor.submit_task(next_task)
-                    except Exception as e:
-                        logger.exception(
-                            f"Exception submitting task {next_task.task_id}, with nodes: "
-                            f"{[item.name for item in next_task.nodes]}"
-                        )
-                        raise e
-                    task_futures[next_task.task_id] = submitted
+                if len(parked_tasks[task_executor]) > 0 or not task_executor.can_submit_task():
+                    parked_tasks[task_executor].append(next_task)
                 else:
-                    # Whoops, back on the queue
-                    # We should probably wait a bit here, but for now we're going to keep
-                    # burning through
-                    execution_state.reject_task(task_to_reject=next_task)
-            # update all the tasks in flight
-            # copy so we can modify
-            for task_name, task_future in task_futures.copy().items():
+                    submit(next_task, task_executor)
+                next_task = execution_state.release_next_task()
+            num_parked_tasks = sum(len(tasks) for tasks in parked_tasks.values())
+            if len(task_futures) == 0 and num_parked_tasks == 0:
+                raise RuntimeError(
+                    f"No tasks are in flight and none can be submitted, but the graph is not "
+                    f"complete. Graph state is {execution_state.get_graph_state()}, "
+                    f"queue is {execution_state._format_task_queue()}."
+                )
+            # Block until at least one task completes, then gather all the ones that have. Full
+            # executors may free up without any of our tasks completing (E.G. if their capacity is
+            # shared), so we only wait so long while tasks are parked
+            ready_task_ids = []
+            should_poll = len(polled_task_ids) > 0 or num_parked_tasks > 0
+            try:
+                ready_task_ids.append(
+                    completed_task_ids.get(timeout=poll_interval_seconds if should_poll else None)
+                )
+            except queue.Empty:
+                pass
+            while not completed_task_ids.empty():
+                ready_task_ids.append(completed_task_ids.get())
+            for task_id in list(polled_task_ids):
+                if TaskState.is_terminal(task_futures[task_id].get_state()):
+                    polled_task_ids.remove(task_id)
+                    ready_task_ids.append(task_id)
+            for task_id in ready_task_ids:
+                task_future = task_futures.pop(task_id)
                 state = task_future.get_state()
                 result = task_future.get_result()
-                execution_state.update_task_state(task_name, state, result)
-                if TaskState.is_terminal(state):
-                    del task_futures[task_name]
+                execution_state.update_task_state(task_id, state, result)
         logger.info(f"Graph is done, graph state is {execution_state.get_graph_state()}")
     finally:
         execution_manager.finalize()
@@ -1,6 +1,14 @@
+import asyncio
+import collections
+import contextvars
+import dataclasses
+import enum
+import functools
+import inspect
 import logging
 import pprint
-from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+from concurrent.futures import Executor
+from typing import Any, Callable, Collection, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from hamilton import node
 from hamilton.lifecycle.base import LifecycleAdapterSet
@@ -145,147 +153,488 @@ def create_error_message(kwargs: dict, node_: node.Node, step: str) -> str:
     return message
 
 
-def execute_subdag(
+@dataclasses.dataclass
+class SubdagExecutionStats:
+    """Memory statistics gathered over a single call to execute_subdag.
+    Pass one in to execute_subdag to have it populated -- this is mainly useful for tests/debugging.
+    """
+
+    max_num_results_held: int = 0  # high-water mark of the number of results held at any one time
+    max_bytes_held: int = 0  # high-water mark of the estimated size of the results held, in bytes
+    results_released: int = 0  # number of intermediate results dropped before the end of the run
+    # estimated size of each result held, so we only estimate it once
+    _sizes: Dict[str, int] = dataclasses.field(default_factory=dict, repr=False, compare=False)
+
+    def record_results_held(self, computed: Dict[str, Any]):
+        """Records the results held after a step. See state.estimate_size for how sizes are
+        estimated."""
+        from hamilton.execution import state  # state depends on this module
+
+        self.max_num_results_held = max(self.max_num_results_held, len(computed))
+        for name, value in computed.items():
+            if name not in self._sizes:
+                self._sizes[name] = state.estimate_size(value)
+        self.max_bytes_held = max(self.max_bytes_held, sum(self._sizes[name] for name in computed))
+
+    def record_result_released(self, name: str):
+        self.results_released += 1
+        self._sizes.pop(name, None)
+
+
+class ExecutionStepType(enum.Enum):
+    """What to do with a node when we reach it in an execution plan."""
+
+    OVERRIDE = "override"  # take the value from the overrides
+    INPUT = "input"  # take the value from the inputs (user-defined node)
+    EXECUTE = "execute"  # call the node
+
+
+@dataclasses.dataclass
+class ExecutionStep:
+    """A single step in an execution plan. All the dependency resolution is done ahead of time,
+    so executing a step is just a matter of binding the kwargs and calling the node."""
+
+    node_: node.Node
+    step_type: ExecutionStepType
+    kwarg_names: Tuple[str, ...]  # names of the dependencies to bind as kwargs
+    required: bool  # for inputs only -- whether or not any consumer requires it
+    release_after: Tuple[str, ...]  # results that are no longer needed once this step has run
+
+
+@dataclasses.dataclass
+class ExecutionPlan:
+    """A compiled, flat execution plan for a subdag. This is a topologically ordered list of steps,
+    so it can be run in a simple loop (no recursion, no graph walking).
+
+    Plans only depend on the nodes requested and the *keys* of the inputs/overrides/precomputed values,
+    so they can be cached and reused across executions with the same shape.
+    """
+
+    steps: List[ExecutionStep]
+    requested: FrozenSet[str]
+
+
+def compile_execution_plan(
     nodes: Collection[node.Node],
+    input_keys: Collection[str] = (),
+    computed_keys: Collection[str] = (),
+    override_keys: Collection[str] = (),
+) -> ExecutionPlan:
+    """Compiles an execution plan for the subdag required to compute `nodes`. This conducts an
+    (iterative) depth-first traversal of the graph, emitting nodes in post-order, which is the same
+    order in which execute_subdag has always computed them.
+
+    Traversal stops at nodes that are already computed (these are skipped) or overridden.
+    Intermediate results are reference-counted -- each step carries the names of the results
+    that its execution releases. Requested nodes, inputs, overrides, and precomputed values
+    are never released.
+
+    :param nodes: Nodes to compute
+    :param input_keys: Names of the inputs available at runtime
+    :param computed_keys: Names of the nodes that have already been computed
+    :param override_keys: Names of the nodes that are overridden
+    :return: A compiled execution plan
+    """
+    input_keys = set(input_keys)
+    computed_keys = set(computed_keys)
+    override_keys = set(override_keys)
+    requested = frozenset(node_.name for node_ in nodes)
+    ordered_nodes = []
+    visited = set()
+    on_stack = set()  # nodes we are currently traversing the dependencies of -- used to find cycles
+    for final_var_node in nodes:
+        if final_var_node.name in visited or final_var_node.name in computed_keys:
+            continue
+        visited.add(final_var_node.name)
+        on_stack.add(final_var_node.name)
+        stack = [(final_var_node, iter(final_var_node.dependencies))]
+        while len(stack) > 0:
+            node_, dependencies = stack[-1]
+            if node_.name not in override_keys:
+                for dependency in dependencies:
+                    if dependency.name in on_stack:
+                        # This used to be a recursive traversal, which is why we raise this
+                        raise RecursionError(
+                            f"Cycle detected between {node_.name} and {dependency.name}. "
+                            f"Cannot execute a graph with cycles."
+                        )
+                    if dependency.name not in visited and dependency.name not in computed_keys:
+                        visited.add(dependency.name)
+                        on_stack.add(dependency.name)
+                        stack.append((dependency, iter(dependency.dependencies)))
+                        break
+                else:
+                    stack.pop()
+                    on_stack.remove(node_.name)
+                    ordered_nodes.append(node_)
+            else:
+                stack.pop()
+                on_stack.remove(node_.name)
+                ordered_nodes.append(node_)
+    required_inputs = set()
+    last_consumer = {}
+    for i, node_ in enumerate(ordered_nodes):
+        if node_.name in override_keys or node_.user_defined:
+            continue
+        for dependency in node_.dependencies:
+            last_consumer[dependency.name] = i
+            if dependency.user_defined and node_.requires(dependency.name):
+                required_inputs.add(dependency.name)
+    unreleasable = requested | input_keys | computed_keys | override_keys
+    release_after = collections.defaultdict(list)
+    for dependency_name, i in last_consumer.items():
+        if dependency_name not in unreleasable:
+            release_after[i].append(dependency_name)
+    steps = []
+    for i, node_ in enumerate(ordered_nodes):
+        if node_.name in override_keys:
+            step_type = ExecutionStepType.OVERRIDE
+        elif node_.user_defined:
+            step_type = ExecutionStepType.INPUT
+        else:
+            step_type = ExecutionStepType.EXECUTE
+        steps.append(
+            ExecutionStep(
+                node_=node_,
+                step_type=step_type,
+                kwarg_names=tuple(dependency.name for dependency in node_.dependencies),
+                required=node_.name in required_inputs,
+                release_after=tuple(release_after.get(i, ())),
+            )
+        )
+    return ExecutionPlan(steps=steps, requested=requested)
+
+
+class _NodeLifecycle:
+    """Calls the pre/post-node-execute hooks of an adapter around the execution of a node, and logs
+    its errors. This is a context manager for execute_node, and an asynchronous one for
+    execute_node_async, which also calls the asynchronous hooks. Set the result of the node on it.
+    """
+
+    __slots__ = ("node_", "kwargs", "adapter", "hook_kwargs", "result")
+
+    def __init__(
+        self,
+        node_: node.Node,
+        kwargs: Dict[str, Any],
+        adapter: LifecycleAdapterSet,
+        run_id: str = None,
+        task_id: str = None,
+    ):
+        self.node_ = node_
+        self.kwargs = kwargs
+        self.adapter = adapter
+        self.hook_kwargs = dict(run_id=run_id, node_=node_, kwargs=kwargs, task_id=task_id)
+        self.result = None
+
+    def _log_error(self, step: str):
+        logger.exception(create_error_message(self.kwargs, self.node_, step))
+
+    def _post_node_execute_kwargs(self, error: Optional[BaseException]) -> Dict[str, Any]:
+        return dict(self.hook_kwargs, success=error is None, error=error, result=self.result)
+
+    def __enter__(self) -> "_NodeLifecycle":
+        try:
+            for hook in self.adapter.get_sync_hooks("pre_node_execute"):
+                hook(**self.hook_kwargs)
+        except Exception:
+            self._log_error("[pre-node-execute]")
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_value is not None:
+            self._log_error("")
+        post_node_execute_hooks = self.adapter.get_sync_hooks("post_node_execute")
+        if not post_node_execute_hooks:
+            return
+        post_node_execute_kwargs = self._post_node_execute_kwargs(exc_value)
+        try:
+            for hook in post_node_execute_hooks:
+                hook(**post_node_execute_kwargs)
+        except Exception:
+            self._log_error("[post-node-execute]")
+            raise
+
+    async def __aenter__(self) -> "_NodeLifecycle":
+        self.__enter__()
+        if self.adapter.does_hook("pre_node_execute", is_async=True):
+            try:
+                await self.adapter.call_all_lifecycle_hooks_async(
+                    "pre_node_execute", **self.hook_kwargs
+                )
+            except Exception:
+                self._log_error("[pre-node-execute]")
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
+        if self.adapter.does_hook("post_node_execute", is_async=True):
+            try:
+                await self.adapter.call_all_lifecycle_hooks_async(
+                    "post_node_execute", **self._post_node_execute_kwargs(exc_value)
+                )
+            except Exception:
+                self._log_error("[post-node-execute]")
+                raise
+
+
+def execute_node(
+    node_: node.Node,
+    kwargs: Dict[str, Any],
+    adapter: LifecycleAdapterSet,
+    run_id: str = None,
+    task_id: str = None,
+) -> Any:
+    """Executes a single node, calling out to the lifecycle hooks/methods of the adapter.
+
+    :param node_: Node to execute
+    :param kwargs: Keyword arguments to pass to the node
+    :param adapter: Adapter to use to compute
+    :param run_id: Run ID to use
+    :param task_id: Task ID to use -- this is optional for the purpose of the task-based execution...
+    :return: The result of the node
+    """
+    if adapter.is_empty:
+        # Fast path -- nothing to dispatch to, so we skip the lifecycle machinery entirely
+        try:
+            return node_(**kwargs)
+        except Exception:
+            logger.exception(create_error_message(kwargs, node_, ""))
+            raise
+    with _NodeLifecycle(node_, kwargs, adapter, run_id, task_id) as lifecycle:
+        do_node_execute = adapter.get_sync_method("do_node_execute")
+        if do_node_execute is not None:
+            lifecycle.result = do_node_execute(**lifecycle.hook_kwargs)
+        else:
+            lifecycle.result = node_(**kwargs)
+    return lifecycle.result
+
+
+def _start_step(
+    step: ExecutionStep,
+    inputs: Dict[str, Any],
+    computed: Dict[str, Any],
+    overrides: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Starts a step of an execution plan, see execute_plan -- the node of the step is only to be
+    executed if this returns its kwargs.
+
+    :return: The kwargs to execute the node with, None if it has been handled
+    """
+    node_ = step.node_
+    if step.step_type == ExecutionStepType.OVERRIDE:
+        computed[node_.name] = overrides[node_.name]
+        return None
+    logger.debug(f"Computing {node_.name}.")
+    if step.step_type == ExecutionStepType.INPUT:
+        if node_.name in inputs:
+            computed[node_.name] = inputs[node_.name]
+        elif step.required:
+            raise NotImplementedError(f"{node_.name} was expected to be passed in but was not.")
+        return None
+    return {name: computed[name] for name in step.kwarg_names if name in computed}
+
+
+def _finish_step(
+    step: ExecutionStep, computed: Dict[str, Any], stats: Optional[SubdagExecutionStats]
+):
+    """Finishes a step of an execution plan, releasing the results that are no longer needed."""
+    if stats is not None:
+        stats.record_results_held(computed)
+    for name in step.release_after:
+        if name in computed:
+            del computed[name]
+            if stats is not None:
+                stats.record_result_released(name)
+
+
+def execute_plan(
+    plan: ExecutionPlan,
     inputs: Dict[str, Any],
     adapter: LifecycleAdapterSet = None,
     computed: Dict[str, Any] = None,
     overrides: Dict[str, Any] = None,
     run_id: str = None,
     task_id: str = None,
+    stats: SubdagExecutionStats = None,
 ) -> Dict[str, Any]:
-    """Base function to execute a subdag. This conducts a depth first traversal of the graph.
+    """Runs a compiled execution plan. Note the plan must have been compiled against the same
+    keys of inputs/computed/overrides that are passed in here.
 
-    :param nodes: Nodes to compute
+    :param plan: Plan to execute, see compile_execution_plan
     :param inputs: Inputs, external
     :param adapter:  Adapter to use to compute
     :param computed:  Already computed nodes
     :param overrides: Overrides to use, will short-circuit computation
     :param run_id: Run ID to use
     :param task_id: Task ID to use -- this is optional for the purpose of the task-based execution...
+    :param stats: Optional stats object to populate with memory statistics
     :return: The results
     """
     if overrides is None:
         overrides = {}
     if computed is None:
         computed = {}
-    nodes_to_compute = {node_.name for node_ in nodes}
-
     if adapter is None:
         adapter = LifecycleAdapterSet()
+    for step in plan.steps:
+        kwargs = _start_step(step, inputs, computed, overrides)
+        if kwargs is not None:
+            computed[step.node_.name] = execute_node(step.node_, kwargs, adapter, run_id, task_id)
+        _finish_step(step, computed, stats)
+    return computed
 
-    def dfs_traverse(
-        node_: node.Node, dependency_type: node.DependencyType = node.DependencyType.REQUIRED
-    ):
-        if node_.name in computed:
-            return
-        if node_.name in overrides:
-            computed[node_.name] = overrides[node_.name]
-            return
-        for n in node_.dependencies:
-            if n.name not in computed:
-                _, node_dependency_type = node_.input_types[n.name]
-                dfs_traverse(n, node_dependency_type)
-
-        logger.debug(f"Computing {node_.name}.")
-        if node_.user_defined:
-            if node_.name not in inputs:
-                if dependency_type != node.DependencyType.OPTIONAL:
-                    raise NotImplementedError(
-                        f"{node_.name} was expected to be passed in but was not."
-                    )
-                return
-            result = inputs[node_.name]
+
+def _in_current_context(fn: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """Binds a call to the current context, so that context variables (E.G. those set by the task)
+    are visible when it is run in another thread -- run_in_executor doesn't do this."""
+    return functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+async def execute_node_async(
+    node_: node.Node,
+    kwargs: Dict[str, Any],
+    adapter: LifecycleAdapterSet,
+    run_id: str = None,
+    task_id: str = None,
+    sync_executor: Optional[Executor] = None,
+) -> Any:
+    """Executes a single node on the running event loop, calling out to both the synchronous and
+    asynchronous lifecycle hooks/methods of the adapter. Nodes that are coroutine functions are
+    awaited, others are called in a separate thread -- if the adapter has no asynchronous node
+    hooks/methods, they are executed entirely by execute_node, in that thread.
+
+    :param node_: Node to execute
+    :param kwargs: Keyword arguments to pass to the node
+    :param adapter: Adapter to use to compute
+    :param run_id: Run ID to use
+    :param task_id: Task ID to use -- this is optional for the purpose of the task-based execution...
+    :param sync_executor: Executor to run synchronous nodes in. None means the loop's default.
+    :return: The result of the node
+    """
+    loop = asyncio.get_running_loop()
+    is_coroutine = inspect.iscoroutinefunction(node_.callable)
+    has_async_node_hooks = (
+        adapter.does_hook("pre_node_execute", is_async=True)
+        or adapter.does_hook("post_node_execute", is_async=True)
+        or adapter.does_method("do_node_execute", is_async=True)
+    )
+    if not is_coroutine and not has_async_node_hooks:
+        return await loop.run_in_executor(
+            sync_executor,
+            _in_current_context(execute_node, node_, kwargs, adapter, run_id, task_id),
+        )
+    async with _NodeLifecycle(node_, kwargs, adapter, run_id, task_id) as lifecycle:
+        do_node_execute = adapter.get_sync_method("do_node_execute")
+        if adapter.does_method("do_node_execute", is_async=True):
+            lifecycle.result = await adapter.call_lifecycle_method_async(
+                "do_node_execute", **lifecycle.hook_kwargs
+            )
+        elif do_node_execute is not None and not is_coroutine:
+            lifecycle.result = await loop.run_in_executor(
+                sync_executor, _in_current_context(do_node_execute, **lifecycle.hook_kwargs)
+            )
+        elif do_node_execute is not None:
+            # If this calls the node, it returns its coroutine
+            result = do_node_execute(**lifecycle.hook_kwargs)
+            lifecycle.result = await result if inspect.isawaitable(result) else result
+        elif not is_coroutine:
+            lifecycle.result = await loop.run_in_executor(
+                sync_executor, _in_current_context(node_, **kwargs)
+            )
         else:
-            kwargs = {}  # construct signature
-            for dependency in node_.dependencies:
-                if dependency.name in computed:
-                    kwargs[dependency.name] = computed[dependency.name]
-            error = None
-            result = None
-            success = True
-            pre_node_execute_errored = False
-            try:
-                if adapter.does_hook("pre_node_execute", is_async=False):
-                    try:
-                        adapter.call_all_lifecycle_hooks_sync(
-                            "pre_node_execute",
-                            run_id=run_id,
-                            node_=node_,
-                            kwargs=kwargs,
-                            task_id=task_id,
-                        )
-                    except Exception as e:
-                        pre_node_execute_errored = True
-                        raise e
-
-                if adapter.does_method("do_node_execute", is_async=False):
-                    result = adapter.call_lifecycle_method_sync(
-                        "do_node_execute",
-                        run_id=run_id,
-                        node_=node_,
-                        kwargs=kwargs,
-                        task_id=task_id,
-                    )
-                else:
-                    result = node_(**kwargs)
-            except Exception as e:
-                success = False
-                error = e
-                step = "[pre-node-execute]" if pre_node_execute_errored else ""
-                message = create_error_message(kwargs, node_, step)
-                logger.exception(message)
-                raise
-            finally:
-                if not pre_node_execute_errored and adapter.does_hook(
-                    "post_node_execute", is_async=False
-                ):
-                    try:
-                        adapter.call_all_lifecycle_hooks_sync(
-                            "post_node_execute",
-                            run_id=run_id,
-                            node_=node_,
-                            kwargs=kwargs,
-                            success=success,
-                            error=error,
-                            result=result,
-                            task_id=task_id,
-                        )
-                    except Exception:
-                        message = create_error_message(kwargs, node_, "[post-node-execute]")
-                        logger.exception(message)
-                        raise
-
-        computed[node_.name] = result
-        # > pruning the graph
-        # This doesn't narrow it down to the entire space of the graph
-        # E.G. if something is not needed by this current execution due to
-        # the selection of nodes to run it might not prune everything.
-        # to do this we'd need to first determine all nodes on the path, then prune
-        # We may also want to use a reference counter for slightly cleaner/more efficient memory management
-
-        for dep in node_.dependencies:
-            if dep.name in computed and dep.name not in nodes_to_compute:
-                for downstream_node in dep.depended_on_by:
-                    # if it isn't computed, and it isn't required, we can't prune
-                    if (
-                        downstream_node.name not in computed
-                        or downstream_node.name in nodes_to_compute
-                    ):
-                        break
-                # If the result of this node is no longer needed, we can prune it/save the memory
-                else:
-                    del computed[dep.name]
+            lifecycle.result = await node_(**kwargs)
+    return lifecycle.result
 
-    for final_var_node in nodes:
-        dep_type = node.DependencyType.REQUIRED
-        if final_var_node.user_defined:
-            # from the top level, we don't know if this UserInput is required. So mark as optional.
-            dep_type = node.DependencyType.OPTIONAL
-        dfs_traverse(final_var_node, dep_type)
+
+async def execute_plan_async(
+    plan: ExecutionPlan,
+    inputs: Dict[str, Any],
+    adapter: LifecycleAdapterSet = None,
+    computed: Dict[str, Any] = None,
+    overrides: Dict[str, Any] = None,
+    run_id: str = None,
+    task_id: str = None,
+    sync_executor: Optional[Executor] = None,
+    stats: SubdagExecutionStats = None,
+) -> Dict[str, Any]:
+    """Runs a compiled execution plan on the running event loop -- see execute_plan and
+    execute_node_async. Nodes are executed one after the other, in the order of the plan.
+
+    :param plan: Plan to execute, see compile_execution_plan
+    :param inputs: Inputs, external
+    :param adapter:  Adapter to use to compute
+    :param computed:  Already computed nodes
+    :param overrides: Overrides to use, will short-circuit computation
+    :param run_id: Run ID to use
+    :param task_id: Task ID to use -- this is optional for the purpose of the task-based execution...
+    :param sync_executor: Executor to run synchronous nodes in. None means the loop's default.
+    :param stats: Optional stats object to populate with memory statistics
+    :return: The results
+    """
+    if overrides is None:
+        overrides = {}
+    if computed is None:
+        computed = {}
+    if adapter is None:
+        adapter = LifecycleAdapterSet()
+    for step in plan.steps:
+        kwargs = _start_step(step, inputs, computed, overrides)
+        if kwargs is not None:
+            computed[step.node_.name] = await execute_node_async(
+                step.node_, kwargs, adapter, run_id, task_id, sync_executor
+            )
+        _finish_step(step, computed, stats)
     return computed
 
 
+def execute_subdag(
+    nodes: Collection[node.Node],
+    inputs: Dict[str, Any],
+    adapter: LifecycleAdapterSet = None,
+    computed: Dict[str, Any] = None,
+    overrides: Dict[str, Any] = None,
+    run_id: str = None,
+    task_id: str = None,
+    stats: SubdagExecutionStats = None,
+) -> Dict[str, Any]:
+    """Base function to execute a subdag. This compiles an execution plan (a depth first traversal
+    of the graph) and runs it. See compile_execution_plan for the details -- if you are executing
+    the same subdag repeatedly, you can compile the plan once and call execute_plan directly.
+
+    Intermediate results are reference-counted -- a result is released as soon as its last
+    consumer has run. Requested nodes, inputs, overrides, and anything passed in through
+    `computed` are never released.
+
+    :param nodes: Nodes to compute
+    :param inputs: Inputs, external
+    :param adapter:  Adapter to use to compute
+    :param computed:  Already computed nodes
+    :param overrides: Overrides to use, will short-circuit computation
+    :param run_id: Run ID to use
+    :param task_id: Task ID to use -- this is optional for the purpose of the task-based execution...
+    :param stats: Optional stats object to populate with memory statistics
+    :return: The results
+    """
+    if overrides is None:
+        overrides = {}
+    if computed is None:
+        computed = {}
+    plan = compile_execution_plan(nodes, inputs.keys(), computed.keys(), overrides.keys())
+    return execute_plan(
+        plan,
+        inputs,
+        adapter=adapter,
+        computed=computed,
+        overrides=overrides,
+        run_id=run_id,
+        task_id=task_id,
+        stats=stats,
+    )
+
+
 def nodes_between(
     end_node: node.Node,
     search_condition: lambda node_: bool,
@@ -2,11 +2,12 @@ import abc
 import dataclasses
 import enum
 from collections import defaultdict
-from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+from typing import Any, Collection, Dict, List, Mapping, Optional, Set, Tuple
 
 from hamilton import node
 from hamilton.execution import graph_functions
 from hamilton.execution.graph_functions import get_node_levels, topologically_sort_nodes
+from hamilton.function_modifiers import metadata
 from hamilton.lifecycle import base as lifecycle_base
 from hamilton.node import Node, NodeType
 
@@ -139,6 +140,10 @@ class TaskImplementation(TaskSpec):
     task_id: str = dataclasses.field(init=False)
     dynamic_inputs: Dict[str, Any] = dataclasses.field(default_factory=dict)
     run_id: str = dataclasses.field(default_factory=str)
+    # Whether this is an expander whose results are streamed to the controller as a generator
+    stream_expansion: bool = False
+    # Whether this is a collector that consumes results as they are produced
+    stream_collect: bool = False
 
     def bind(self, dynamic_inputs: Dict[str, Any]) -> "TaskImplementation":
         """Binds dynamic inputs to the task spec, returning a new task spec"""
@@ -317,6 +322,204 @@ class GroupNodesByLevel(GroupingStrategy):
         return out
 
 
+class GroupNodesByCost(GroupByRepeatableBlocks):
+    """Groups nodes into tasks by their cost, so that cheap nodes don't each pay the overhead of a
+    (remote) task. Parallel blocks are grouped as in GroupByRepeatableBlocks. Other nodes are fused
+    into blocks, which are all executed by the remote executor:
+
+    1. Linear chains: a node joins the task of its dependencies if it is their only consumer --
+       this never delays anything.
+    2. Cheap nodes (costing at most `max_fused_cost`) join the task of one of their dependencies
+       (or the first task of cheap nodes without any, E.G. inputs).
+
+    Other nodes get a task of their own, so independent expensive branches still run in parallel.
+    Nodes are never fused in a way that would make tasks depend on each other cyclically.
+
+    The cost of a node (in seconds) comes from `costs` (E.G. timings recorded on previous runs),
+    else from its `@estimated_cost` decorator, E.G. `@estimated_cost(seconds=0.5)`, else it is
+    `default_cost`.
+    """
+
+    COST_TAG = metadata.ESTIMATED_COST_TAG
+
+    def __init__(
+        self,
+        costs: Optional[Mapping[str, float]] = None,
+        max_fused_cost: float = 0.01,
+        default_cost: Optional[float] = None,
+    ):
+        """Initializes the grouping strategy.
+
+        :param costs: Estimated cost of nodes, by name, in seconds.
+        :param max_fused_cost: Cost under which a node is cheap enough to be fused with others.
+            This should be around the overhead of a task on the executor.
+        :param default_cost: Cost of nodes with no estimate. None means unknown -- these are only
+            fused as part of linear chains.
+        """
+        self.costs = costs if costs is not None else {}
+        self.max_fused_cost = max_fused_cost
+        self.default_cost = default_cost
+
+    def node_cost(self, node_: node.Node) -> Optional[float]:
+        """Estimated cost of a node, in seconds, None if unknown."""
+        if node_.user_defined:
+            return 0.0
+        if node_.name in self.costs:
+            return self.costs[node_.name]
+        if self.COST_TAG in node_.tags:
+            return float(node_.tags[self.COST_TAG])
+        return self.default_cost
+
+    def group_nodes(self, nodes: List[node.Node]) -> List[NodeGroup]:
+        """Groups nodes, fusing the ones outside of parallel blocks. This works as follows:
+        1. Group parallel blocks as GroupByRepeatableBlocks does
+        2. Go through the other nodes in topological order, adding each to the group of one of its
+           dependencies if it is cheap or their only consumer, else to a new group
+        3. Track the (transitive) groups each group depends on, to only add a node to a group that
+           none of its other dependencies' groups depend on
+
+        The consumers outside of each group, and the groups that depend on it, are kept up to date
+        as nodes are added, so this is about linear in the size of the graph.
+
+        :param nodes: Nodes to group
+        :return: The groups
+        """
+        node_names = {node_.name for node_ in nodes}
+        blocks = [
+            group
+            for group in super(GroupNodesByCost, self).group_nodes(nodes)
+            if group.purpose != NodeGroupPurpose.EXECUTE_SINGLE
+        ]
+        members = [list(group.nodes) for group in blocks]
+        fusable = [False] * len(blocks)
+        ancestors: List[Set[int]] = [set() for _ in blocks]
+        descendants: List[Set[int]] = [set() for _ in blocks]
+        # Consumers of each group's nodes that are not in it -- blocks are never fused into
+        outside_consumers: List[Set[str]] = [set() for _ in blocks]
+        group_of = {node_.name: i for i, group in enumerate(blocks) for node_ in group.nodes}
+        cheap_roots = None
+
+        def add_ancestors(group: int, new_ancestors: Set[int]):
+            new_ancestors = new_ancestors - ancestors[group]
+            if not new_ancestors:
+                # Descendants of the group already have all of its ancestors
+                return
+            affected = [group, *descendants[group]]
+            for other in affected:
+                ancestors[other].update(new_ancestors)
+            for ancestor in new_ancestors:
+                descendants[ancestor].update(affected)
+
+        def add_member(group: int, node_: node.Node):
+            members[group].append(node_)
+            group_of[node_.name] = group
+            outside_consumers[group].discard(node_.name)
+            outside_consumers[group].update(
+                consumer.name for consumer in node_.depended_on_by if consumer.name in node_names
+            )
+
+        def is_only_consumer(group: int, node_: node.Node) -> bool:
+            return outside_consumers[group] <= {node_.name}
+
+        for node_ in topologically_sort_nodes(nodes):
+            dependencies = list(
+                dict.fromkeys(
+                    group_of[dependency.name]
+                    for dependency in node_.dependencies
+                    if dependency.name in group_of
+                )
+            )
+            if node_.name not in group_of:
+                cost = self.node_cost(node_)
+                is_cheap = cost is not None and cost <= self.max_fused_cost
+                # A cheap node can join a group if that doesn't make it depend on anything new
+                # (delaying its other consumers), else it has to be the group's only consumer
+                dependency_ancestors = (
+                    ancestors[dependencies[0]]
+                    if len(dependencies) == 1
+                    else set().union(*(ancestors[other] for other in dependencies))
+                )
+                candidates = [
+                    group
+                    for group in dependencies
+                    if fusable[group]
+                    and group not in dependency_ancestors
+                    and (
+                        (
+                            is_cheap
+                            and all(
+                                other == group or other in ancestors[group]
+                                for other in dependencies
+                            )
+                        )
+                        or is_only_consumer(group, node_)
+                    )
+                ]
+                if node_.node_role not in (NodeType.STANDARD, NodeType.EXTERNAL):
+                    group = None
+                elif candidates:
+                    group = candidates[0]
+                elif (
+                    is_cheap
+                    and not dependencies
+                    and cheap_roots is not None
+                    and not ancestors[cheap_roots]
+                ):
+                    group = cheap_roots
+                else:
+                    group = None
+                if group is None:
+                    group = len(members)
+                    members.append([])
+                    fusable.append(node_.node_role in (NodeType.STANDARD, NodeType.EXTERNAL))
+                    ancestors.append(set())
+                    descendants.append(set())
+                    outside_consumers.append(set())
+                    if is_cheap and not dependencies and cheap_roots is None:
+                        cheap_roots = group
+                add_member(group, node_)
+            group = group_of[node_.name]
+            new_ancestors = set()
+            for dependency in dependencies:
+                if dependency != group:
+                    new_ancestors.update(ancestors[dependency] | {dependency})
+            add_ancestors(group, new_ancestors)
+
+        return blocks + [
+            NodeGroup(
+                base_id=group_nodes[0].name,
+                spawning_task_base_id=None,
+                nodes=group_nodes,
+                purpose=convert_node_type_to_group_purpose(group_nodes[0].node_role),
+            )
+            for group_nodes in members[len(blocks) :]
+        ]
+
+
+def is_in_parallel_block(node_: Node) -> bool:
+    """Whether a node is repeated for every item of a Parallelizable[] node, i.e. it is the
+    Parallelizable[] node itself, or it is downstream of one without a Collect[] node in between.
+    Results of these nodes only exist per item, so they cannot be short-circuited by name.
+
+    :param node_: Node to check
+    :return: True if the node is an expander or is in a block between an expander and a collector
+    """
+    visited = set()
+    stack = [node_]
+    while len(stack) > 0:
+        current = stack.pop()
+        if current.name in visited:
+            continue
+        visited.add(current.name)
+        if current.node_role == NodeType.EXPAND:
+            return True
+        if current.node_role == NodeType.COLLECT:
+            # whatever is upstream of a collector is outside of its block
+            continue
+        stack.extend(current.dependencies)
+    return False
+
+
 def create_task_plan(
     node_groups: List[NodeGroup],
     outputs: List[str],
@@ -0,0 +1,244 @@
+import abc
+import collections
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from hamilton.execution.grouping import TaskSpec
+from hamilton.lifecycle import GraphExecutionHook, NodeExecutionHook
+
+"""
+Profile-guided scheduling of tasks. Node runtimes are recorded across runs in a local profile,
+which tells the execution state which ready task to release first -- E.G. the one with the longest
+remaining path through the graph, so that long critical paths are not started last:
+
+.. code-block:: python
+
+    from hamilton import driver
+    from hamilton.execution import scheduling
+
+    profile = scheduling.NodeRuntimeProfile("./.hamilton_profile.json")
+    dr = (
+        driver.Builder()
+        .with_modules(my_module)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_adapters(scheduling.NodeRuntimeProfiler(profile))
+        .with_task_prioritizer(scheduling.CriticalPathPrioritizer(profile))
+        .build()
+    )
+"""
+
+
+class NodeRuntimeProfile(Mapping[str, float]):
+    """Estimated runtime of nodes, in seconds, by name -- an exponential moving average of their
+    recorded runtimes, weighted towards the latest. Thread-safe.
+
+    This is persisted as JSON to a local file (if given a path), which is read on initialization
+    and written by `save`. Copies in other processes (E.G. sent to them by task executors) append
+    what they record to a journal next to that file, which `save` merges in -- without a path,
+    copies record nothing.
+
+    As a mapping, this can be passed as the costs of GroupNodesByCost.
+    """
+
+    def __init__(self, path: Optional[str] = None, smoothing: float = 0.5):
+        """Initializes the profile, reading it from its file if it exists.
+
+        :param path: Path of the JSON file to persist the profile to. None means in memory only.
+        :param smoothing: Weight of the latest runtime in the estimates, between 0 (exclusive) and
+            1 (only the latest runtime counts).
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"smoothing must be in (0, 1], got {smoothing}")
+        self.path = path
+        self.smoothing = smoothing
+        self._is_copy = False
+        self._lock = threading.Lock()
+        # node_name -> (estimated runtime, number of runtimes recorded)
+        self._runtimes: Dict[str, Tuple[float, int]] = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self._runtimes = {
+                    node_name: (entry["runtime"], entry["count"])
+                    for node_name, entry in json.load(f)["nodes"].items()
+                }
+
+    @property
+    def _journal_path(self) -> str:
+        return f"{self.path}.journal"
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "smoothing": self.smoothing}
+
+    def __setstate__(self, state: dict):
+        self.path = state["path"]
+        self.smoothing = state["smoothing"]
+        self._is_copy = True
+        self._lock = threading.Lock()
+        self._runtimes = {}
+
+    def _update(self, node_name: str, runtime: float):
+        estimate, count = self._runtimes.get(node_name, (runtime, 0))
+        self._runtimes[node_name] = (estimate + self.smoothing * (runtime - estimate), count + 1)
+
+    def record(self, node_name: str, runtime: float):
+        """Records a runtime of a node.
+
+        :param node_name: Name of the node.
+        :param runtime: Time the node took to execute, in seconds.
+        """
+        if self._is_copy:
+            if self.path is not None:
+                # Appends of a single short line are atomic, so processes can share the journal
+                with open(self._journal_path, "a") as f:
+                    f.write(json.dumps([node_name, runtime]) + "\n")
+            return
+        with self._lock:
+            self._update(node_name, runtime)
+
+    def save(self):
+        """Merges in the runtimes recorded by copies, and writes the profile to its file. This is a
+        no-op for profiles without a path, and for copies."""
+        if self.path is None or self._is_copy:
+            return
+        with self._lock:
+            if os.path.exists(self._journal_path):
+                # Moved first, so that runtimes appended while we read are kept for the next save
+                merging_path = f"{self._journal_path}.{os.getpid()}"
+                os.replace(self._journal_path, merging_path)
+                with open(merging_path) as f:
+                    for line in f:
+                        self._update(*json.loads(line))
+                os.remove(merging_path)
+            contents = {
+                "nodes": {
+                    node_name: {"runtime": runtime, "count": count}
+                    for node_name, (runtime, count) in self._runtimes.items()
+                }
+            }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(contents, f)
+        os.replace(temp_path, self.path)
+
+    def count(self, node_name: str) -> int:
+        """Number of runtimes recorded for a node."""
+        return self._runtimes.get(node_name, (0.0, 0))[1]
+
+    def __getitem__(self, node_name: str) -> float:
+        return self._runtimes[node_name][0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._runtimes))
+
+    def __len__(self) -> int:
+        return len(self._runtimes)
+
+
+class NodeRuntimeProfiler(NodeExecutionHook, GraphExecutionHook):
+    """Records the runtime of each node that executes successfully in a NodeRuntimeProfile, and
+    saves it after each run."""
+
+    def __init__(self, profile: NodeRuntimeProfile):
+        """Initializes the hook.
+
+        :param profile: Profile to record runtimes in.
+        """
+        self.profile = profile
+        # (run_id, task_id, node_name) -> start time, as nodes of different tasks run concurrently
+        self._start_times: Dict[Tuple[str, Optional[str], str], float] = {}
+
+    def __getstate__(self) -> dict:
+        return {"profile": self.profile}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state)
+
+    def run_before_node_execution(
+        self, *, node_name: str, task_id: Optional[str], run_id: str, **future_kwargs: Any
+    ):
+        self._start_times[(run_id, task_id, node_name)] = time.perf_counter()
+
+    def run_after_node_execution(
+        self,
+        *,
+        node_name: str,
+        success: bool,
+        task_id: Optional[str],
+        run_id: str,
+        **future_kwargs: Any,
+    ):
+        start_time = self._start_times.pop((run_id, task_id, node_name), None)
+        if success and start_time is not None:
+            self.profile.record(node_name, time.perf_counter() - start_time)
+
+    def run_before_graph_execution(self, **future_kwargs: Any):
+        """Placeholder required to subclass `GraphExecutionHook`"""
+        pass
+
+    def run_after_graph_execution(self, **future_kwargs: Any):
+        """Saves the profile."""
+        self.profile.save()
+
+
+class TaskPrioritizer(abc.ABC):
+    """Base class for prioritizing tasks -- of the tasks that are ready to run, the execution state
+    releases the one with the highest priority first."""
+
+    @abc.abstractmethod
+    def prioritize(self, tasks: List[TaskSpec]) -> Dict[str, float]:
+        """Gives the priority of tasks.
+
+        :param tasks: All tasks of the execution (see grouping.create_task_plan)
+        :return: Priority by task base ID -- tasks spawned from the same spec share it.
+        """
+        pass
+
+
+class CriticalPathPrioritizer(TaskPrioritizer):
+    """Prioritizes the tasks with the most remaining work -- their cost, plus that of the most
+    costly chain of tasks that depend on them. This starts the critical path first, which shortens
+    the overall runtime of unbalanced graphs.
+
+    The cost of a task is the sum of its nodes' costs. Tasks spawned by Parallelizable[] nodes run
+    in parallel, so each counts once.
+    """
+
+    def __init__(self, costs: Mapping[str, float], default_cost: float = 0.0):
+        """Initializes the prioritizer.
+
+        :param costs: Estimated cost of nodes, by name, in seconds -- E.G. a NodeRuntimeProfile.
+        :param default_cost: Cost of nodes with no estimate.
+        """
+        self.costs = costs
+        self.default_cost = default_cost
+
+    def prioritize(self, tasks: List[TaskSpec]) -> Dict[str, float]:
+        dependents = collections.defaultdict(list)
+        num_dependencies = {}
+        for task in tasks:
+            num_dependencies[task.base_id] = len(task.base_dependencies)
+            for dependency in task.base_dependencies:
+                dependents[dependency].append(task.base_id)
+        # Topological order, so we can go through it backwards -- dependents before dependencies
+        in_order = [task.base_id for task in tasks if num_dependencies[task.base_id] == 0]
+        for base_id in in_order:
+            for dependent in dependents[base_id]:
+                num_dependencies[dependent] -= 1
+                if num_dependencies[dependent] == 0:
+                    in_order.append(dependent)
+        costs = {
+            task.base_id: sum(self.costs.get(node_.name, self.default_cost) for node_ in task.nodes)
+            for task in tasks
+        }
+        remaining_work = {}
+        for base_id in reversed(in_order):
+            remaining_work[base_id] = costs[base_id] + max(
+                (remaining_work[dependent] for dependent in dependents[base_id]), default=0.0
+            )
+        return remaining_work
@@ -0,0 +1,195 @@
+"""Utilities to hand large values to/from worker processes through shared memory, rather than
+pickling them. The sender copies the value into a shared memory segment once and passes a small
+handle, which the receiver maps without copying.
+
+This supports:
+
+1. numpy arrays (of non-object dtypes)
+2. pandas dataframes, whose columns are all such arrays, with a default (range) index
+3. pyarrow tables (if pyarrow is installed), written in the Arrow IPC format
+
+Anything else is pickled as usual. Lists (E.G. the inputs to a Collect[] node) are handled
+element-wise.
+
+Results are unlinked by the driver as soon as it maps them, and inputs once their task completes
+(as the driver does not know when the worker has mapped them). The memory is freed once the last
+object referring to it is garbage collected. This relies on POSIX shared memory semantics, so it
+is not supported on Windows.
+"""
+
+import ctypes
+import dataclasses
+import logging
+import weakref
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedArray:
+    """Handle to a numpy array in shared memory"""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+
+    def attach(self, on_attach: Callable[[shared_memory.SharedMemory], None]) -> np.ndarray:
+        shm = shared_memory.SharedMemory(name=self.name)
+        on_attach(shm)
+        array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+        # Views of the array keep it alive, so this is only called once nothing refers to it
+        weakref.finalize(array, shm.close)
+        return array
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedDataFrame:
+    """Handle to a pandas dataframe, with its columns in shared memory"""
+
+    columns: List[Tuple[Any, SharedArray]]
+    index: Tuple[int, int, int]
+    index_name: Optional[str]
+
+    def attach(self, on_attach: Callable[[shared_memory.SharedMemory], None]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: column.attach(on_attach) for name, column in self.columns},
+            index=pd.RangeIndex(*self.index, name=self.index_name),
+            copy=False,
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedArrowTable:
+    """Handle to a pyarrow table in shared memory, stored in the Arrow IPC stream format"""
+
+    name: str
+    size: int
+
+    def attach(self, on_attach: Callable[[shared_memory.SharedMemory], None]) -> Any:
+        import pyarrow as pa
+
+        shm = shared_memory.SharedMemory(name=self.name)
+        on_attach(shm)
+        address = ctypes.addressof(ctypes.c_char.from_buffer(shm.buf))
+        # The buffer keeps the segment mapped for as long as the table (or a slice of it) is alive
+        buffer = pa.foreign_buffer(address, self.size, base=shm)
+        return pa.ipc.open_stream(buffer).read_all()
+
+
+SharedValue = (SharedArray, SharedDataFrame, SharedArrowTable)
+
+
+def _create_segment(size: int) -> shared_memory.SharedMemory:
+    # Zero-size segments are not allowed
+    return shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+
+def _share_array(array: np.ndarray, segments: List[shared_memory.SharedMemory]) -> SharedArray:
+    shm = _create_segment(array.nbytes)
+    segments.append(shm)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return SharedArray(name=shm.name, shape=array.shape, dtype=array.dtype)
+
+
+def _share_arrow_table(table: Any, segments: List[shared_memory.SharedMemory]) -> SharedArrowTable:
+    import pyarrow as pa
+
+    mock_sink = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock_sink, table.schema) as writer:
+        writer.write_table(table)
+    size = mock_sink.size()
+    shm = _create_segment(size)
+    segments.append(shm)
+    # Wrapping the memoryview exports it, so we release it before we're done
+    buffer = pa.py_buffer(shm.buf)
+    with pa.ipc.new_stream(pa.FixedSizeBufferWriter(buffer), table.schema) as writer:
+        writer.write_table(table)
+    del buffer
+    return SharedArrowTable(name=shm.name, size=size)
+
+
+def _is_shareable_array(value: Any) -> bool:
+    return isinstance(value, np.ndarray) and not value.dtype.hasobject
+
+
+def _is_shareable_dataframe(value: Any) -> bool:
+    return (
+        isinstance(value, pd.DataFrame)
+        and isinstance(value.index, pd.RangeIndex)
+        and value.columns.is_unique
+        and all(isinstance(dtype, np.dtype) and not dtype.hasobject for dtype in value.dtypes)
+    )
+
+
+def _is_arrow_table(value: Any) -> bool:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return False
+    return isinstance(value, pa.Table)
+
+
+def share_value(value: Any, min_size_bytes: int, segments: List[shared_memory.SharedMemory]) -> Any:
+    """Copies a value into shared memory, if we know how to and it is large enough to be worth it.
+
+    :param value: Value to share
+    :param min_size_bytes: Minimum size for us to share it, smaller values are pickled as usual
+    :param segments: List to add the segments we create to, so the caller can manage them
+    :return: A handle to the shared value, or the value itself if we did not share it
+    """
+    if _is_shareable_array(value) and value.nbytes >= min_size_bytes:
+        return _share_array(value, segments)
+    if _is_shareable_dataframe(value) and value.memory_usage(index=False).sum() >= min_size_bytes:
+        return SharedDataFrame(
+            columns=[(name, _share_array(value[name].values, segments)) for name in value.columns],
+            index=(value.index.start, value.index.stop, value.index.step),
+            index_name=value.index.name,
+        )
+    if _is_arrow_table(value) and value.nbytes >= min_size_bytes:
+        return _share_arrow_table(value, segments)
+    if isinstance(value, list):
+        return [share_value(item, min_size_bytes, segments) for item in value]
+    return value
+
+
+def attach_value(
+    value: Any, on_attach: Callable[[shared_memory.SharedMemory], None] = lambda shm: None
+) -> Any:
+    """Resolves a value returned by share_value, mapping it from shared memory if it was shared.
+
+    :param value: Value to resolve
+    :param on_attach: Called with each segment we attach to, E.G. to unlink it
+    :return: The value
+    """
+    if isinstance(value, SharedValue):
+        return value.attach(on_attach)
+    if isinstance(value, list):
+        return [attach_value(item, on_attach) for item in value]
+    return value
+
+
+def share_values(
+    values: Dict[str, Any], min_size_bytes: int, segments: List[shared_memory.SharedMemory]
+) -> Dict[str, Any]:
+    """Shares every value in a dictionary. See share_value."""
+    return {key: share_value(value, min_size_bytes, segments) for key, value in values.items()}
+
+
+def attach_values(
+    values: Dict[str, Any], on_attach: Callable[[shared_memory.SharedMemory], None]
+) -> Dict[str, Any]:
+    """Resolves every value in a dictionary. See attach_value."""
+    return {key: attach_value(value, on_attach) for key, value in values.items()}
+
+
+def unlink(shm: shared_memory.SharedMemory):
+    """Unlinks a segment, so it is freed once all mappings of it are closed."""
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        logger.debug(f"Shared memory segment {shm.name} was already unlinked")
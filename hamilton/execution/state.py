@@ -1,8 +1,21 @@
 import abc
 import collections
+import dataclasses
 import enum
+import heapq
+import itertools
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import pickle
+import queue
+import shutil
+import sys
+import tempfile
+import weakref
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from hamilton.execution.grouping import NodeGroupPurpose, TaskImplementation, TaskSpec
 
@@ -26,6 +39,52 @@ class TaskState(enum.Enum):
 GraphState = TaskState
 
 
+class TaskStateMap(collections.defaultdict):
+    """Map of task ID -> task state (defaulting to UNINITIALIZED) that counts the tasks in each
+    state. This allows us to derive the state of the graph without scanning every task."""
+
+    def __init__(self):
+        super().__init__(lambda: TaskState.UNINITIALIZED)
+        self.state_counts = collections.Counter()
+
+    def __setitem__(self, task_id: str, state: TaskState):
+        if task_id in self:
+            self.state_counts[super().__getitem__(task_id)] -= 1
+        super().__setitem__(task_id, state)
+        self.state_counts[state] += 1
+
+
+class DeferredResult(abc.ABC):
+    """A task result that is held outside of the controller (E.G. in a distributed object store).
+    The executor that produced it can pass it to its other tasks as is, so that it never makes a
+    round trip through the controller -- anything else resolves it first (see
+    resolve_deferred_results). Note that this means the result cache only holds a reference."""
+
+    @abc.abstractmethod
+    def resolve(self) -> Any:
+        """Gets the value of the result.
+
+        :return: The value
+        """
+        pass
+
+
+def resolve_deferred_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolves any deferred results, including those in lists (E.G. the inputs of a Collect[]).
+
+    :param results: Results, some of which may be deferred
+    :return: The results, with deferred ones resolved
+    """
+    out = {}
+    for key, value in results.items():
+        if isinstance(value, DeferredResult):
+            value = value.resolve()
+        elif isinstance(value, list) and any(isinstance(item, DeferredResult) for item in value):
+            value = [item.resolve() if isinstance(item, DeferredResult) else item for item in value]
+        out[key] = value
+    return out
+
+
 class ResultCache(abc.ABC):
     """Cache of intermediate results. Will likely want to add pruning to this..."""
 
@@ -62,6 +121,22 @@ class ResultCache(abc.ABC):
         """
         pass
 
+    def evict(
+        self,
+        keys: List[str],
+        group_id: Optional[str] = None,
+        spawning_task_id: Optional[str] = None,
+    ):
+        """Evicts results from the cache, once we know nothing else will read them. This is
+        best-effort -- caches that cannot evict can ignore it.
+
+        :param keys: Keys to evict
+        :param group_id: Group ID of the task whose results you wish to evict
+        :param spawning_task_id: Task ID of the task that spawned the task
+        whose results you wish to evict
+        """
+        pass
+
 
 class DictBasedResultCache(ResultCache):
     """Cache of intermediate results. Will likely want to add pruning to this..."""
@@ -114,6 +189,366 @@ class DictBasedResultCache(ResultCache):
             out[key] = self.cache[formatted_key]
         return out
 
+    def evict(
+        self,
+        keys: List[str],
+        group_id: Optional[str] = None,
+        spawning_task_id: Optional[str] = None,
+    ):
+        for key in keys:
+            self.cache.pop(self._format_key(group_id, spawning_task_id, key), None)
+
+
+class DiskSpillingResultCache(DictBasedResultCache):
+    """Result cache that keeps recently used results in memory, spilling the least recently used
+    large ones to disk once they exceed a memory budget. This keeps the memory the controller needs
+    bounded, no matter how many results there are. Spilled results are stored as:
+
+    1. Arrow IPC files for pyarrow tables/pandas dataframes (if pyarrow is installed)
+    2. .npy files for (non-object) numpy arrays
+    3. pickle files for everything else
+
+    Arrow/.npy files are memory-mapped when read, so reading them back is cheap. Note that numpy
+    arrays read back are read-only, and that pandas dataframes are converted back with
+    to_pandas(), which copies them into memory. Sizes are estimates -- we use the reported size
+    of tables and arrays, that of dataframes (estimating the size of python objects in object
+    columns from a sample of rows), and sys.getsizeof() for everything else.
+    """
+
+    def __init__(
+        self,
+        cache: Dict[str, Any],
+        directory: Optional[str] = None,
+        max_memory_bytes: int = 2**30,
+        spill_threshold_bytes: int = 2**20,
+    ):
+        """Initializes the cache.
+
+        :param cache: Initial results (inputs/overrides). These are never spilled.
+        :param directory: Directory to spill to. We create (and clean up) a temporary directory
+            within this. Defaults to the system's temporary directory.
+        :param max_memory_bytes: Budget for results held in memory, beyond which we spill
+        :param spill_threshold_bytes: Results smaller than this are always held in memory, as
+            they are not worth spilling
+        """
+        super(DiskSpillingResultCache, self).__init__(cache)
+        self.max_memory_bytes = max_memory_bytes
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.directory = tempfile.mkdtemp(prefix="hamilton-results-", dir=directory)
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, ignore_errors=True)
+        # Spillable results in memory, least recently used first, with their sizes
+        self._in_memory = collections.OrderedDict()
+        self._memory_bytes = 0
+        # formatted key -> (path, format) of results we've spilled
+        self._spilled = {}
+        self._num_spilled = 0
+
+    def write(
+        self,
+        results: Dict[str, Any],
+        group_id: Optional[str] = None,
+        spawning_task_id: Optional[str] = None,
+    ):
+        for key, value in results.items():
+            formatted_key = self._format_key(group_id, spawning_task_id, key)
+            self._remove(formatted_key)
+            self.cache[formatted_key] = value
+            size = estimate_size(value)
+            if size >= self.spill_threshold_bytes:
+                self._in_memory[formatted_key] = size
+                self._memory_bytes += size
+        self._spill_if_over_budget()
+
+    def read(
+        self,
+        keys: List[str],
+        group_id: Optional[str] = None,
+        spawning_task_id: Optional[str] = None,
+        optional: bool = False,
+    ) -> Dict[str, Any]:
+        """Reads results in bulk from the cache, loading any that were spilled.
+
+        :param keys: Keys to read
+        :param group_id: ID of the group (namespace) under which this key will be stored
+        :param spawning_task_id: ID of the spawning task (other part of the namespace) under which this
+        key will be stored
+        :param optional: If true, we don't mind if the key is not there
+        :return:  Dictionary of key -> result
+        """
+        out = {}
+        for key in keys:
+            formatted_key = self._format_key(group_id, spawning_task_id, key)
+            if formatted_key in self.cache:
+                if formatted_key in self._in_memory:
+                    self._in_memory.move_to_end(formatted_key)
+                out[key] = self.cache[formatted_key]
+            elif formatted_key in self._spilled:
+                out[key] = _load_spilled(*self._spilled[formatted_key])
+            elif optional:
+                continue
+            else:
+                raise KeyError(f"Key {formatted_key} not found in cache")  # noqa E713
+        return out
+
+    def evict(
+        self,
+        keys: List[str],
+        group_id: Optional[str] = None,
+        spawning_task_id: Optional[str] = None,
+    ):
+        for key in keys:
+            self._remove(self._format_key(group_id, spawning_task_id, key))
+
+    def _remove(self, formatted_key: str):
+        """Removes a result from memory and disk, if it is present."""
+        self.cache.pop(formatted_key, None)
+        if formatted_key in self._in_memory:
+            self._memory_bytes -= self._in_memory.pop(formatted_key)
+        if formatted_key in self._spilled:
+            path, _ = self._spilled.pop(formatted_key)
+            os.remove(path)
+
+    def _spill_if_over_budget(self):
+        """Spills the least recently used results to disk until we're within the memory budget."""
+        while self._memory_bytes > self.max_memory_bytes and len(self._in_memory) > 0:
+            formatted_key, size = self._in_memory.popitem(last=False)
+            self._memory_bytes -= size
+            self._num_spilled += 1
+            path = os.path.join(self.directory, str(self._num_spilled))
+            value = self.cache.pop(formatted_key)
+            self._spilled[formatted_key] = _spill(value, path)
+            logger.debug(f"Spilled result {formatted_key} ({size} bytes) to {path}")
+
+
+# Number of rows we measure the python objects of, to estimate the size of object columns
+_SIZE_ESTIMATE_SAMPLE_ROWS = 1000
+
+
+def _estimate_dataframe_size(df: pd.DataFrame) -> int:
+    """Estimates the size (in bytes) of a dataframe in memory. Without deep introspection, pandas
+    only counts the pointers of object columns (E.G. strings), so we measure the objects they
+    point to in a sample of evenly spaced rows, and extrapolate."""
+    size = int(df.memory_usage(index=True, deep=False).sum())
+    has_objects = any(dtype == object for dtype in df.dtypes) or df.index.dtype == object
+    if not has_objects or len(df) == 0:
+        return size
+    positions = np.linspace(0, len(df) - 1, min(len(df), _SIZE_ESTIMATE_SAMPLE_ROWS), dtype=int)
+    sample = df.iloc[positions]
+    objects_size = int(sample.memory_usage(index=True, deep=True).sum()) - int(
+        sample.memory_usage(index=True, deep=False).sum()
+    )
+    return size + objects_size * len(df) // len(sample)
+
+
+def estimate_size(value: Any) -> int:
+    """Estimates the size (in bytes) of a value in memory."""
+    if isinstance(value, pd.DataFrame):
+        return _estimate_dataframe_size(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "nbytes") and hasattr(value, "schema"):  # pyarrow table
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def _spill(value: Any, path: str) -> Tuple[str, str]:
+    """Writes a value to disk, choosing a format for it.
+
+    :param value: Value to write
+    :param path: Path to write to (without extension)
+    :return: The path written to and the format used
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    if pa is not None and isinstance(value, (pa.Table, pd.DataFrame)):
+        try:
+            table = pa.Table.from_pandas(value) if isinstance(value, pd.DataFrame) else value
+            with pa.OSFile(f"{path}.arrow", "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            return f"{path}.arrow", "pandas" if isinstance(value, pd.DataFrame) else "arrow"
+        except pa.ArrowException:
+            # E.G. columns of mixed types, we can always fall back to pickle
+            logger.debug(f"Could not convert to arrow, falling back to pickle for {path}")
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        path = f"{path}.npy"
+        np.save(path, value, allow_pickle=False)
+        return path, "numpy"
+    path = f"{path}.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path, "pickle"
+
+
+def _load_spilled(path: str, format_: str) -> Any:
+    """Loads a value spilled with _spill, memory-mapping it if we can. Dataframes are memory-mapped
+    as arrow tables, but converting them back to pandas copies them.
+
+    :param path: Path it was written to
+    :param format_: Format it was written in
+    :return: The value
+    """
+    if format_ in ("arrow", "pandas"):
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return table.to_pandas() if format_ == "pandas" else table
+    if format_ == "numpy":
+        return np.load(path, mmap_mode="r", allow_pickle=False)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+@dataclasses.dataclass
+class _CollectFailure:
+    """Marks a failed streaming collect, so we can tell it apart from results that are errors."""
+
+    error: Exception
+
+
+class CollectedResults:
+    """Iterator over the results of the tasks spawned by an expansion, for a streaming Collect[].
+    The controller puts results in as the tasks complete, and the collector consumes them from
+    another thread, blocking until the next one is available.
+    """
+
+    _DONE = object()
+
+    def __init__(self, collect_arg: str, ordered: bool = False):
+        """Initializes the results.
+
+        :param collect_arg: Name of the input to the collector that these results are for
+        :param ordered: Whether to yield results in the order of the expansion's items, rather
+            than the order in which they complete. Out-of-order results are buffered until then.
+        """
+        self.collect_arg = collect_arg
+        self.ordered = ordered
+        self.num_items = None
+        self.num_received = 0
+        self._next_index = 0
+        self._buffer = {}
+        self._queue = queue.SimpleQueue()
+
+    def put(self, index: int, result: Any):
+        """Adds the result of the item at the specified index.
+
+        :param index: Index of the item in the expansion
+        :param result: Result to add
+        """
+        self.num_received += 1
+        if not self.ordered:
+            self._queue.put(result)
+        else:
+            self._buffer[index] = result
+            while self._next_index in self._buffer:
+                self._queue.put(self._buffer.pop(self._next_index))
+                self._next_index += 1
+        self._close_if_complete()
+
+    def set_num_items(self, num_items: int):
+        """Sets the total number of items, once known. We stop iterating after all are received.
+
+        :param num_items: Number of items in the expansion
+        """
+        self.num_items = num_items
+        self._close_if_complete()
+
+    def fail(self, error: Exception):
+        """Fails the iteration, raising the error in the consumer.
+
+        :param error: Error to raise
+        """
+        self._queue.put(_CollectFailure(error))
+
+    def is_complete(self) -> bool:
+        return self.num_items is not None and self.num_received == self.num_items
+
+    def _close_if_complete(self):
+        if self.is_complete():
+            self._queue.put(self._DONE)
+
+    def __iter__(self) -> "CollectedResults":
+        return self
+
+    def __next__(self) -> Any:
+        item = self._queue.get()
+        if item is self._DONE or isinstance(item, _CollectFailure):
+            # Put it back, so that further calls to next() behave the same way
+            self._queue.put(item)
+            if item is self._DONE:
+                raise StopIteration
+            raise item.error
+        # Resolved here rather than by the controller, so that it isn't blocked on it
+        return item.resolve() if isinstance(item, DeferredResult) else item
+
+
+@dataclasses.dataclass
+class StreamingExpansion:
+    """Tracks an expansion whose items we realize tasks for lazily, as the expander yields them."""
+
+    items: Iterator[Any]
+    input_to_parameterize: str
+    num_items: int = 0
+    exhausted: bool = False
+    # group name -> number of its tasks that have not yet completed
+    remaining_tasks_by_group: Dict[str, int] = dataclasses.field(default_factory=dict)
+    # group name -> (base ID -> task ID), so we can realize the collector once exhausted
+    name_maps: Dict[str, Dict[str, str]] = dataclasses.field(default_factory=dict)
+
+
+class TaskQueue:
+    """Queue of the tasks that are ready to run. This is FIFO, unless tasks have priorities, in
+    which case the highest priority task comes first (FIFO among equal priorities)."""
+
+    def __init__(self, priorities: Optional[Dict[str, float]] = None):
+        """Initializes the queue.
+
+        :param priorities: Priority of tasks, by base ID. Tasks that aren't in it have a priority
+            of 0. None means FIFO.
+        """
+        self.priorities = priorities
+        self._fifo: Deque[TaskImplementation] = collections.deque()
+        # Entries are (-priority, sequence number, task) -- the sequence number breaks ties
+        self._heap: List[Tuple[float, int, TaskImplementation]] = []
+        self._counter = itertools.count()
+        self._front_counter = itertools.count(-1, -1)
+
+    def _entry(
+        self, task: TaskImplementation, sequence: int
+    ) -> Tuple[float, int, TaskImplementation]:
+        return -self.priorities.get(task.base_id, 0.0), sequence, task
+
+    def append(self, task: TaskImplementation):
+        """Adds a task to the queue."""
+        if self.priorities is None:
+            self._fifo.append(task)
+        else:
+            heapq.heappush(self._heap, self._entry(task, next(self._counter)))
+
+    def appendleft(self, task: TaskImplementation):
+        """Puts a task back in front of the tasks of the same priority."""
+        if self.priorities is None:
+            self._fifo.appendleft(task)
+        else:
+            heapq.heappush(self._heap, self._entry(task, next(self._front_counter)))
+
+    def popleft(self) -> TaskImplementation:
+        """Removes and returns the next task to run."""
+        if self.priorities is None:
+            return self._fifo.popleft()
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._fifo) + len(self._heap)
+
+    def __iter__(self) -> Iterator[TaskImplementation]:
+        """Iterates over the queued tasks, in no particular order."""
+        yield from self._fifo
+        for _, _, task in self._heap:
+            yield task
+
 
 class ExecutionState:
     """Stores the basic execution state of a DAG. This is responsible for two things:
@@ -122,24 +557,70 @@ class ExecutionState:
     3. Prep the task for execution (give it the results it needs)
     """
 
-    def __init__(self, tasks: List[TaskSpec], result_cache: ResultCache, run_id: str):
+    def __init__(
+        self,
+        tasks: List[TaskSpec],
+        result_cache: ResultCache,
+        run_id: str,
+        max_expansion_in_flight: Optional[int] = None,
+        stream_collect: bool = False,
+        ordered_collect: bool = False,
+        task_priorities: Optional[Dict[str, float]] = None,
+    ):
         """Initializes an ExecutionState to all uninitialized. TBD if we want to add in an initialization
         step that can, say, read from a db.
 
 
         :param task_graph: Graph of tasks to run.
         :param results_cache:  Cache of results
+        :param max_expansion_in_flight: If set, Parallelizable[] expanders are streamed -- rather
+            than materializing every item up front, we realize tasks for at most this many items
+            at a time (per expander), pulling the next item as they complete. Note this requires
+            expanders to run in the same process as the controller, as the generator is not
+            serializable. If None, we materialize the expander's results before spawning tasks.
+        :param stream_collect: If true, Collect[] nodes are started alongside the tasks they
+            collect from, and receive an iterator that yields results as those tasks complete,
+            evicting them from the result cache. The collector blocks waiting on those tasks, so
+            its executor has to run it concurrently with them (see DefaultExecutionManager).
+        :param ordered_collect: If streaming collect, whether to yield results in the order of
+            the expansion's items, rather than the order in which they complete.
+        :param task_priorities: Priority of tasks by base ID (see TaskPrioritizer) -- the highest
+            priority task is released first. None means tasks are released in the order they
+            become ready.
         """
+        if max_expansion_in_flight is not None and max_expansion_in_flight < 1:
+            raise ValueError(
+                f"max_expansion_in_flight must be at least 1, got {max_expansion_in_flight}"
+            )
         # Pool of available tasks. Note these get added dynamically as
         # tasks are run, in case we want to split out
         self.result_cache = result_cache
         self.run_id = run_id
-        self.task_states = collections.defaultdict(lambda: TaskState.UNINITIALIZED)
-        self.task_pool = {}
-        self._initialize_task_pool(tasks)
+        self.max_expansion_in_flight = max_expansion_in_flight
+        # Expander task ID -> expansion that we're realizing items of as they're yielded
+        self.streaming_expansions: Dict[str, StreamingExpansion] = {}
+        self.stream_collect = stream_collect
+        self.ordered_collect = ordered_collect
+        # Collector task ID -> results it consumes, for streaming collect
+        self.collected_results: Dict[str, CollectedResults] = {}
+        # Expander task ID -> IDs of the collector tasks still receiving its results
+        self.streaming_collectors: Dict[str, List[str]] = {}
         self.base_task_pool = {}
+        # Index of spawning task base ID -> specs of the tasks it spawns
+        self.base_tasks_by_spawning_task = collections.defaultdict(list)
         self._initialize_base_task_pool(tasks)
-        self.task_queue = collections.deque()
+        self.task_states = TaskStateMap()
+        self.task_pool = {}
+        # Index of task ID -> IDs of the tasks that are waiting on it (once per realized dependency)
+        self.dependent_task_ids = collections.defaultdict(list)
+        # Index of task ID -> number of its realized dependencies that have not yet succeeded
+        self.num_pending_dependencies = {}
+        # Tasks that have been realized but not yet indexed in dependent_task_ids
+        # We don't index on realization as dependencies can be modified after
+        self._unindexed_task_ids = []
+        self._initialize_task_pool(tasks)
+        self._index_realized_tasks()
+        self.task_queue = TaskQueue(task_priorities)
         self._initialize_task_queue()
         self.is_initialized = True
         self.base_reverse_dependencies = self.compute_reverse_dependencies(tasks)
@@ -178,6 +659,28 @@ class ExecutionState:
         """
         for task in tasks:
             self.base_task_pool[task.base_id] = task
+            if task.spawning_task_base_id is not None:
+                self.base_tasks_by_spawning_task[task.spawning_task_base_id].append(task)
+
+    def _index_realized_tasks(self) -> List[TaskImplementation]:
+        """Indexes all tasks realized since the last call, so we can look up which tasks are waiting
+        on a given task. This must be called once their realized dependencies are finalized.
+
+        :return: The tasks that were indexed
+        """
+        indexed = []
+        for task_id in self._unindexed_task_ids:
+            task = self.task_pool[task_id]
+            num_pending = 0
+            for realized_dep_list in task.realized_dependencies.values():
+                for dep in realized_dep_list:
+                    if self.task_states[dep] != TaskState.SUCCESSFUL:
+                        self.dependent_task_ids[dep].append(task_id)
+                        num_pending += 1
+            self.num_pending_dependencies[task_id] = num_pending
+            indexed.append(task)
+        self._unindexed_task_ids = []
+        return indexed
 
     def _initialize_task_queue(self):
         """Initializes the task queue to all nodes that have no dependencies.
@@ -228,13 +731,42 @@ class ExecutionState:
             # This just assigns the realized dependencies to be the base dependencies
             realized_dependencies=realized_dependencies,
             run_id=self.run_id,
+            stream_expansion=self._should_stream_expansion(task_spec),
+            stream_collect=self._should_stream_collect(task_spec),
         )
         if bind is not None:
             task_implementation = task_implementation.bind(bind)
         self.task_pool[task_implementation.task_id] = task_implementation
         self.task_states[task_implementation.task_id] = TaskState.INITIALIZED
+        self._unindexed_task_ids.append(task_implementation.task_id)
         return task_implementation
 
+    def _get_tasks_to_repeat(self, spawning_task_id: str) -> List[TaskSpec]:
+        """Gives the specs of the tasks that get repeated for every item of an expansion."""
+        return [
+            task
+            for task in self.base_tasks_by_spawning_task.get(spawning_task_id, [])
+            if not task.purpose.is_expander() and not task.purpose.is_gatherer()
+        ]
+
+    def _should_stream_expansion(self, task_spec: TaskSpec) -> bool:
+        """Whether to stream the items of an expander task. We only do this if there are tasks to
+        repeat for each item -- otherwise the collector reads the expander's results directly."""
+        return (
+            self.max_expansion_in_flight is not None
+            and task_spec.purpose.is_expander()
+            and len(self._get_tasks_to_repeat(task_spec.base_id)) > 0
+        )
+
+    def _should_stream_collect(self, task_spec: TaskSpec) -> bool:
+        """Whether to stream results into a collector task. As with expansion, this only applies
+        if there are tasks to repeat for each item."""
+        return (
+            self.stream_collect
+            and task_spec.purpose.is_gatherer()
+            and len(self._get_tasks_to_repeat(task_spec.spawning_task_base_id)) > 0
+        )
+
     def realize_parameterized_group(
         self,
         spawning_task_id: str,
@@ -248,16 +780,30 @@ class ExecutionState:
         :param results:
         :return:
         """
+        name_maps, out = self._realize_group_items(
+            spawning_task_id, parameterizations, input_to_parameterize
+        )
+        out.extend(
+            self._realize_collector_tasks(spawning_task_id, name_maps, len(parameterizations))
+        )
+        return out
+
+    def _realize_group_items(
+        self,
+        spawning_task_id: str,
+        parameterizations: Dict[str, Any],
+        input_to_parameterize: str,
+    ) -> Tuple[Dict[str, Dict[str, str]], List[TaskImplementation]]:
+        """Realizes the repeated tasks of an expand group, one set per parameterization.
+
+        :param spawning_task_id: ID of the task that spawned the group
+        :param parameterizations: Map of group name -> item to bind
+        :param input_to_parameterize: Name of the input to bind the item to
+        :return: A map of group name -> (base ID -> task ID), as well as the tasks realized
+        """
         # first we get all future nodes in the group
         out = []
-        tasks_to_repeat = [
-            task
-            for task in self.base_task_pool.values()
-            if task.spawning_task_base_id == spawning_task_id
-            and not task.purpose.is_expander()
-            and not task.purpose.is_gatherer()
-        ]
-        task_names_in_group = [task.base_id for task in tasks_to_repeat]
+        tasks_to_repeat = self._get_tasks_to_repeat(spawning_task_id)
         # Then we parameterize them, making the following changes:
         # 1. We replace base dependencies with the actual task ids
         # 2. We replace the inputs of the first task with the results
@@ -284,18 +830,36 @@ class ExecutionState:
             for new_task in new_tasks:
                 # We replace the dependencies with the new task ids
                 new_task.realized_dependencies = {
-                    dependency: name_map[dependency] if dependency in name_map else [dependency]
+                    dependency: [name_map[dependency]] if dependency in name_map else [dependency]
                     for dependency in new_task.base_dependencies
                 }
                 # We add the new tasks to the task pool
                 out.append(new_task)
             name_maps[group_name] = name_map
+        return name_maps, out
+
+    def _realize_collector_tasks(
+        self,
+        spawning_task_id: str,
+        name_maps: Dict[str, Dict[str, str]],
+        num_items: Optional[int],
+    ) -> List[TaskImplementation]:
+        """Realizes the collect tasks of an expand group, depending on every repeated task.
+        If streaming collect, they do not depend on the repeated tasks -- instead, they are
+        given their results as they complete.
+
+        :param spawning_task_id: ID of the task that spawned the group
+        :param name_maps: Map of group name -> (base ID -> task ID) for every item in the group
+        :param num_items: Number of items in the group, if known
+        :return: The collector tasks realized
+        """
+        out = []
+        task_names_in_group = {task.base_id for task in self._get_tasks_to_repeat(spawning_task_id)}
         collector_tasks = [
             task
-            for task in self.base_task_pool.values()
-            if task.purpose.is_gatherer() and task.spawning_task_base_id == spawning_task_id
+            for task in self.base_tasks_by_spawning_task.get(spawning_task_id, [])
+            if task.purpose.is_gatherer()
         ]
-
         # Go through every task we need to collect those
         for collector_task in collector_tasks:
             # collector_node = completed_task.get_collector_node()
@@ -303,8 +867,18 @@ class ExecutionState:
             # We create it with no spawning tasks as we don't want to name it differently
             # We should really give it a better unique ID? This is a little hacky
             new_task = self.realize_task(collector_task, None, None)
+            if new_task.stream_collect:
+                collected_results = CollectedResults(
+                    new_task.get_collector_node().collect_dependency, ordered=self.ordered_collect
+                )
+                self.collected_results[new_task.task_id] = collected_results
+                self.streaming_collectors.setdefault(spawning_task_id, []).append(new_task.task_id)
+                if num_items is not None:
+                    collected_results.set_num_items(num_items)
             new_dependencies = {}
             for dependency in new_task.base_dependencies:
+                if new_task.stream_collect and dependency in task_names_in_group:
+                    continue
                 new_dependencies[dependency] = []
                 if dependency in task_names_in_group:
                     for group_name, name_map in name_maps.items():
@@ -315,9 +889,147 @@ class ExecutionState:
             out.append(new_task)
         return out
 
+    def _realize_streamed_items(self, spawning_task_id: str):
+        """Pulls items from a streaming expansion, realizing their tasks, until either the
+        maximum number of items are in flight or the expander is exhausted. Once it is exhausted,
+        we realize the collector tasks.
+
+        :param spawning_task_id: ID of the expander task whose items we're realizing
+        """
+        expansion = self.streaming_expansions[spawning_task_id]
+        parameterizations = {}
+        exhausted = False
+        while (
+            len(expansion.remaining_tasks_by_group) + len(parameterizations)
+            < self.max_expansion_in_flight
+        ):
+            try:
+                item = next(expansion.items)
+            except StopIteration:
+                exhausted = True
+                break
+            except Exception as e:
+                self._fail_streaming_expansion(spawning_task_id, e)
+                raise e
+            parameterizations[str(expansion.num_items)] = item
+            expansion.num_items += 1
+        name_maps, _ = self._realize_group_items(
+            spawning_task_id, parameterizations, expansion.input_to_parameterize
+        )
+        for group_name, name_map in name_maps.items():
+            expansion.remaining_tasks_by_group[group_name] = len(name_map)
+        expansion.name_maps.update(name_maps)
+        if exhausted:
+            expansion.exhausted = True
+            if self.stream_collect:
+                for collector_task_id in self.streaming_collectors.get(spawning_task_id, []):
+                    if collector_task_id in self.collected_results:
+                        self.collected_results[collector_task_id].set_num_items(expansion.num_items)
+                self._prune_streaming_collectors(spawning_task_id)
+            else:
+                self._realize_collector_tasks(
+                    spawning_task_id, expansion.name_maps, expansion.num_items
+                )
+            if len(expansion.remaining_tasks_by_group) == 0:
+                del self.streaming_expansions[spawning_task_id]
+
+    def _fail_streaming_expansion(self, spawning_task_id: str, error: Exception):
+        """Fails a streaming expansion whose expander raised while we pulled its items. The expander
+        task had already succeeded, so we mark it (and its collectors) as failed, and report it to
+        the task hooks again -- this time as a failure.
+
+        :param spawning_task_id: ID of the expander task whose items we were pulling
+        :param error: Error raised by the expander
+        """
+        expander_task = self.task_pool[spawning_task_id]
+        logger.exception(
+            f"Exception executing task {spawning_task_id}, with nodes: "
+            f"{[item.name for item in expander_task.nodes]}"
+        )
+        self.task_states[spawning_task_id] = TaskState.FAILED
+        del self.streaming_expansions[spawning_task_id]
+        # Running collectors are blocked on results they will never get, so we unblock them
+        for collector_task_id in self.streaming_collectors.pop(spawning_task_id, []):
+            self.task_states[collector_task_id] = TaskState.FAILED
+            collected_results = self.collected_results.pop(collector_task_id, None)
+            if collected_results is not None:
+                collected_results.fail(error)
+        if expander_task.adapter.does_hook("post_task_execute", is_async=False):
+            expander_task.adapter.call_all_lifecycle_hooks_sync(
+                "post_task_execute",
+                run_id=self.run_id,
+                task_id=spawning_task_id,
+                nodes=expander_task.nodes,
+                results=None,
+                success=False,
+                error=error,
+            )
+
+    def _collect_streamed_result(self, task: TaskImplementation):
+        """Passes the result of a task spawned by an expansion to any streaming collectors that
+        consume it, evicting it from the result cache as it will not be read again.
+
+        :param task: Task that completed successfully
+        """
+        collector_task_ids = self.streaming_collectors[task.spawning_task_id]
+        for collector_task_id in collector_task_ids:
+            collected_results = self.collected_results.get(collector_task_id)
+            if collected_results is None:
+                # The collector has already stopped, in which case there's nothing to do
+                continue
+            collect_arg = collected_results.collect_arg
+            if task.produces(collect_arg):
+                result = self.result_cache.read(
+                    [collect_arg], task.group_id, task.spawning_task_id
+                )[collect_arg]
+                self.result_cache.evict([collect_arg], task.group_id, task.spawning_task_id)
+                collected_results.put(int(task.group_id), result)
+        self._prune_streaming_collectors(task.spawning_task_id)
+
+    def _prune_streaming_collectors(self, spawning_task_id: str):
+        """Stops tracking streaming collectors that will not receive any more results.
+
+        :param spawning_task_id: ID of the expander task whose collectors we're pruning
+        """
+        collector_task_ids = [
+            collector_task_id
+            for collector_task_id in self.streaming_collectors.get(spawning_task_id, [])
+            if collector_task_id in self.collected_results
+            and not self.collected_results[collector_task_id].is_complete()
+        ]
+        if len(collector_task_ids) > 0:
+            self.streaming_collectors[spawning_task_id] = collector_task_ids
+        else:
+            self.streaming_collectors.pop(spawning_task_id, None)
+
+    def _complete_streamed_task(self, task: TaskImplementation):
+        """Marks a task spawned by a streaming expansion as complete. Once every task for an item
+        is complete, that item is no longer in flight, so we can pull the next one.
+
+        :param task: Task that completed successfully
+        """
+        expansion = self.streaming_expansions[task.spawning_task_id]
+        # We're done with the item bound to it, so we don't need to hold onto it
+        task.dynamic_inputs = {}
+        expansion.remaining_tasks_by_group[task.group_id] -= 1
+        if expansion.remaining_tasks_by_group[task.group_id] > 0:
+            return
+        del expansion.remaining_tasks_by_group[task.group_id]
+        if not expansion.exhausted:
+            self._realize_streamed_items(task.spawning_task_id)
+        elif len(expansion.remaining_tasks_by_group) == 0:
+            del self.streaming_expansions[task.spawning_task_id]
+
     def write_task_results(self, writer: TaskImplementation, results: Dict[str, Any]):
         results_to_write = results
-        if writer.purpose.is_expander():
+        if writer.stream_expansion:
+            # In this case we hold onto the generator, and realize items as we consume it
+            result_name_for_expansion = writer.get_expander_node().name
+            self.streaming_expansions[writer.task_id] = StreamingExpansion(
+                items=iter(results_to_write.pop(result_name_for_expansion)),
+                input_to_parameterize=result_name_for_expansion,
+            )
+        elif writer.purpose.is_expander():
             # In this case we need to write each result individually
             result_name_for_expansion = writer.get_expander_node().name
             result_for_expansion = list(results_to_write.pop(result_name_for_expansion))
@@ -348,21 +1060,35 @@ class ExecutionState:
         self.task_states[task_id] = new_state
         if not TaskState.is_terminal(new_state):
             return
-        logger.debug(
-            f"Received update for task {task_id} with state {new_state.value}, "
-            f"current queue is {self._format_task_queue()}"
-        )
-        for item in self.task_queue:
-            assert self.task_states[item.task_id] == TaskState.QUEUED, (
-                f"Task {item.task_id} is in the queue but not queued, "
-                f"state is {self.task_states[item.task_id].value}"
+        # A streaming collector is done with its results once it finishes
+        self.collected_results.pop(task_id, None)
+        if new_state == TaskState.FAILED:
+            # Collectors will never get the rest of their results, so we unblock them
+            for collected_results in self.collected_results.values():
+                collected_results.fail(
+                    RuntimeError(f"Cannot collect results, as task {task_id} failed.")
+                )
+        # These are linear in the size of the queue, so we only do them when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Received update for task {task_id} with state {new_state.value}, "
+                f"current queue is {self._format_task_queue()}"
             )
+            for item in self.task_queue:
+                assert self.task_states[item.task_id] == TaskState.QUEUED, (
+                    f"Task {item.task_id} is in the queue but not queued, "
+                    f"state is {self.task_states[item.task_id].value}"
+                )
         # Creating task implementations
         task_to_update = self.task_pool[task_id]
         if new_state == TaskState.SUCCESSFUL:
             self.write_task_results(task_to_update, results)
             completed_task: TaskImplementation = self.task_pool[task_id]  # First look up the task
-            if completed_task.purpose == NodeGroupPurpose.EXPAND_UNORDERED:
+            if completed_task.task_id in self.streaming_expansions:
+                if self.stream_collect:
+                    self._realize_collector_tasks(completed_task.task_id, {}, None)
+                self._realize_streamed_items(completed_task.task_id)
+            elif completed_task.purpose == NodeGroupPurpose.EXPAND_UNORDERED:
                 # In this case we need to extract all the tasks we need to spawn
                 # This involves the following:
                 #    1. For each node, spawn the task, and bind the result to that node
@@ -371,16 +1097,17 @@ class ExecutionState:
                 # We do realization here, which is not ideal, as it outputs a generator The task
                 # executor should be able to handle this I think... Likely we want the executor
                 # to be able to write its own result cache? In case it has an internal buffer?
-                parameterization_results = self.result_cache.read([input_to_parameterize])[
-                    input_to_parameterize
-                ]
+                parameterization_results = resolve_deferred_results(
+                    self.result_cache.read([input_to_parameterize])
+                )[input_to_parameterize]
                 parameterization_values = {
                     str(i): item for i, item in enumerate(parameterization_results)
                 }
-                logger.debug(
-                    f"Completed an expand step, parameterizing: {input_to_parameterize} "
-                    f"over values : {parameterization_values}"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Completed an expand step, parameterizing: {input_to_parameterize} "
+                        f"over values : {parameterization_values}"
+                    )
                 self.realize_parameterized_group(
                     completed_task.task_id, parameterization_values, input_to_parameterize
                 )
@@ -397,21 +1124,28 @@ class ExecutionState:
                         if new_task_id not in self.task_pool:
                             # Then we need to create it
                             self.realize_task(candidate_task, None, None)
-            # TODO -- make this more efficient
-            # We need reverse dependencies, but there are ways to do this cleanly
-            # For now we'll just loop through
-
+            if completed_task.spawning_task_id in self.streaming_collectors:
+                self._collect_streamed_result(completed_task)
+            if completed_task.spawning_task_id in self.streaming_expansions:
+                self._complete_streamed_task(completed_task)
+            # The only tasks that can become runnable are the ones waiting on this task,
+            # and the ones we just created
+            candidate_tasks = []
+            for dependent_task_id in self.dependent_task_ids.pop(task_id, ()):
+                self.num_pending_dependencies[dependent_task_id] -= 1
+                if self.num_pending_dependencies[dependent_task_id] == 0:
+                    candidate_tasks.append(self.task_pool[dependent_task_id])
+            candidate_tasks.extend(self._index_realized_tasks())
             tasks_to_enqueue = []
-            # not efficient, TODO -- use a reverse dependency map
-            for key, task in self.task_pool.items():
-                if self.task_states[task.task_id] == TaskState.INITIALIZED:
-                    should_launch = True
-                    for base_dep_name, realized_dep_list in task.realized_dependencies.items():
-                        for dep in realized_dep_list:
-                            if self.task_states[dep] != TaskState.SUCCESSFUL:
-                                should_launch = False
-                    if should_launch:
-                        tasks_to_enqueue.append(task)
+            enqueued_task_ids = set()
+            for task in candidate_tasks:
+                if (
+                    task.task_id not in enqueued_task_ids
+                    and self.task_states[task.task_id] == TaskState.INITIALIZED
+                    and self.num_pending_dependencies[task.task_id] == 0
+                ):
+                    tasks_to_enqueue.append(task)
+                    enqueued_task_ids.add(task.task_id)
             task_names = [task.task_id for task in tasks_to_enqueue]
             if len(task_names) > 0:
                 logger.info(
@@ -435,15 +1169,15 @@ class ExecutionState:
 
         :return: State of the graph
         """
+        num_tasks = len(self.task_states)
+        state_counts = self.task_states.state_counts
         if not self.is_initialized:
             return GraphState.UNINITIALIZED
-        elif len(self.task_states) == 0 or all(
-            [state == TaskState.INITIALIZED for state in self.task_states.values()]
-        ):
+        elif num_tasks == 0 or state_counts[TaskState.INITIALIZED] == num_tasks:
             return GraphState.INITIALIZED
-        elif all([state == TaskState.SUCCESSFUL for state in self.task_states.values()]):
+        elif state_counts[TaskState.SUCCESSFUL] == num_tasks:
             return GraphState.SUCCESSFUL
-        elif any([state == TaskState.FAILED for state in self.task_states.values()]):
+        elif state_counts[TaskState.FAILED] > 0:
             # if we want to execute until completion, then we should return RUNNING here
             # Unless they're all terminal, in which case we should return FAILED
             return GraphState.FAILED
@@ -458,6 +1192,9 @@ class ExecutionState:
             collector_node = task.get_collector_node()
             collector_arg = collector_node.collect_dependency
             dynamic_inputs = {collector_arg: []}
+            if task.stream_collect:
+                # The results get passed in as their tasks complete
+                dynamic_inputs[collector_arg] = self.collected_results[task.task_id]
             for dependency_base, dependencies in task.realized_dependencies.copy().items():
                 # We know that if one has the collector node, they all will
                 # As that's how we run it
@@ -477,10 +1214,13 @@ class ExecutionState:
                         )
                     del task.realized_dependencies[dependency_base]
         # Then we go through the rest -- these just fill in the other args
+        # Anything already bound (E.G. the item of an expansion) takes precedence, so we skip it
         input_vars_to_read = [
             item
             for item in required_input_vars
-            if item not in dynamic_inputs and item not in task.overrides
+            if item not in dynamic_inputs
+            and item not in task.overrides
+            and item not in task.dynamic_inputs
         ]
         dynamic_inputs = {**dynamic_inputs, **self.result_cache.read(input_vars_to_read)}
         dynamic_inputs = {
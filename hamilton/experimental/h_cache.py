@@ -2,12 +2,21 @@ import json
 import logging
 import os
 import pickle
+import time
+import uuid
 from functools import singledispatch
-from typing import Any, Callable, Dict, Optional, Set, Type
+from typing import Any, Callable, Dict, List, Optional, Set, Type
 
 import typing_inspect
 
+from hamilton import graph_types
 from hamilton.base import SimplePythonGraphAdapter
+from hamilton.caching import fingerprinting, planning
+from hamilton.caching.metrics import CacheMetrics
+from hamilton.caching.stores import MISSING
+from hamilton.execution import graph_functions
+from hamilton.graph import FunctionGraph
+from hamilton.lifecycle import base as lifecycle_base
 from hamilton.node import Node
 
 logger = logging.getLogger(__name__)
@@ -187,18 +196,65 @@ def read_pickle_object(data: object, filepath: str) -> object:
         return pickle.load(file)
 
 
-class CachingGraphAdapter(SimplePythonGraphAdapter):
+MANIFEST_FILE = "manifest.json"
+
+
+def _fingerprint(node: Node, input_fingerprints: Dict[str, Optional[str]]) -> Optional[str]:
+    """Fingerprint of a node's result, from the version of its code and the fingerprints of its
+    inputs. This is None (i.e. always recompute) if any of these is unknown."""
+    version = graph_types.HamiltonNode.from_node(node).version
+    if version is None or any(fingerprint is None for fingerprint in input_fingerprints.values()):
+        return None
+    # sorted, as the order the inputs are passed in doesn't matter
+    return fingerprinting.combine(
+        version,
+        *(
+            fingerprinting.combine(name, input_fingerprints[name])
+            for name in sorted(input_fingerprints)
+        ),
+    )
+
+
+class CachingGraphAdapter(
+    SimplePythonGraphAdapter,
+    lifecycle_base.BasePreGraphExecute,
+    lifecycle_base.BaseDoLoadCachedResults,
+    lifecycle_base.BasePostGraphExecute,
+):
     """Caching adapter.
 
     Any node with tag "cache" will be cached (or loaded from cache) in the format defined by the
     tag's value. There are a handful of formats supported, and other formats' readers and writers
     can be provided to the constructor.
 
-    Values are loaded from cache if the node's file exists, unless one of these is true:
+    Values are loaded from cache if the node's file exists and was written for the same fingerprint,
+    unless one of these is true:
      * node is explicitly forced to be computed with a constructor argument,
      * any of its (potentially transitive) dependencies that are configured to be cached
        was nevertheless computed (either forced or missing cached file).
 
+    Fingerprints
+    ------------
+
+    The fingerprint of a node is derived from the version of its code and the fingerprints of its
+    inputs (see hamilton.caching.fingerprinting) -- inputs and config values are hashed, the others
+    are built up from there. So changing an input, or the code of any (cached or not) upstream
+    node, invalidates the cache of all nodes downstream of it.
+
+    Only cached nodes and the nodes upstream of them are fingerprinted, so values that no cached
+    node depends on are never hashed.
+
+    The fingerprint each cached file was written for is kept in a manifest (`manifest.json` in
+    the cache directory). It is written once per run, after graph execution, merged with the copy
+    on disk so that runs sharing a cache directory keep each other's entries. Before executing,
+    the fingerprints of the nodes are computed from the inputs and the code alone, and the nodes
+    that will be loaded from cache are available as `expected_hits`. Those that are needed are loaded first, so that the nodes upstream of them are
+    only executed if something else needs them. Files written before manifests were introduced are
+    recomputed once.
+
+    Hits, misses, the sizes of the cached files and time spent are recorded in `metrics` (see
+    hamilton.caching.metrics), e.g. to find which nodes are worth caching.
+
     Custom Serializers
     ------------------
 
@@ -280,20 +336,34 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
         force_compute: Optional[Set[str]] = None,
         writers: Optional[Dict[str, Callable[[Any, str, str], None]]] = None,
         readers: Optional[Dict[str, Callable[[Any, str], Any]]] = None,
+        metrics: Optional[CacheMetrics] = None,
         **kwargs,
     ):
         """Constructs the adapter.
 
         :param cache_path: Path to the directory where cached files are stored.
-        :param force_compute: Set of nodes that should be forced to compute even if cache exists.
+        :param force_compute: Set of nodes that should be forced to compute even if cache exists
+            and is up-to-date (e.g. if they read external data).
         :param writers: A dictionary of writers for custom formats.
         :param readers: A dictionary of readers for custom formats.
+        :param metrics: Metrics to record hits/misses in. None means new ones.
         """
 
         super().__init__(*args, **kwargs)
         self.cache_path = cache_path
         self.force_compute = force_compute if force_compute is not None else {}
         self.computed_nodes = set()
+        # node name -> fingerprint of its result, for the current run
+        self.fingerprints: Dict[str, Optional[str]] = {}
+        # cached nodes that are expected to be loaded from cache, for the current run
+        self.expected_hits: Set[str] = set()
+        # cached nodes and the nodes upstream of them, for the current run. None means all nodes.
+        self._fingerprinted_nodes: Optional[Set[str]] = None
+        self.manifest = self._read_manifest()
+        # entries written to the manifest by the current run, not yet saved to disk
+        self._manifest_updates: Dict[str, str] = {}
+        self.metrics = metrics if metrics is not None else CacheMetrics()
+        self._run_id = None
 
         self.writers = writers or {}
         self.readers = readers or {}
@@ -333,6 +403,134 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
         self._check_format(fmt)
         return self.readers[fmt](expected_type, filepath)
 
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.cache_path, MANIFEST_FILE)
+
+    def _read_manifest(self) -> Dict[str, str]:
+        if not os.path.exists(self._manifest_path):
+            return {}
+        with open(self._manifest_path, "r", encoding="utf8") as file:
+            return json.load(file)
+
+    def _write_manifest(self) -> None:
+        if not self._manifest_updates:
+            return
+        # merged with the manifest on disk, as other runs may have written to it since it was read
+        self.manifest = {**self._read_manifest(), **self._manifest_updates}
+        self._manifest_updates = {}
+        # written atomically, so an interrupted run never leaves a corrupt manifest
+        temp_path = f"{self._manifest_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "w", encoding="utf8") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self._manifest_path)
+
+    def _get_filepath(self, node: Node) -> str:
+        return f"{self.cache_path}/{node.name}.{node.tags['cache']}"
+
+    def _is_cache_hit(
+        self, node: Node, fingerprint: Optional[str], implicitly_forced: bool
+    ) -> bool:
+        return (
+            fingerprint is not None
+            and node.name not in self.force_compute
+            and not implicitly_forced
+            and self.manifest.get(node.name) == fingerprint
+            and os.path.exists(self._get_filepath(node))
+        )
+
+    def pre_graph_execute(
+        self,
+        *,
+        run_id: str,
+        graph: FunctionGraph,
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ):
+        """Computes the fingerprints of the nodes to execute that cached nodes depend on, from the
+        inputs and the code alone, and decides which cached nodes will be loaded from cache (see
+        `expected_hits`).
+        """
+        self._run_id = run_id
+        # resolved the same way as the driver does before executing, so this is memoized
+        sorted_nodes = graph.get_sorted_upstream_nodes(final_vars, inputs, overrides)
+        inputs = inputs if inputs is not None else {}
+        overrides = overrides if overrides is not None else {}
+        values = graph_functions.combine_config_and_inputs(graph.config, inputs)
+        self._fingerprinted_nodes = set()
+        for node in reversed(sorted_nodes):
+            if node.tags.get("cache") is not None or node.name in self._fingerprinted_nodes:
+                self._fingerprinted_nodes.add(node.name)
+                self._fingerprinted_nodes.update(dep.name for dep in node.dependencies)
+        self.manifest = self._read_manifest()
+        self.fingerprints = {}
+        self.expected_hits = set()
+        computed_nodes = set()
+        for node in sorted_nodes:
+            if node.name not in self._fingerprinted_nodes:
+                continue
+            if node.name in overrides:
+                self.fingerprints[node.name] = fingerprinting.hash_value(overrides[node.name])
+                continue
+            if node.user_defined:
+                if node.name in values:
+                    self.fingerprints[node.name] = fingerprinting.hash_value(values[node.name])
+                continue
+            input_fingerprints = {
+                name: self.fingerprints[name]
+                for name in node.input_types
+                if name in self.fingerprints
+            }
+            fingerprint = _fingerprint(node, input_fingerprints)
+            self.fingerprints[node.name] = fingerprint
+            # same rules as in execute_node
+            implicitly_forced = any(dep.name in computed_nodes for dep in node.dependencies)
+            if node.tags.get("cache") is None:
+                if implicitly_forced:
+                    computed_nodes.add(node.name)
+            elif self._is_cache_hit(node, fingerprint, implicitly_forced):
+                self.expected_hits.add(node.name)
+            else:
+                computed_nodes.add(node.name)
+        logger.debug("Expecting cache hits for: %s", sorted(self.expected_hits))
+
+    def do_load_cached_results(
+        self,
+        *,
+        run_id: str,
+        graph: FunctionGraph,
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Loads the results of the `expected_hits` that are needed to compute `final_vars`, before
+        executing anything. The nodes upstream of them that nothing else needs are not executed.
+        """
+
+        def load(node: Node) -> Any:
+            return self._load(node) if node.name in self.expected_hits else MISSING
+
+        return planning.load_cached_results(graph, final_vars, overrides, load)
+
+    def _load(self, node: Node) -> Any:
+        cache_format = node.tags["cache"]
+        filepath = self._get_filepath(node)
+        empty_expected_type = self._get_empty_expected_type(node.type)
+        logger.debug(
+            "Reading cache for %s from %s with type %s to %s",
+            node.name,
+            filepath,
+            type(empty_expected_type),
+            cache_format,
+        )
+        start = time.perf_counter()
+        result = self._read_cache(cache_format, empty_expected_type, filepath)
+        self.metrics.record_hit(
+            self._run_id, node.name, time.perf_counter() - start, os.path.getsize(filepath)
+        )
+        return result
+
     def _get_empty_expected_type(self, expected_type: Type) -> Any:
         if typing_inspect.is_generic_type(expected_type):
             return typing_inspect.get_origin(expected_type)()
@@ -343,7 +541,7 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
 
         This node is executed if at least one of these is true:
 
-        * no cache is present,
+        * no cache is present, or it was written for another fingerprint,
         * it is explicitly forced by passing it to the adapter in ``force_compute``,
         * at least one of its upstream nodes that had a @cache annotation was computed,
           either due to lack of cache or being explicitly forced.
@@ -351,11 +549,25 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
         """
         cache_format = node.tags.get("cache")
         implicitly_forced = any(dep.name in self.computed_nodes for dep in node.dependencies)
+        if self._fingerprinted_nodes is None or node.name in self._fingerprinted_nodes:
+            # inputs that weren't fingerprinted before execution (e.g. downstream of a node without
+            # a known version) are fingerprinted by value
+            input_fingerprints = {
+                name: (
+                    self.fingerprints[name]
+                    if self.fingerprints.get(name) is not None
+                    else fingerprinting.hash_value(value)
+                )
+                for name, value in kwargs.items()
+            }
+            self.fingerprints[node.name] = _fingerprint(node, input_fingerprints)
+        fingerprint = self.fingerprints.get(node.name)
         if cache_format is not None:
-            filepath = f"{self.cache_path}/{node.name}.{cache_format}"
-            explicitly_forced = node.name in self.force_compute
-            if explicitly_forced or implicitly_forced or not os.path.exists(filepath):
+            filepath = self._get_filepath(node)
+            if not self._is_cache_hit(node, fingerprint, implicitly_forced):
+                start = time.perf_counter()
                 result = node.callable(**kwargs)
+                self.metrics.record_miss(self._run_id, node.name, time.perf_counter() - start)
                 logger.debug(
                     "Writing cache for %s to %s with type %s to %s",
                     node.name,
@@ -363,18 +575,17 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
                     type(result),
                     cache_format,
                 )
+                start = time.perf_counter()
                 self._write_cache(cache_format, result, filepath, node.name)
+                if fingerprint is not None:
+                    self.manifest[node.name] = fingerprint
+                    self._manifest_updates[node.name] = fingerprint
+                self.metrics.record_store(
+                    self._run_id, node.name, time.perf_counter() - start, os.path.getsize(filepath)
+                )
                 self.computed_nodes.add(node.name)
                 return result
-            empty_expected_type = self._get_empty_expected_type(node.type)
-            logger.debug(
-                "Reading cache for %s from %s with type %s to %s",
-                node.name,
-                filepath,
-                type(empty_expected_type),
-                cache_format,
-            )
-            return self._read_cache(cache_format, empty_expected_type, filepath)
+            return self._load(node)
 
         if implicitly_forced:
             # For purposes of caching, we only mark it as computed if any cached input was computed.
@@ -382,7 +593,22 @@ class CachingGraphAdapter(SimplePythonGraphAdapter):
             self.computed_nodes.add(node.name)
         return node.callable(**kwargs)
 
+    def post_graph_execute(
+        self,
+        *,
+        run_id: str,
+        graph: FunctionGraph,
+        success: bool,
+        error: Optional[Exception],
+        results: Optional[Dict[str, Any]],
+    ):
+        """Saves the manifest entries of the files written by this run, even if it failed."""
+        self._write_manifest()
+
     def build_result(self, **outputs: Dict[str, Any]) -> Any:
-        """Clears the computed nodes information and delegates to the super class."""
+        """Saves the manifest if not done already, clears the computed nodes information and
+        delegates to the super class."""
+        self._write_manifest()
         self.computed_nodes = set()
+        self.fingerprints = {}
         return super().build_result(**outputs)
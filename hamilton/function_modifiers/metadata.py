@@ -7,6 +7,8 @@ from hamilton import htypes, node, registry
 from hamilton.function_modifiers import base
 
 RAY_REMOTE_TAG_NAMESPACE = "ray_remote"
+DASK_SUBMIT_TAG_NAMESPACE = "dask_submit"
+ESTIMATED_COST_TAG = "hamilton.estimated_cost"
 
 
 class tag(base.NodeDecorator):
@@ -58,6 +60,7 @@ class tag(base.NodeDecorator):
         "dag",
         "module",
         RAY_REMOTE_TAG_NAMESPACE,
+        DASK_SUBMIT_TAG_NAMESPACE,
     ]  # Anything that starts with any of these is banned, the framework reserves the right to manage it
 
     def __init__(
@@ -317,3 +320,70 @@ def ray_remote_options(**kwargs: Union[int, Dict[str, int]]) -> RayRemote:
             ...
     """
     return RayRemote(**kwargs)
+
+
+class DaskSubmit(tag):
+    def __init__(self, **options: Union[int, str, List[str], Dict[str, int]]):
+        """Initializes DaskSubmit. See docs for `@dask_submit_options` for more details."""
+
+        dask_tags = {
+            f"{DASK_SUBMIT_TAG_NAMESPACE}.{option}": json.dumps(value)
+            for option, value in options.items()
+        }
+
+        super(DaskSubmit, self).__init__(bypass_reserved_namespaces_=True, **dask_tags)
+
+
+def dask_submit_options(**kwargs: Union[int, str, List[str], Dict[str, int]]) -> DaskSubmit:
+    """Initializes a `@dask_submit_options` decorator. This takes in options to pass to
+    dask's client.submit() when the node is run by the DaskExecutor.
+
+    Supported options include resources (which workers have to declare), priority, and other options:
+    https://distributed.dask.org/en/stable/api.html#distributed.Client.submit
+
+    As tasks can contain multiple nodes, the options of a task are combined from its nodes': the
+    highest of each resource/priority/number, and the last of any other option.
+
+    This is implemented using tags, but that might change. Thus you should not
+    rely on the tags created by this decorator (which is why they are on a reserved namespace).
+
+    Example usage:
+
+    .. code-block:: python
+
+        @dask_submit_options(
+            resources={"GPU": 1},
+            priority=10,
+        )
+        def example() -> pd.DataFrame:
+            ...
+    """
+    return DaskSubmit(**kwargs)
+
+
+class EstimatedCost(tag):
+    def __init__(self, seconds: float):
+        """Initializes EstimatedCost. See docs for `@estimated_cost` for more details."""
+
+        super(EstimatedCost, self).__init__(
+            bypass_reserved_namespaces_=True, **{ESTIMATED_COST_TAG: json.dumps(float(seconds))}
+        )
+
+
+def estimated_cost(seconds: float) -> EstimatedCost:
+    """Initializes an `@estimated_cost` decorator. This gives the estimated time (in seconds) it
+    takes to compute a node, which `GroupNodesByCost` uses to decide which nodes are cheap enough
+    to share a task.
+
+    This is implemented using tags, but that might change. Thus you should not
+    rely on the tags created by this decorator (which is why they are on a reserved namespace).
+
+    Example usage:
+
+    .. code-block:: python
+
+        @estimated_cost(seconds=0.5)
+        def example() -> pd.DataFrame:
+            ...
+    """
+    return EstimatedCost(seconds)
@@ -16,7 +16,7 @@ from types import ModuleType
 from typing import Any, Callable, Collection, Dict, FrozenSet, List, Optional, Set, Tuple, Type
 
 import hamilton.lifecycle.base as lifecycle_base
-from hamilton import graph_types, node
+from hamilton import common, graph_types, node
 from hamilton.execution import graph_functions
 from hamilton.function_modifiers import base as fm_base
 from hamilton.function_modifiers.metadata import schema
@@ -671,6 +671,12 @@ class FunctionGraph:
     That is, you should not try to build off of it directly without chatting to us first.
     """
 
+    # Maximum number of compiled execution plans to hold on to, see get_execution_plan
+    EXECUTION_PLAN_CACHE_SIZE = 128
+    # Number of request shapes (final vars + input/override keys) to memoize node resolution for,
+    # see get_upstream_nodes_memoized
+    UPSTREAM_NODE_CACHE_SIZE = 128
+
     def __init__(
         self,
         nodes: Dict[str, Node],
@@ -690,6 +696,8 @@ class FunctionGraph:
         self._config = config
         self.nodes = nodes
         self.adapter = adapter
+        self._execution_plan_cache = common.LRUCache(maxsize=self.EXECUTION_PLAN_CACHE_SIZE)
+        self._upstream_node_cache = common.LRUCache(maxsize=self.UPSTREAM_NODE_CACHE_SIZE)
 
     @staticmethod
     def from_modules(
@@ -1025,12 +1033,17 @@ class FunctionGraph:
         user_nodes = set()
 
         def dfs_traverse(node: node.Node):
+            # Iterative so we don't run into the recursion limit on deep graphs
             nodes.add(node)
-            for n in next_nodes_fn(node):
-                if n not in nodes:
-                    dfs_traverse(n)
-            if node.user_defined:
-                user_nodes.add(node)
+            stack = [node]
+            while len(stack) > 0:
+                current = stack.pop()
+                for n in next_nodes_fn(current):
+                    if n not in nodes:
+                        nodes.add(n)
+                        stack.append(n)
+                if current.user_defined:
+                    user_nodes.add(current)
 
         missing_vars = []
         for var in starting_nodes:
@@ -1047,6 +1060,101 @@ class FunctionGraph:
             raise ValueError(f"Unknown nodes [{missing_vars_str}] requested. Check for typos?")
         return nodes, user_nodes
 
+    def _get_memoized_upstream_nodes(
+        self,
+        final_vars: List[str],
+        runtime_inputs: Optional[Dict[str, Any]],
+        runtime_overrides: Optional[Dict[str, Any]],
+    ) -> list:
+        cache_key = (
+            frozenset(final_vars),
+            frozenset(runtime_inputs) if runtime_inputs is not None else None,
+            # no overrides and empty overrides resolve the same
+            frozenset(runtime_overrides if runtime_overrides is not None else ()),
+        )
+        # [all nodes, user-defined nodes, all nodes in topological order (computed on demand)]
+        resolved = self._upstream_node_cache.get(cache_key)
+        if resolved is None:
+            resolved = [
+                *self.get_upstream_nodes(final_vars, runtime_inputs, runtime_overrides),
+                None,
+            ]
+            self._upstream_node_cache.put(cache_key, resolved)
+        return resolved
+
+    def get_upstream_nodes_memoized(
+        self,
+        final_vars: List[str],
+        runtime_inputs: Dict[str, Any] = None,
+        runtime_overrides: Dict[str, Any] = None,
+    ) -> Tuple[Set[node.Node], Set[node.Node]]:
+        """Same as get_upstream_nodes, but memoized. The result only depends on the requested nodes
+        and on the keys of the inputs/overrides, so we cache it per request shape (LRU, bounded by
+        UPSTREAM_NODE_CACHE_SIZE). The returned sets are shared, so they must not be modified.
+
+        :param final_vars: the list of node names we want.
+        :param runtime_inputs: runtime inputs to the DAG, see get_upstream_nodes.
+        :param runtime_overrides: runtime overrides to the DAG, see get_upstream_nodes.
+        :return: a tuple of sets: - set of all nodes. - subset of nodes that human input is required for.
+        """
+        nodes, user_nodes, _ = self._get_memoized_upstream_nodes(
+            final_vars, runtime_inputs, runtime_overrides
+        )
+        return nodes, user_nodes
+
+    def get_sorted_upstream_nodes(
+        self,
+        final_vars: List[str],
+        runtime_inputs: Dict[str, Any] = None,
+        runtime_overrides: Dict[str, Any] = None,
+    ) -> List[node.Node]:
+        """All the nodes required to compute the final vars, in topological order. This shares the
+        memoization of get_upstream_nodes_memoized, which the driver resolves every execution with,
+        so planning ahead of an execution (e.g. in caching adapters) doesn't traverse the graph
+        again. The returned list is shared, so it must not be modified.
+
+        :param final_vars: the list of node names we want.
+        :param runtime_inputs: runtime inputs to the DAG, see get_upstream_nodes.
+        :param runtime_overrides: runtime overrides to the DAG, see get_upstream_nodes.
+        :return: all nodes required, topologically sorted.
+        """
+        resolved = self._get_memoized_upstream_nodes(final_vars, runtime_inputs, runtime_overrides)
+        if resolved[2] is None:
+            resolved[2] = graph_functions.topologically_sort_nodes(list(resolved[0]))
+        return resolved[2]
+
+    def get_execution_plan(
+        self,
+        nodes: Collection[node.Node],
+        input_keys: Collection[str] = (),
+        computed_keys: Collection[str] = (),
+        override_keys: Collection[str] = (),
+    ) -> graph_functions.ExecutionPlan:
+        """Gets a compiled execution plan for the given nodes. Plans only depend on the requested
+        nodes and on the keys of the inputs/computed values/overrides, so we cache them (LRU,
+        bounded by EXECUTION_PLAN_CACHE_SIZE). Repeated executions with the same shape then skip
+        graph traversal entirely.
+
+        :param nodes: Nodes to compute
+        :param input_keys: Names of the inputs (including config)
+        :param computed_keys: Names of the nodes that have already been computed
+        :param override_keys: Names of the nodes that are overridden
+        :return: The compiled execution plan
+        """
+        cache_key = (
+            tuple(node_.name for node_ in nodes),
+            frozenset(input_keys),
+            frozenset(computed_keys),
+            frozenset(override_keys),
+        )
+        plan = self._execution_plan_cache.get(cache_key)
+        if plan is None:
+            plan = graph_functions.compile_execution_plan(
+                nodes, input_keys, computed_keys, override_keys
+            )
+            self._execution_plan_cache.put(cache_key, plan)
+        return plan
+
     def execute(
         self,
         nodes: Collection[node.Node] = None,
@@ -1067,11 +1175,16 @@ class FunctionGraph:
             nodes = self.get_nodes()
         if inputs is None:
             inputs = {}
+        if computed is None:
+            computed = {}
+        if overrides is None:
+            overrides = {}
         if run_id is None:
             run_id = str(uuid.uuid4())
         inputs = graph_functions.combine_config_and_inputs(self.config, inputs)
-        return graph_functions.execute_subdag(
-            nodes=nodes,
+        plan = self.get_execution_plan(nodes, inputs.keys(), computed.keys(), overrides.keys())
+        return graph_functions.execute_plan(
+            plan,
             inputs=inputs,
             adapter=self.adapter,
             computed=computed,
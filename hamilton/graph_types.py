@@ -5,7 +5,9 @@ import functools
 import hashlib
 import inspect
 import logging
+import types
 import typing
+import weakref
 from dataclasses import dataclass
 
 from hamilton import htypes, node
@@ -62,17 +64,40 @@ def _remove_docs_and_comments(source: str) -> str:
     return ast.unparse(parsed)
 
 
-def hash_source_code(source: typing.Union[str, typing.Callable], strip: bool = False) -> str:
-    """Hashes the source code of a function (str).
+# id(code object) -> (weak reference to the code object, {strip: hash}). Source code hashes are
+# memoized by code object identity, as `inspect.getsource` + `ast` round-tripping is expensive and the
+# source of a code object doesn't change within a process. Code objects are held weakly, so that we
+# don't keep those of temporary modules alive -- entries are dropped as their code is collected, so
+# their ids cannot be reused.
+_SOURCE_HASHES: typing.Dict[int, typing.Tuple[weakref.ref, typing.Dict[bool, str]]] = {}
 
-    The `strip` parameter requires Python 3.9
 
-    If strip, try to remove docs and comments from source code string. Since
-    they don't impact function behavior, they shouldn't influence the hash.
-    """
-    if isinstance(source, typing.Callable):
-        source = inspect.getsource(source)
+def _drop_source_hashes(code_id: int, code_ref: weakref.ref):
+    """Drops the hashes of a code object that was garbage collected."""
+    entry = _SOURCE_HASHES.get(code_id)
+    if entry is not None and entry[0] is code_ref:
+        del _SOURCE_HASHES[code_id]
+
+
+def _get_source_hashes(code: types.CodeType) -> typing.Dict[bool, str]:
+    """Gets the memoized source code hashes of a code object, by strip setting."""
+    entry = _SOURCE_HASHES.get(id(code))
+    if entry is None or entry[0]() is not code:
+        entry = (weakref.ref(code, functools.partial(_drop_source_hashes, id(code))), {})
+        _SOURCE_HASHES[id(code)] = entry
+    return entry[1]
+
+
+def _get_code(fn: typing.Callable) -> typing.Optional[types.CodeType]:
+    """Gets the code object `inspect.getsource` would read the source of, if there is one."""
+    try:
+        code = inspect.unwrap(fn).__code__
+    except (AttributeError, ValueError):
+        return None
+    return code if isinstance(code, types.CodeType) else None
+
 
+def _hash_source(source: str, strip: bool) -> str:
     source = source.strip()
 
     if strip:
@@ -86,6 +111,28 @@ def hash_source_code(source: typing.Union[str, typing.Callable], strip: bool = F
     return hashlib.sha256(source.encode()).hexdigest()
 
 
+def hash_source_code(source: typing.Union[str, typing.Callable], strip: bool = False) -> str:
+    """Hashes the source code of a function (str).
+
+    The `strip` parameter requires Python 3.9
+
+    If strip, try to remove docs and comments from source code string. Since
+    they don't impact function behavior, they shouldn't influence the hash.
+
+    Hashes of callables are memoized by code object, so this is cheap to call repeatedly
+    (e.g. on every node execution, or across runs).
+    """
+    if not isinstance(source, typing.Callable):
+        return _hash_source(source, strip)
+    code = _get_code(source)
+    if code is None:
+        return _hash_source(inspect.getsource(source), strip)
+    hashes = _get_source_hashes(code)
+    if strip not in hashes:
+        hashes[strip] = _hash_source(inspect.getsource(source), strip)
+    return hashes[strip]
+
+
 @dataclass
 class HamiltonNode:
     """External facing API for hamilton Nodes. Having this as a dataclass allows us
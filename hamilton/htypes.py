@@ -1,8 +1,10 @@
+import functools
 import inspect
+import itertools
 import sys
 import typing
-from abc import ABC
-from typing import Any, Generator, Optional, Tuple, Type, TypeVar, Union
+from abc import ABC, ABCMeta
+from typing import Any, Callable, Generator, Iterable, Optional, Tuple, Type, TypeVar, Union
 
 import typing_inspect
 
@@ -287,6 +289,60 @@ class Collect(Generator[V, None, None], ABC):
     pass
 
 
+def _cache_validators(compile_validator: Callable[..., Callable[[Any], bool]]):
+    """Memoizes a function compiling annotations into validators, so each annotation is only
+    inspected once. Annotations that can't be hashed (e.g. with unhashable metadata) are compiled
+    on every call."""
+    cached = functools.lru_cache(maxsize=None)(compile_validator)
+
+    @functools.wraps(compile_validator)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except TypeError:
+            return compile_validator(*args, **kwargs)
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _always_valid(value: Any) -> bool:
+    return True
+
+
+@_cache_validators
+def compile_input_type_check(node_type: Type) -> Callable[[Any], bool]:
+    """Compiles the checks of `check_input_type` for a type into a validator, so that the type is
+    only inspected once. Validators are cached by type.
+
+    :param node_type: Type of the node to check against.
+    :return: A function that tells whether a value is of the correct type.
+    """
+    if node_type == Any or typing_inspect.is_typevar(node_type):  # skip runtime comparison for now.
+        return _always_valid
+    # In the case of dict[str, Any] (or equivalent) in python 3.9 +
+    # we need to double-check that its not generic, as the isinstance clause will break this
+    is_generic = typing_inspect.is_generic_type(node_type)
+    is_class = inspect.isclass(node_type) and not is_generic
+    generic_origin = typing_inspect.get_origin(node_type) if is_generic else None
+    union_checks = (
+        [compile_input_type_check(ut) for ut in typing_inspect.get_args(node_type)]
+        if typing_inspect.is_union_type(node_type)
+        else None
+    )
+
+    def validate(input_value: Any) -> bool:
+        if is_class and isinstance(input_value, node_type):
+            return True
+        elif is_generic and generic_origin == type(input_value):
+            return True
+        elif union_checks is not None:
+            return any([check(input_value) for check in union_checks])
+        return node_type == type(input_value)
+
+    return validate
+
+
 def check_input_type(node_type: Type, input_value: Any) -> bool:
     """Checks an input value against the declare input type. This is a utility function to be
     used for checking types against values. Note we are looser here than in custom_subclass_check,
@@ -296,86 +352,111 @@ def check_input_type(node_type: Type, input_value: Any) -> bool:
     :param input_value: Value to check.
     :return: True if the input value is of the correct type, False otherwise.
     """
-    if node_type == Any:
-        return True
-    # In the case of dict[str, Any] (or equivalent) in python 3.9 +
-    # we need to double-check that its not generic, as the isinstance clause will break this
-    elif (
-        inspect.isclass(node_type)
-        and not typing_inspect.is_generic_type(node_type)
-        and isinstance(input_value, node_type)
-    ):
-        return True
-    elif typing_inspect.is_typevar(node_type):  # skip runtime comparison for now.
-        return True
-    elif typing_inspect.is_generic_type(node_type) and typing_inspect.get_origin(node_type) == type(
-        input_value
-    ):
-        return True
-    elif typing_inspect.is_union_type(node_type):
-        union_types = typing_inspect.get_args(node_type)
-        return any([check_input_type(ut, input_value) for ut in union_types])
-    elif node_type == type(input_value):
-        return True
-    return False
+    return compile_input_type_check(node_type)(input_value)
+
+
+def _sample(elements: Union[list, set, tuple], sample_size: Optional[int]) -> Iterable[Any]:
+    """Up to `sample_size` elements of a collection -- evenly spread for sequences, the first
+    ones otherwise."""
+    if sample_size is None or len(elements) <= sample_size:
+        return elements
+    if isinstance(elements, (list, tuple)):
+        return elements[:: len(elements) // sample_size][:sample_size]
+    return itertools.islice(elements, sample_size)
+
+
+def _compile_elements_check(
+    element_type: Any, sample_size: Optional[int]
+) -> Callable[[Iterable[Any]], bool]:
+    """Compiles a validator checking all the elements of a collection against a type."""
+    if element_type == Any:
+        return _always_valid
+    if type(element_type) in (type, ABCMeta):
+        # for these, isinstance(element, element_type) if issubclass(type(element), element_type)
+        # -- so each distinct type is checked once rather than each element, unless one doesn't
+        # match (e.g. instances overriding __class__, which isinstance considers)
+        def validate(elements: Iterable[Any]) -> bool:
+            elements = list(elements)
+            if all(issubclass(type_, element_type) for type_ in set(map(type, elements))):
+                return True
+            return all(isinstance(element, element_type) for element in elements)
 
+        return validate
+    check_element = compile_instance_check(element_type, sample_size)
+    return lambda elements: all(check_element(element) for element in elements)
 
-# TODO: merge the above with this in some way. Right now they're separate because they have different
-# behaviors. We should determine how to reconcile these and how further type checking capabilities,
-# e.g. handling Annotated, Pandera, etc, should be handled...
-def check_instance(obj: Any, type_: Any) -> bool:
-    """This function checks if an object is an instance of a given type. It supports generic types as well.
 
-    :param obj: The object to check.
+@_cache_validators
+def compile_instance_check(type_: Any, sample_size: Optional[int] = None) -> Callable[[Any], bool]:
+    """Compiles the checks of `check_instance` for a type into a validator, so that the type is
+    only inspected once. Validators are cached by type (and sample size).
+
     :param type_: The type to check against. This can be a generic type like List[int] or Dict[str, Any].
-    :return: True if the object is an instance of the type, False otherwise.
+    :param sample_size: Maximum number of elements of lists, sets, tuples and dicts to check
+        (evenly spread for lists and tuples, the first ones otherwise). None means all of them.
+    :return: A function that tells whether an object is an instance of the type.
     """
+    if sample_size is not None and sample_size < 1:
+        raise ValueError(f"sample_size must be at least 1, or None, got {sample_size}")
     if type_ == Any:
-        return True
+        return _always_valid
     # Get the origin of the type (i.e., the base class for generic types)
     origin = getattr(type_, "__origin__", None)
 
-    # If the type has an origin, it's a generic type
-    if origin is not None:
-        # If the type is a Union type
-        if origin is Union:
-            return any(check_instance(obj, t) for t in type_.__args__)
-        elif origin is Literal:
-            return obj in type_.__args__
+    # If the type is not a generic type, just use isinstance
+    if origin is None:
+        return lambda obj: isinstance(obj, type_)
+    # If the type is a Union type
+    if origin is Union:
+        checks = [compile_instance_check(t, sample_size) for t in type_.__args__]
+        return lambda obj: any(check(obj) for check in checks)
+    elif origin is Literal:
+        values = type_.__args__
+        return lambda obj: obj in values
+    # If the type doesn't have arguments (i.e., it's not a parameterized generic type like List[int])
+    if not hasattr(type_, "__args__"):
+        return lambda obj: isinstance(obj, origin) and isinstance(obj, type_)
+
+    # Get the element type(s) of the generic type
+    element_type = type_.__args__
+    check_keys = _compile_elements_check(element_type[0], sample_size)
+    check_values = (
+        _compile_elements_check(element_type[1], sample_size)
+        if len(element_type) > 1
+        else _always_valid
+    )
+
+    def validate(obj: Any) -> bool:
         # Check if the object is an instance of the origin of the type
-        elif not isinstance(obj, origin):
+        if not isinstance(obj, origin):
             return False
+        # If the object is a dictionary, check its keys against the first element type and its
+        # values against the second one
+        if isinstance(obj, dict):
+            if sample_size is not None and len(obj) > sample_size:
+                obj = dict(itertools.islice(obj.items(), sample_size))
+            return check_keys(obj.keys()) and check_values(obj.values())
+        # If the object is a list, set, or tuple
+        elif isinstance(obj, (list, set, tuple)):
+            return check_keys(_sample(obj, sample_size))
+        return isinstance(obj, type_)
 
-        # If the type has arguments (i.e., it's a parameterized generic type like List[int])
-        if hasattr(type_, "__args__"):
-            # Get the element type(s) of the generic type
-            element_type = type_.__args__
-
-            # If the object is a dictionary
-            if isinstance(obj, dict):
-                all_items_meet_condition = True
-
-                # Iterate over each key-value pair in the dictionary
-                for key, value in obj.items():
-                    # Check if the key is an instance of the first element type and the value is an instance of the second element type
-                    key_is_correct_type = check_instance(key, element_type[0])
-                    value_is_correct_type = check_instance(value, element_type[1])
-
-                    # If either the key or the value is not the correct type, set the flag to False and break the loop
-                    if not key_is_correct_type or not value_is_correct_type:
-                        all_items_meet_condition = False
-                        break
-
-                # Return the result
-                return all_items_meet_condition
-
-            # If the object is a list, set, or tuple
-            elif isinstance(obj, (list, set, tuple)):
-                element_type = element_type[0]
-                for i in obj:
-                    if not check_instance(i, element_type):
-                        return False
-                return True
+    return validate
 
-    # If the type is not a generic type, just use isinstance
-    return isinstance(obj, type_)
+
+# TODO: merge the above with this in some way. Right now they're separate because they have different
+# behaviors. We should determine how to reconcile these and how further type checking capabilities,
+# e.g. handling Annotated, Pandera, etc, should be handled...
+def check_instance(obj: Any, type_: Any, sample_size: Optional[int] = None) -> bool:
+    """This function checks if an object is an instance of a given type. It supports generic types as well.
+
+    The type is compiled into a validator once (see `compile_instance_check`), so checking many
+    objects against the same type is cheap.
+
+    :param obj: The object to check.
+    :param type_: The type to check against. This can be a generic type like List[int] or Dict[str, Any].
+    :param sample_size: Maximum number of elements of lists, sets, tuples and dicts to check
+        (recursively). None means all of them.
+    :return: True if the object is an instance of the type, False otherwise.
+    """
+    return compile_instance_check(type_, sample_size)(obj)
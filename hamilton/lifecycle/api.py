@@ -305,7 +305,9 @@ class GraphExecutionHook(BasePreGraphExecute, BasePostGraphExecute):
         """Implementation of the pre_graph_execute hook. This just converts the inputs to
         the format the user-facing hook is expecting -- performing a walk of the DAG to pass in
         the set of nodes to execute. Delegates to the interface method."""
-        all_nodes, user_defined_nodes = graph.get_upstream_nodes(final_vars, inputs, overrides)
+        all_nodes, user_defined_nodes = graph.get_upstream_nodes_memoized(
+            final_vars, inputs, overrides
+        )
         nodes_to_execute = set(all_nodes) - set(user_defined_nodes)
         return self.run_before_graph_execution(
             graph=HamiltonGraph.from_graph(graph),
@@ -520,6 +522,7 @@ class NodeExecutionMethod(BaseDoNodeExecute):
             node_callable=node_.callable,
             node_kwargs=kwargs,
             task_id=task_id,
+            run_id=run_id,
         )
 
     @abc.abstractmethod
@@ -540,7 +543,8 @@ class NodeExecutionMethod(BaseDoNodeExecute):
         :param node_callable: Callable of the node.
         :param node_kwargs: Keyword arguments to pass to the node.
         :param task_id: The ID of the task, none if not in a task-based environment
-        :param future_kwargs: Additional keyword arguments -- this is kept for backwards compatibility
+        :param future_kwargs: Additional keyword arguments -- this is kept for backwards compatibility.
+            This includes `run_id`, the ID of the run the node is executed in.
         :return: The result of the node execution -- up to you to return this.
         """
         pass
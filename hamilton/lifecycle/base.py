@@ -693,6 +693,33 @@ class BasePostGraphExecuteAsync(abc.ABC):
         pass
 
 
+@lifecycle.base_method("do_load_cached_results")
+class BaseDoLoadCachedResults(abc.ABC):
+    @abc.abstractmethod
+    def do_load_cached_results(
+        self,
+        *,
+        run_id: str,
+        graph: "graph.FunctionGraph",
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Method that is called after pre_graph_execute, to load results from a cache before
+        executing anything. Loaded nodes are not executed, and neither is anything upstream of them
+        that no other node to execute depends on. With task-based execution, results of nodes that
+        are repeated per item of a Parallelizable[] node are ignored, as they only exist per item.
+
+        :param run_id: ID of the run, unique in scope of the driver.
+        :param graph: Graph that is being executed
+        :param final_vars: Variables we are extracting from the graph
+        :param inputs: Inputs to the graph
+        :param overrides: Overrides to graph execution
+        :return: Results loaded from the cache, by node name
+        """
+        pass
+
+
 @lifecycle.base_method("do_build_result")
 class BaseDoBuildResult(abc.ABC):
     @abc.abstractmethod
@@ -729,6 +756,7 @@ LifecycleAdapter = Union[
     BasePostTaskExecuteAsync,
     BasePostGraphExecute,
     BasePostGraphExecuteAsync,
+    BaseDoLoadCachedResults,
     BaseDoBuildResult,
 ]
 
@@ -749,6 +777,18 @@ class LifecycleAdapterSet:
         self.sync_hooks, self.async_hooks = self._get_lifecycle_hooks()
         self.sync_methods, self.async_methods = self._get_lifecycle_methods()
         self.sync_validators = self._get_lifecycle_validators()
+        # Bound methods are resolved once, up front, so the hot path (per-node hooks) is just
+        # a dict lookup and a loop over a tuple of callables.
+        self._bound_sync_hooks = {
+            hook: tuple(getattr(adapter, hook) for adapter in adapters)
+            for hook, adapters in self.sync_hooks.items()
+        }
+        self._bound_sync_methods = {
+            method: getattr(adapters[0], method) for method, adapters in self.sync_methods.items()
+        }
+        self.is_empty = not (
+            self.sync_hooks or self.async_hooks or self.sync_methods or self.async_methods
+        )
 
     def _get_lifecycle_validators(
         self,
@@ -875,8 +915,27 @@ class LifecycleAdapterSet:
         :param hook_name: Name of the hooks to call
         :param kwargs: Keyword arguments to pass into the hook
         """
-        for adapter in self.sync_hooks[hook_name]:
-            getattr(adapter, hook_name)(**kwargs)
+        for hook in self._bound_sync_hooks[hook_name]:
+            hook(**kwargs)
+
+    def get_sync_hooks(self, hook_name: str) -> Tuple[Callable, ...]:
+        """Gives the bound synchronous hooks for a hook name, precomputed at construction.
+        This is meant for hot loops (e.g. per-node execution) -- it does no validation,
+        and returns an empty tuple if no adapter implements the hook.
+
+        :param hook_name: Name of the hook
+        :return: A tuple of bound methods to call, in order
+        """
+        return self._bound_sync_hooks.get(hook_name, ())
+
+    def get_sync_method(self, method_name: str) -> Optional[Callable]:
+        """Gives the bound synchronous method for a method name, precomputed at construction.
+        Like get_sync_hooks, this does no validation, and returns None if no adapter implements it.
+
+        :param method_name: Name of the method
+        :return: The bound method to call, or None
+        """
+        return self._bound_sync_methods.get(method_name)
 
     async def call_all_lifecycle_hooks_async(self, hook_name: str, **kwargs):
         """Calls all the lifecycle hooks in this group, by hook name (stage).
@@ -1,18 +1,24 @@
 """A selection of default lifeycle hooks/methods that come with Hamilton. These carry no additional requirements"""
 
-import hashlib
 import logging
+import os
 import pdb
-import pickle
 import pprint
 import random
 import shelve
 import time
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from hamilton import graph_types, htypes
+from hamilton.caching import fingerprinting, planning, serialization
+from hamilton.caching.metrics import CacheMetrics
+from hamilton.caching.stores import MISSING
 from hamilton.graph_types import HamiltonGraph
 from hamilton.lifecycle import GraphExecutionHook, NodeExecutionHook, NodeExecutionMethod
+from hamilton.lifecycle import base as lifecycle_base
+
+if TYPE_CHECKING:
+    from hamilton import graph, node
 
 logger = logging.getLogger(__name__)
 
@@ -317,7 +323,20 @@ class PDBDebugger(NodeExecutionHook, NodeExecutionMethod):
             pdb.set_trace()
 
 
-class CacheAdapter(NodeExecutionHook, NodeExecutionMethod, GraphExecutionHook):
+def _file_size(path: str) -> Optional[int]:
+    """Size of a file, None if it doesn't exist"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class CacheAdapter(
+    NodeExecutionHook,
+    NodeExecutionMethod,
+    GraphExecutionHook,
+    lifecycle_base.BaseDoLoadCachedResults,
+):
     """Class to cache node results on disk with a key based on the node code implementation and inputs.
     Following runs with the same key can load node results and skip computation.
 
@@ -326,77 +345,183 @@ class CacheAdapter(NodeExecutionHook, NodeExecutionMethod, GraphExecutionHook):
 
     Notes:
         - It uses the stdlib `shelve` module and the pickle format, which makes results dependent
-        on the Python version. Use materialization for persistent results
+        on the Python version. Use materialization for persistent results. Results with a better
+        suited format (e.g. dataframes, numpy arrays, see `hamilton.caching.serialization`) are
+        stored in that format in the `{cache_path}-results` directory instead, and only referenced
+        from the shelve
         - There are no utility to manage cache size so you'll have to delete it periodically. Look
         at the diskcache plugin for Hamilton `hamilton.plugins.h_diskcache` for better cache management.
+        - Cache keys are computed before execution, and the results of the requested nodes are
+        looked up first: nodes upstream of cache hits are only executed if a cache miss needs them.
+        This requires the nodes in between to be cached, as the key of a node downstream of a
+        node that isn't cached depends on its value.
+        - The shelve can't be shared between processes, so this can't be used with executors that
+        run tasks in other processes (e.g. MultiProcessingExecutor, RayTaskExecutor). Use
+        `hamilton.caching.adapter.TieredCacheAdapter` for these.
+        - Hits, misses and time spent are recorded in `metrics` (see `hamilton.caching.metrics`).
+        Only the sizes of results stored in their own file are counted in bytes read/written.
     """
 
     nodes_history_key: str = "_nodes_history"
 
     def __init__(
-        self, cache_vars: Union[List[str], None] = None, cache_path: str = "./hamilton-cache"
+        self,
+        cache_vars: Union[List[str], None] = None,
+        cache_path: str = "./hamilton-cache",
+        metrics: Optional[CacheMetrics] = None,
     ):
         """Initialize the cache
 
         :param cache_vars: List of nodes for which to store/load results. Passing None will use the cache
         for all nodes. Default is None.
         :param cache_path: File path to the cache. The file name doesn't need an extension.
+        :param metrics: Metrics to record hits/misses in. None means new ones.
         """
         self.cache_vars = cache_vars if cache_vars else []
         self.cache_path = cache_path
+        self.results_path = f"{cache_path}-results"
         self.cache = shelve.open(self.cache_path)
         self.nodes_history: Dict[str, List[str]] = self.cache.get(
             key=CacheAdapter.nodes_history_key, default=dict()
         )
         self.used_nodes_hash: Dict[str, str] = dict()
+        # (task_id, node_name) -> cache key of cache misses, computed in `run_to_execute_node`
+        self.used_cache_keys: Dict[Tuple[Optional[str], str], str] = dict()
+        # (task_id, node_name) -> fingerprint of the node's output for this run. This is the
+        # node's cache key, so downstream nodes can build their key without re-hashing the data.
+        self.fingerprints: Dict[Tuple[Optional[str], str], str] = dict()
+        self.metrics = metrics if metrics is not None else CacheMetrics()
+        self._run_id = None
         self.cache.close()
 
+    def __getstate__(self) -> dict:
+        # copies in other processes would write to the same shelve, which would corrupt it
+        raise TypeError(
+            "CacheAdapter can't be shared between processes, as its shelve isn't process-safe. "
+            "Use hamilton.caching.adapter.TieredCacheAdapter instead."
+        )
+
     def run_before_graph_execution(self, *, graph: HamiltonGraph, **kwargs):
         """Set `cache_vars` to all nodes if received None during `__init__`"""
+        self._run_id = kwargs.get("run_id")
         self.cache = shelve.open(self.cache_path)
+        self.fingerprints = dict()
         if self.cache_vars == []:
             self.cache_vars = [n.name for n in graph.nodes]
 
     def run_to_execute_node(
-        self, *, node_name: str, node_callable: Any, node_kwargs: Dict[str, Any], **kwargs
+        self,
+        *,
+        node_name: str,
+        node_callable: Any,
+        node_kwargs: Dict[str, Any],
+        task_id: Optional[str] = None,
+        **kwargs,
     ):
         """Create cache key based on node callable hash (equiv. to HamiltonNode.version) and
         the node inputs (`node_kwargs`).If key in cache (cache hit), load result; else (cache miss),
         compute the node and append node name to `used_nodes_hash`.
 
         Note:
-            - the callable hash is stored  in `used_nodes_hash` because it's required to create the
-            key in `run_after_node_execution` and the callable won't be accessible to recompute it
+            - inputs produced by cached nodes earlier in this run are not re-hashed -- their
+            fingerprint is the cache key they were computed/loaded with
+            - the cache key is stored in `used_cache_keys` because it's required to store the
+            result in `run_after_node_execution`, and this avoids computing it twice
         """
         if node_name not in self.cache_vars:
             return node_callable(**node_kwargs)
 
         node_hash = graph_types.hash_source_code(node_callable, strip=True)
-        cache_key = CacheAdapter.create_key(node_hash, node_kwargs)
+        input_fingerprints = {
+            name: self.fingerprints[(task_id, name)]
+            for name in node_kwargs
+            if (task_id, name) in self.fingerprints
+        }
+        cache_key = CacheAdapter.create_key(node_hash, node_kwargs, input_fingerprints)
+        self.fingerprints[(task_id, node_name)] = cache_key
 
-        from_cache = self.cache.get(cache_key, None)
+        from_cache = self._load(cache_key, node_name)
         if from_cache is not None:
             return from_cache
 
         self.used_nodes_hash[node_name] = node_hash
+        self.used_cache_keys[(task_id, node_name)] = cache_key
         self.nodes_history[node_name] = self.nodes_history.get(node_name, []) + [node_hash]
-        return node_callable(**node_kwargs)
+        start = time.perf_counter()
+        result = node_callable(**node_kwargs)
+        self.metrics.record_miss(self._run_id, node_name, time.perf_counter() - start)
+        return result
 
     def run_after_node_execution(
-        self, *, node_name: str, node_kwargs: Dict[str, Any], result: Any, **kwargs
+        self,
+        *,
+        node_name: str,
+        node_kwargs: Dict[str, Any],
+        result: Any,
+        task_id: Optional[str] = None,
+        **kwargs,
     ):
-        """If `run_to_execute_node` was a cache miss (hash stored in `used_nodes_hash`),
+        """If `run_to_execute_node` was a cache miss (key stored in `used_cache_keys`),
         store the computed result in cache
         """
         if node_name not in self.cache_vars:
             return
 
-        node_hash = self.used_nodes_hash.get(node_name)
-        if node_hash is None:
-            return
-
-        cache_key = CacheAdapter.create_key(node_hash, node_kwargs)
+        cache_key = self.used_cache_keys.pop((task_id, node_name), None)
+        if cache_key is None:
+            node_hash = self.used_nodes_hash.get(node_name)
+            if node_hash is None:
+                return
+            cache_key = CacheAdapter.create_key(node_hash, node_kwargs)
+
+        start = time.perf_counter()
+        size = None
+        if serialization.get_formats(type(result)) != (serialization.FALLBACK_FORMAT,):
+            os.makedirs(self.results_path, exist_ok=True)
+            result = serialization.save(result, os.path.join(self.results_path, cache_key))
+            size = _file_size(result.path)
         self.cache[cache_key] = result
+        self.metrics.record_store(self._run_id, node_name, time.perf_counter() - start, size)
+
+    def do_load_cached_results(
+        self,
+        *,
+        run_id: str,
+        graph: "graph.FunctionGraph",
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Loads the cached results needed to compute `final_vars` before executing anything, so
+        that nodes upstream of cache hits are pruned (see hamilton.caching.planning). The cache keys
+        computed here are the fingerprints used during execution, so nothing is hashed twice.
+        """
+        cache_vars = set(self.cache_vars)
+        cache_keys = planning.get_cache_keys(graph, final_vars, inputs, overrides, cache_vars)
+        self.fingerprints.update({(None, name): key for name, key in cache_keys.items()})
+
+        def load(node_: "node.Node") -> Any:
+            if node_.name not in cache_vars or node_.name not in cache_keys:
+                return MISSING
+            from_cache = self._load(cache_keys[node_.name], node_.name)
+            return from_cache if from_cache is not None else MISSING
+
+        return planning.load_cached_results(graph, final_vars, overrides, load)
+
+    def _load(self, cache_key: str, node_name: str) -> Any:
+        """Loads a result from the cache, None if it's missing. Hits are recorded in the metrics."""
+        start = time.perf_counter()
+        size = None
+        from_cache = self.cache.get(cache_key, None)
+        if isinstance(from_cache, serialization.StoredResult):
+            size = _file_size(from_cache.path)
+            try:
+                from_cache = serialization.load(from_cache)
+            except FileNotFoundError:
+                from_cache = None
+        if from_cache is not None:
+            self.metrics.record_hit(self._run_id, node_name, time.perf_counter() - start, size)
+        return from_cache
 
     def run_after_graph_execution(self, *args, **kwargs):
         """After completing execution, overwrite nodes_history_key in cache and close"""
@@ -411,15 +536,20 @@ class CacheAdapter(NodeExecutionHook, NodeExecutionMethod, GraphExecutionHook):
         pass
 
     @staticmethod
-    def create_key(node_hash: str, node_inputs: Dict[str, Any]) -> str:
-        """Pickle objects into bytes then get their hash value"""
-        digest = hashlib.sha256()
-        digest.update(node_hash.encode())
-
-        for ins in node_inputs.values():
-            digest.update(pickle.dumps(ins))
-
-        return digest.hexdigest()
+    def create_key(
+        node_hash: str,
+        node_inputs: Dict[str, Any],
+        input_fingerprints: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Combine the node hash with the fingerprints of its inputs. Inputs that already
+        have a fingerprint (e.g. outputs of upstream cached nodes) are not hashed again.
+
+        :param node_hash: Hash of the node's source code
+        :param node_inputs: Inputs to the node
+        :param input_fingerprints: Known fingerprints of (some of) the inputs, by name
+        :return: The cache key
+        """
+        return fingerprinting.create_key(node_hash, node_inputs, input_fingerprints)
 
 
 def wait_random(mean: float, stddev: float):
@@ -457,16 +587,27 @@ class FunctionInputOutputTypeChecker(NodeExecutionHook):
 
     It is a simple, but very strict type check against the declared type with what was actually received.
     E.g. if you don't want to check the types of a dictionary, don't annotate it with a type.
+
+    Each declared type is compiled into a validator once (see `htypes.compile_instance_check`). To
+    keep the cost of checking large lists/dicts bounded (e.g. in production), pass `sample_size` to
+    only check some of their elements.
     """
 
-    def __init__(self, check_input: bool = True, check_output: bool = True):
+    def __init__(
+        self, check_input: bool = True, check_output: bool = True, sample_size: Optional[int] = None
+    ):
         """Constructor.
 
         :param check_input: check inputs to all functions
         :param check_output: check outputs to all functions
+        :param sample_size: maximum number of elements of lists, sets, tuples and dicts to check.
+            None means all of them.
         """
+        if sample_size is not None and sample_size < 1:
+            raise ValueError(f"sample_size must be at least 1, or None, got {sample_size}")
         self.check_input = check_input
         self.check_output = check_output
+        self.sample_size = sample_size
 
     def run_before_node_execution(
         self,
@@ -482,7 +623,9 @@ class FunctionInputOutputTypeChecker(NodeExecutionHook):
         """Checks that the result type matches the expected node return type."""
         if self.check_input:
             for input_name, input_value in node_kwargs.items():
-                if not htypes.check_instance(input_value, node_input_types[input_name]):
+                if not htypes.check_instance(
+                    input_value, node_input_types[input_name], self.sample_size
+                ):
                     raise TypeError(
                         f"Node {node_name} received an input of type {type(input_value)} for {input_name}, expected {node_input_types[input_name]}"
                     )
@@ -503,7 +646,7 @@ class FunctionInputOutputTypeChecker(NodeExecutionHook):
         """Checks that the result type matches the expected node return type."""
         if self.check_output:
             # Replace the isinstance check in your code with check_instance
-            if not htypes.check_instance(result, node_return_type):
+            if not htypes.check_instance(result, node_return_type, self.sample_size):
                 raise TypeError(
                     f"Node {node_name} returned a result of type {type(result)}, expected {node_return_type}"
                 )
@@ -1,4 +1,7 @@
+import dataclasses
+import json
 import logging
+import operator
 import typing
 
 import dask.array
@@ -9,9 +12,13 @@ from dask import compute
 from dask.base import tokenize
 from dask.delayed import Delayed, delayed
 from dask.distributed import Client as DaskClient
+from dask.distributed import Future as DaskFuture
 
 from hamilton import base, htypes, node
 from hamilton.execution import executors
+from hamilton.execution.grouping import TaskImplementation
+from hamilton.execution.state import DeferredResult
+from hamilton.function_modifiers.metadata import DASK_SUBMIT_TAG_NAMESPACE
 
 logger = logging.getLogger(__name__)
 
@@ -266,16 +273,138 @@ class DaskDataFrameResult(base.ResultMixin):
 # TODO: add ResultMixins for dask types
 
 
+def parse_dask_submit_options_from_tags(
+    tags: typing.Dict[str, str]
+) -> typing.Dict[str, typing.Any]:
+    """Parses the options to pass to client.submit() from Hamilton Tags.
+
+    Tags are added to nodes via the @dask_submit_options decorator
+
+    :param tags: Full set of Tags for a Node
+    :return: The dask-friendly version
+    """
+    return {
+        tag_name.split(".", 1)[1]: json.loads(tag_value)
+        for tag_name, tag_value in tags.items()
+        if tag_name.startswith(f"{DASK_SUBMIT_TAG_NAMESPACE}.")
+    }
+
+
+def merge_dask_submit_options(
+    *options: typing.Dict[str, typing.Any]
+) -> typing.Dict[str, typing.Any]:
+    """Combines the submit options of the nodes of a task: the highest of each resource (and of
+    numeric options, E.G. priority or retries), and the last of any other option.
+
+    :param options: Options of each node, as parsed by parse_dask_submit_options_from_tags
+    :return: The options of the task
+    """
+    merged = {}
+    for node_options in options:
+        for name, value in node_options.items():
+            current = merged.get(name)
+            if isinstance(value, dict) and isinstance(current, dict):
+                value = {
+                    key: max(current.get(key, amount), amount) for key, amount in value.items()
+                }
+                merged[name] = {**current, **value}
+            elif isinstance(value, (int, float)) and isinstance(current, (int, float)):
+                merged[name] = max(current, value)
+            else:
+                merged[name] = value
+    return merged
+
+
+@dataclasses.dataclass(frozen=True)
+class DaskFutureResult(DeferredResult):
+    """Result of a task kept on the dask workers. Dask tasks receive it from the worker that holds
+    it, rather than through the controller.
+
+    This refers to the results of the task that computed it, by their future, and its name in
+    them -- so each task is a single dask task, whatever its number of outputs.
+    """
+
+    future: DaskFuture
+    key: str
+
+    def resolve(self) -> typing.Any:
+        # picked out on the worker, so only this result is sent back, not all of the task's
+        return self.future.client.submit(operator.getitem, self.future, self.key).result()
+
+
+def execute_task_with_futures(
+    task: TaskImplementation,
+    input_locations: typing.Dict[str, typing.Tuple[int, str]],
+    *task_results: typing.Dict[str, typing.Any],
+) -> typing.Dict[str, typing.Any]:
+    """Executes a task on a dask worker.
+
+    :param task: Task to execute, without the inputs that are held by the workers
+    :param input_locations: Where the inputs held by the workers are -- for each, the index of the
+        results of the task that computed it, and its name in them
+    :param task_results: Results of the tasks that computed these -- dask resolves them, as they are
+        passed as futures
+    :return: The results of the task
+    """
+    inputs = {name: task_results[index][key] for name, (index, key) in input_locations.items()}
+    task = dataclasses.replace(task, dynamic_inputs={**task.dynamic_inputs, **inputs})
+    return executors.base_execute_task(task)
+
+
+class DaskTaskFuture(executors.TaskFutureWrappingPythonFuture):
+    """Future of a task whose results are left on the dask workers. Neither its state nor its result
+    fetches them -- each output is referred to by the future of the task and its name."""
+
+    def __init__(
+        self,
+        future: DaskFuture,
+        output_names: typing.List[str],
+        overrides: typing.Dict[str, typing.Any],
+    ):
+        super(DaskTaskFuture, self).__init__(future)
+        self.output_names = output_names
+        self.overrides = overrides
+
+    def get_state(self):
+        if self.future.done() and self.future.status != "error":
+            return executors.TaskState.SUCCESSFUL
+        return super(DaskTaskFuture, self).get_state()
+
+    def get_result(self):
+        if not self.future.done():
+            return None
+        if self.future.status == "error":
+            self.future.result()  # raises the task's error
+        return {
+            **self.overrides,
+            **{name: DaskFutureResult(self.future, name) for name in self.output_names},
+        }
+
+
 class DaskExecutor(executors.TaskExecutor):
-    """A DaskExecutor for task-based execution on dask in the new Hamilton execution API."""
+    """A DaskExecutor for task-based execution on dask in the new Hamilton execution API.
 
-    def __init__(self, *, client: DaskClient):
+    By default, the results of tasks are left on the workers, and tasks that depend on them are
+    passed their futures -- so that dask schedules them where their data lives, rather than
+    gathering it to the controller. Only the results that are needed locally (final outputs, inputs
+    to Collect[] and Parallelizable[] nodes, which run on the controller) are gathered.
+
+    Options to submit tasks with (E.G. resources and priority) can be set per node, with
+    `@dask_submit_options`.
+    """
+
+    def __init__(self, *, client: DaskClient, pass_futures: bool = True):
         """Initializes the DaskExecutor. Note this currently takes in the client -- we will likely
         add the ability to make it take in parameters to instantiate/tear down a client on its own.
         This just allows full flexibility for now.
 
+        :param client: Dask client to submit tasks with.
+        :param pass_futures: Whether to leave task results on the workers, passing their futures
+            to dependent tasks. If False, all results are gathered to the controller, and sent back
+            to the tasks that need them. Default is True.
         """
         self.client = client
+        self.pass_futures = pass_futures
 
     def init(self):
         """No-op -- client already passed in by the user."""
@@ -296,9 +425,42 @@ class DaskExecutor(executors.TaskExecutor):
         :param task: Task to execute (contains all arguments necessary)
         :return: The future for the task
         """
-
-        return executors.TaskFutureWrappingPythonFuture(
-            self.client.submit(executors.base_execute_task, task)
+        submit_options = merge_dask_submit_options(
+            *(parse_dask_submit_options_from_tags(node_.tags) for node_ in task.nodes)
+        )
+        if not self.pass_futures:
+            return executors.TaskFutureWrappingPythonFuture(
+                self.client.submit(executors.base_execute_task, task, **submit_options)
+            )
+        # Inputs held by the workers are passed as the futures of the tasks that computed them,
+        # which dask resolves on the worker
+        deferred = {
+            key: value
+            for key, value in task.dynamic_inputs.items()
+            if isinstance(value, DaskFutureResult)
+        }
+        task_futures = list(
+            {value.future.key: value.future for value in deferred.values()}.values()
+        )
+        positions = {future.key: index for index, future in enumerate(task_futures)}
+        input_locations = {
+            name: (positions[value.future.key], value.key) for name, value in deferred.items()
+        }
+        task = dataclasses.replace(
+            task,
+            dynamic_inputs={
+                key: value for key, value in task.dynamic_inputs.items() if key not in deferred
+            },
+        )
+        future = self.client.submit(
+            execute_task_with_futures,
+            task,
+            input_locations,
+            *task_futures,
+            **submit_options,
+        )
+        return DaskTaskFuture(
+            future, list(task.outputs_to_compute), executors.get_task_overrides(task)
         )
 
     def can_submit_task(self) -> bool:
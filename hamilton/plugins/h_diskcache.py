@@ -1,9 +1,11 @@
 import logging
-from typing import Any, Dict, List, Union
+import time
+from typing import Any, Dict, List, Optional, Union
 
 import diskcache
 
 from hamilton import driver, graph_types, lifecycle, node
+from hamilton.caching.metrics import CacheMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -77,9 +79,17 @@ class DiskCacheAdapter(
     nodes_history_key: str = "_nodes_history"
 
     def __init__(
-        self, cache_vars: Union[List[str], None] = None, cache_path: str = ".", **cache_settings
+        self,
+        cache_vars: Union[List[str], None] = None,
+        cache_path: str = ".",
+        metrics: Optional[CacheMetrics] = None,
+        **cache_settings,
     ):
         self.cache_vars = cache_vars if cache_vars else []
+        # hits, misses and time spent -- diskcache doesn't give the size of results, so bytes
+        # read/written aren't counted
+        self.metrics = metrics if metrics is not None else CacheMetrics()
+        self._run_id = None
         self.cache_path = cache_path
         self.cache = diskcache.Cache(directory=cache_path, **cache_settings)
         self.nodes_history: Dict[str, List[str]] = self.cache.get(
@@ -89,6 +99,7 @@ class DiskCacheAdapter(
 
     def run_before_graph_execution(self, *, graph: graph_types.HamiltonGraph, **kwargs):
         """Set cache_vars to all nodes if not specified"""
+        self._run_id = kwargs.get("run_id")
         if self.cache_vars == []:
             self.cache_vars = [n.name for n in graph.nodes]
 
@@ -103,8 +114,10 @@ class DiskCacheAdapter(
         self.used_nodes_hash[node_name] = node_hash
         cache_key = (node_hash, *node_kwargs.values())
 
+        start = time.perf_counter()
         from_cache = self.cache.get(key=cache_key, default=None)
         if from_cache is not None:
+            self.metrics.record_hit(self._run_id, node_name, time.perf_counter() - start)
             if logger.isEnabledFor(logging.DEBUG):
                 node_kwargs_string = repr(node_kwargs)
                 if len(node_kwargs_string) > MAX_KWARGS_REPR_LENGTH:  # limit size of log
@@ -118,7 +131,10 @@ class DiskCacheAdapter(
                 node_kwargs_string = node_kwargs_string[0:MAX_KWARGS_REPR_LENGTH] + "..."
             logger.debug(f"{node_name} {node_kwargs_string}: executed")
         self.nodes_history[node_name] = self.nodes_history.get(node_name, []) + [node_hash]
-        return node_callable(**node_kwargs)
+        start = time.perf_counter()
+        result = node_callable(**node_kwargs)
+        self.metrics.record_miss(self._run_id, node_name, time.perf_counter() - start)
+        return result
 
     def run_after_node_execution(self, *, node_name: str, node_kwargs: dict, result: Any, **kwargs):
         if node_name not in self.cache_vars:
@@ -128,7 +144,9 @@ class DiskCacheAdapter(
         cache_key = (node_hash, *node_kwargs.values())
         cache_tag = f"{node_name}.{node_hash}"
         # only adds if key doesn't exist
-        self.cache.add(key=cache_key, value=result, tag=cache_tag)
+        start = time.perf_counter()
+        if self.cache.add(key=cache_key, value=result, tag=cache_tag):
+            self.metrics.record_store(self._run_id, node_name, time.perf_counter() - start)
 
     def run_after_graph_execution(self, *args, **kwargs):
         self.cache.set(key=DiskCacheAdapter.nodes_history_key, value=self.nodes_history)
@@ -1,3 +1,4 @@
+import dataclasses
 import functools
 import json
 import logging
@@ -10,6 +11,7 @@ from hamilton import base, htypes, node
 from hamilton.execution import executors
 from hamilton.execution.executors import TaskFuture
 from hamilton.execution.grouping import TaskImplementation
+from hamilton.execution.state import DeferredResult
 from hamilton.function_modifiers.metadata import RAY_REMOTE_TAG_NAMESPACE
 
 logger = logging.getLogger(__name__)
@@ -232,9 +234,73 @@ class RayWorkflowGraphAdapter(base.HamiltonGraphAdapter, base.ResultMixin):
         return result
 
 
+@dataclasses.dataclass(frozen=True)
+class ObjectRefResult(DeferredResult):
+    """Result of a task kept in Ray's object store. Ray tasks receive the object directly, rather
+    than through the controller."""
+
+    ref: ray.ObjectRef
+
+    def resolve(self) -> typing.Any:
+        return ray.get(self.ref)
+
+
+def execute_task_with_object_refs(
+    task: TaskImplementation,
+    output_names: typing.List[str],
+    ref_names: typing.List[str],
+    *ref_values: typing.Any,
+) -> typing.Tuple[typing.Any, ...]:
+    """Executes a task in a Ray worker. This is submitted with one return per output, so that each
+    output is its own object in the object store, owned by the driver.
+
+    :param task: Task to execute, without the inputs that are in the object store
+    :param output_names: Names of the outputs to return, in order
+    :param ref_names: Names of the inputs that are in the object store
+    :param ref_values: Values of these -- Ray resolves them, as they are passed as ObjectRefs
+    :return: The values of the outputs, followed by None -- the driver waits on that one to know the
+        task is done, without fetching any output
+    """
+    task = dataclasses.replace(
+        task, dynamic_inputs={**task.dynamic_inputs, **dict(zip(ref_names, ref_values))}
+    )
+    results = executors.base_execute_task(task)
+    return (*(results[name] for name in output_names), None)
+
+
+class ObjectRefTaskFuture(executors.TaskFutureWrappingPythonFuture):
+    """Future of a task whose outputs are left in the object store. Its result refers to each
+    output by its ObjectRef, and its state comes from an empty return of the task, so neither
+    fetches an output."""
+
+    def __init__(
+        self,
+        output_refs: typing.Dict[str, ray.ObjectRef],
+        done_ref: ray.ObjectRef,
+        overrides: typing.Dict[str, typing.Any],
+    ):
+        super(ObjectRefTaskFuture, self).__init__(done_ref.future())
+        self.output_refs = output_refs
+        self.overrides = overrides
+
+    def get_result(self):
+        if not self.future.done():
+            return None
+        self.future.result()  # raises if the task failed
+        return {
+            **self.overrides,
+            **{name: ObjectRefResult(ref) for name, ref in self.output_refs.items()},
+        }
+
+
 class RayTaskExecutor(executors.TaskExecutor):
     """Task executor using Ray for the new task-based execution mechanism in Hamilton.
     This is still experimental, so the API might change.
+
+    By default, the results of tasks are kept in Ray's object store, and passed from there to the
+    tasks that depend on them -- so that large intermediate results don't go through the driver.
+    Only the results that are needed locally (final outputs, inputs to Collect[] and Parallelizable[]
+    nodes, which run on the driver) are fetched.
     """
 
     def __init__(
@@ -242,6 +308,7 @@ class RayTaskExecutor(executors.TaskExecutor):
         num_cpus: int = None,
         ray_init_config: typing.Dict[str, typing.Any] = None,
         skip_init: bool = False,
+        pass_object_refs: bool = True,
     ):
         """Creates a ray task executor. Note this will likely take in more parameters. This is
         experimental, so the API will likely change, although we will do our best to make it
@@ -250,10 +317,14 @@ class RayTaskExecutor(executors.TaskExecutor):
         :param num_cpus: Number of cores to use for initialization, passed directly to ray.init. Defaults to all cores.
         :param ray_init_config: General configuration to pass to ray.init. Defaults to None.
         :param skip_init: Skips ray init if you already have Ray initialized. Default is False.
+        :param pass_object_refs: Whether to keep task results in the object store, passing them to
+            dependent tasks from there. If False, all results are fetched by the driver, and sent
+            back to the tasks that need them. Default is True.
         """
         self.num_cpus = num_cpus
         self.ray_init_config = ray_init_config if ray_init_config else {}
         self.skip_init = skip_init
+        self.pass_object_refs = pass_object_refs
 
     def init(self):
         if self.skip_init:
@@ -273,9 +344,36 @@ class RayTaskExecutor(executors.TaskExecutor):
         :param task: Task to wrap
         :return: A future
         """
-
-        return executors.TaskFutureWrappingPythonFuture(
-            ray.remote(executors.base_execute_task).remote(task=task).future()
+        if not self.pass_object_refs:
+            return executors.TaskFutureWrappingPythonFuture(
+                ray.remote(executors.base_execute_task).remote(task=task).future()
+            )
+        # Inputs in the object store are passed as ObjectRefs, which Ray resolves in the worker
+        refs = {
+            key: value.ref
+            for key, value in task.dynamic_inputs.items()
+            if isinstance(value, ObjectRefResult)
+        }
+        task = dataclasses.replace(
+            task,
+            dynamic_inputs={
+                key: value for key, value in task.dynamic_inputs.items() if key not in refs
+            },
+        )
+        output_names = list(task.outputs_to_compute)
+        # One return per output, plus one to wait on -- the driver owns them all, so they outlive
+        # the worker
+        returned_refs = (
+            ray.remote(execute_task_with_object_refs)
+            .options(num_returns=len(output_names) + 1)
+            .remote(task, output_names, list(refs), *refs.values())
+        )
+        if len(output_names) == 0:
+            returned_refs = [returned_refs]
+        return ObjectRefTaskFuture(
+            dict(zip(output_names, returned_refs[:-1])),
+            returned_refs[-1],
+            executors.get_task_overrides(task),
         )
 
     def can_submit_task(self) -> bool:
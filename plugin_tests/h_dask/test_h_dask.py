@@ -1,3 +1,5 @@
+import operator
+import pathlib
 import typing
 
 import dask.dataframe as dd
@@ -7,15 +9,18 @@ import pytest
 from dask.delayed import delayed
 from distributed import Client
 
-from hamilton import driver
+from hamilton import ad_hoc_utils, driver
+from hamilton.execution.grouping import GroupNodesIndividually
+from hamilton.function_modifiers.metadata import dask_submit_options
 from hamilton.plugins import h_dask
 
 from .resources import example_module, smoke_screen_module
+from .resources.dynamic_parallelism import no_parallel, parallel_large_results
 
 
 @pytest.fixture(scope="session")
 def client():
-    with Client(set_as_default=False).as_current() as client:
+    with Client(set_as_default=False) as client, client.as_current():
         yield client
 
 
@@ -304,3 +309,104 @@ def test_DDFR_build_result_dd_scalar(client):
     actual_pdf = actual.compute().convert_dtypes(dtype_backend="pyarrow")
     expected_pdf = expected.convert_dtypes(dtype_backend="pyarrow")
     pd.testing.assert_frame_equal(actual_pdf, expected_pdf)
+
+
+def test_parse_dask_submit_options_from_tags():
+    tags = {
+        "dask_submit.resources": '{"GPU": 1}',
+        "dask_submit.priority": "10",
+        "another_tag": "another_value",
+    }
+    assert h_dask.parse_dask_submit_options_from_tags(tags) == {
+        "resources": {"GPU": 1},
+        "priority": 10,
+    }
+
+
+def test_merge_dask_submit_options():
+    assert h_dask.merge_dask_submit_options(
+        {"resources": {"GPU": 1, "MEMORY": 4}, "priority": 1, "workers": ["a"]},
+        {},
+        {"resources": {"MEMORY": 2, "DISK": 1}, "priority": 5, "workers": ["b"]},
+    ) == {"resources": {"GPU": 1, "MEMORY": 4, "DISK": 1}, "priority": 5, "workers": ["b"]}
+
+
+@pytest.mark.parametrize("pass_futures", [True, False])
+def test_dask_executor(client, pass_futures):
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(h_dask.DaskExecutor(client=client, pass_futures=pass_futures))
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
+
+
+@pytest.mark.parametrize("pass_futures", [True, False])
+def test_dask_executor_parallel(client, pass_futures):
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_large_results)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(h_dask.DaskExecutor(client=client, pass_futures=pass_futures))
+        .build()
+    )
+    res = dr.execute(["total"], inputs={"base": np.ones(10_000), "number_of_chunks": 4})
+    assert res == {"total": 60_000.0}
+
+
+def test_dask_executor_submits_one_dask_task_per_task(client, monkeypatch):
+    """Results are referred to by the futures of the tasks that computed them, so no dask tasks are
+    submitted to pick them out -- except for the results the controller needs."""
+    submitted = []
+    submit = client.submit
+
+    def tracking_submit(func, *args, **kwargs):
+        submitted.append(func)
+        return submit(func, *args, **kwargs)
+
+    monkeypatch.setattr(client, "submit", tracking_submit)
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(h_dask.DaskExecutor(client=client))
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
+    number_of_tasks = len(dr.graph.get_upstream_nodes(["final"])[0])  # one node per task
+    assert submitted.count(h_dask.execute_task_with_futures) == number_of_tasks
+    # only the requested output is picked out of the results of its task
+    assert submitted.count(operator.getitem) == 1
+    assert len(submitted) == number_of_tasks + 1
+
+
+def test_dask_future_result_resolves_only_its_key(client, monkeypatch):
+    future = client.submit(lambda: {"small": 1, "large": np.ones(1_000_000)})
+    monkeypatch.setattr(
+        future, "result", lambda *args, **kwargs: pytest.fail("fetched all the results")
+    )
+    assert h_dask.DaskFutureResult(future, "small").resolve() == 1
+
+
+def test_dask_executor_submit_options(client, tmp_path):
+    @dask_submit_options(retries=1)
+    def flaky(attempts_dir: str) -> int:
+        attempts = len(list(pathlib.Path(attempts_dir).iterdir()))
+        (pathlib.Path(attempts_dir) / str(attempts)).touch()
+        if attempts == 0:
+            raise ValueError("First attempt fails")
+        return attempts
+
+    dr = (
+        driver.Builder()
+        .with_modules(ad_hoc_utils.create_temporary_module(flaky))
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(h_dask.DaskExecutor(client=client))
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["flaky"], inputs={"attempts_dir": str(tmp_path)}) == {"flaky": 1}
@@ -1,4 +1,10 @@
 from hamilton import telemetry
 
+from tests.conftest import (  # noqa: F401 -- benchmarks only run with --run-benchmarks
+    pytest_addoption,
+    pytest_collection_modifyitems,
+    pytest_configure,
+)
+
 # disable telemetry for all tests!
 telemetry.disable_telemetry()
@@ -1,11 +1,17 @@
+import statistics
+import time
+
+import numpy as np
 import pandas as pd
 import pytest
 import ray
 
 from hamilton import base, driver
+from hamilton.execution.grouping import GroupNodesIndividually
 from hamilton.plugins import h_ray
 
 from .resources import example_module, smoke_screen_module
+from .resources.dynamic_parallelism import large_chain, no_parallel, parallel_large_results
 
 """
 For reference https://docs.ray.io/en/latest/auto_examples/testing-tips.html
@@ -70,3 +76,84 @@ def test_smoke_screen_module(init):
     assert abs(df["neutral_net_acquisition_cost"].mean() - 0.405582) < epsilon
     assert abs(df["optimistic_net_acquisition_cost"].mean() - 0.399363) < epsilon
     assert df["series_with_start_date_end_date"].iloc[0] == "date_20200101_date_20220801"
+
+
+@pytest.mark.parametrize("pass_object_refs", [True, False])
+def test_ray_task_executor(init, pass_object_refs):
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(
+            h_ray.RayTaskExecutor(skip_init=True, pass_object_refs=pass_object_refs)
+        )
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
+
+
+@pytest.mark.parametrize("pass_object_refs", [True, False])
+def test_ray_task_executor_parallel(init, pass_object_refs):
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_large_results)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(
+            h_ray.RayTaskExecutor(skip_init=True, pass_object_refs=pass_object_refs)
+        )
+        .build()
+    )
+    res = dr.execute(["total"], inputs={"base": np.ones(10_000), "number_of_chunks": 4})
+    assert res == {"total": 60_000.0}
+
+
+def _large_chain_driver(pass_object_refs: bool) -> driver.Driver:
+    return (
+        driver.Builder()
+        .with_modules(large_chain)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(
+            h_ray.RayTaskExecutor(skip_init=True, pass_object_refs=pass_object_refs)
+        )
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+
+
+def test_ray_task_executor_object_refs_stay_in_object_store(init, monkeypatch):
+    """Intermediate results go from task to task through the object store -- the driver only fetches
+    the final output."""
+    fetched = []
+    resolve = h_ray.ObjectRefResult.resolve
+
+    def tracking_resolve(self):
+        value = resolve(self)
+        fetched.append(type(value))
+        return value
+
+    monkeypatch.setattr(h_ray.ObjectRefResult, "resolve", tracking_resolve)
+    dr = _large_chain_driver(pass_object_refs=True)
+    assert dr.execute(["large_total"], inputs={"size": 1_000}) == {"large_total": 6_000.0}
+    assert fetched == [float]
+
+
+def _time_large_chain(pass_object_refs: bool, size: int) -> float:
+    dr = _large_chain_driver(pass_object_refs)
+    t0 = time.perf_counter()
+    assert dr.execute(["large_total"], inputs={"size": size}) == {"large_total": size * 6.0}
+    return time.perf_counter() - t0
+
+
+@pytest.mark.benchmark
+def test_ray_task_executor_object_refs_faster_than_round_trips(init):
+    """Benchmarks a chain of tasks passing large arrays. With object refs, they go from task to
+    task through the object store -- otherwise each makes a round trip through the driver. Timings
+    are noisy (the first large run of each is often several times slower), so we compare medians.
+    Locally (1 CPU), the medians were ~0.3s with object refs, ~0.9s without."""
+    _time_large_chain(True, 1_000)  # warm up
+    timings = {True: [], False: []}
+    for _ in range(5):
+        for pass_object_refs in (False, True):
+            timings[pass_object_refs].append(_time_large_chain(pass_object_refs, 5_000_000))
+    assert statistics.median(timings[True]) < statistics.median(timings[False])
@@ -0,0 +1,217 @@
+import concurrent.futures
+import os
+import threading
+
+from hamilton import ad_hoc_utils, driver
+from hamilton.caching.adapter import CacheMetricsHook, SingleFlightAdapter, TieredCacheAdapter
+from hamilton.execution.executors import MultiProcessingExecutor, MultiThreadingExecutor
+
+from tests.resources.dynamic_parallelism import parallel_shared_cache
+
+calls = []
+
+
+def raw(external_input: int) -> list:
+    calls.append("raw")
+    return list(range(external_input))
+
+
+def doubled(raw: list) -> list:
+    calls.append("doubled")
+    return [x * 2 for x in raw]
+
+
+def nothing(raw: list) -> None:
+    calls.append("nothing")
+
+
+def _driver(adapter: TieredCacheAdapter) -> driver.Driver:
+    module = ad_hoc_utils.create_temporary_module(raw, doubled, nothing)
+    return driver.Builder().with_modules(module).with_adapters(adapter).build()
+
+
+def test_tiered_cache_adapter_memory_hit(tmp_path):
+    calls.clear()
+    dr = _driver(TieredCacheAdapter(path=str(tmp_path)))
+    for _ in range(2):
+        results = dr.execute(["doubled", "nothing"], inputs={"external_input": 3})
+        assert results["doubled"] == [0, 2, 4]
+        assert results["nothing"] is None
+    assert calls == ["raw", "doubled", "nothing"]
+
+
+def test_tiered_cache_adapter_disk_hit(tmp_path):
+    calls.clear()
+    _driver(TieredCacheAdapter(path=str(tmp_path))).execute(
+        ["doubled"], inputs={"external_input": 3}
+    )
+    adapter = TieredCacheAdapter(path=str(tmp_path))
+    results = _driver(adapter).execute(["doubled"], inputs={"external_input": 3})
+    assert results["doubled"] == [0, 2, 4]
+    assert calls == ["raw", "doubled"]
+    # promoted to memory -- raw is upstream of a hit, so it isn't even loaded
+    assert set(adapter.memory.sizes_by_node()) == {"doubled"}
+
+
+def test_tiered_cache_adapter_cache_vars(tmp_path):
+    calls.clear()
+    dr = _driver(TieredCacheAdapter(path=None, cache_vars=["raw"]))
+    dr.execute(["doubled"], inputs={"external_input": 3})
+    dr.execute(["doubled"], inputs={"external_input": 3})
+    assert calls == ["raw", "doubled", "doubled"]
+
+
+def test_tiered_cache_adapter_bounded(tmp_path):
+    calls.clear()
+    adapter = TieredCacheAdapter(path=str(tmp_path), max_memory_entries=1, max_disk_bytes=1000)
+    dr = _driver(adapter)
+    for i in range(20):
+        dr.execute(["doubled"], inputs={"external_input": i})
+    assert len(adapter.memory) == 1
+    assert adapter.disk.size_bytes <= 1000
+    assert set(adapter.disk.sizes_by_node()) <= {"raw", "doubled"}
+
+
+def test_tiered_cache_adapter_shared_between_processes(tmp_path):
+    """Workers all miss the same result at once -- only one computes it, the others wait."""
+    log_dir = tmp_path / "log"
+    log_dir.mkdir()
+    adapter = TieredCacheAdapter(path=str(tmp_path / "cache"), cache_vars=["expensive"])
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_shared_cache)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiProcessingExecutor(max_tasks=4))
+        .with_adapters(adapter)
+        .build()
+    )
+    inputs = {"number_of_items": 4, "log_dir": str(log_dir)}
+    assert dr.execute(["total"], inputs=inputs) == {"total": 56}
+    assert len(os.listdir(log_dir)) == 1
+    assert set(adapter.disk.sizes_by_node()) == {"expensive"}
+
+
+def test_tiered_cache_adapter_shared_between_threads(tmp_path):
+    log_dir = tmp_path / "log"
+    log_dir.mkdir()
+    adapter = TieredCacheAdapter(path=None, cache_vars=["expensive"])
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_shared_cache)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=4))
+        .with_adapters(adapter)
+        .build()
+    )
+    inputs = {"number_of_items": 4, "log_dir": str(log_dir)}
+    assert dr.execute(["total"], inputs=inputs) == {"total": 56}
+    assert len(os.listdir(log_dir)) == 1
+    assert len(adapter.in_flight) == 0
+
+
+def test_single_flight_adapter(tmp_path):
+    """Identical branches run concurrently, only one computes -- nothing is cached afterwards."""
+    log_dir = tmp_path / "log"
+    log_dir.mkdir()
+    adapter = SingleFlightAdapter()
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_shared_cache)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=4))
+        .with_adapters(adapter)
+        .build()
+    )
+    inputs = {"number_of_items": 4, "log_dir": str(log_dir)}
+    assert dr.execute(["total"], inputs=inputs) == {"total": 56}
+    assert len(os.listdir(log_dir)) == 1
+    assert dr.execute(["total"], inputs=inputs) == {"total": 56}
+    assert len(os.listdir(log_dir)) == 2
+    assert adapter.fingerprints == {}
+    assert len(adapter.in_flight) == 0
+
+
+def test_tiered_cache_adapter_metrics(tmp_path):
+    exported = []
+    adapter = TieredCacheAdapter(path=str(tmp_path))
+    export = CacheMetricsHook(adapter.metrics, export=lambda *args: exported.append(args))
+    module = ad_hoc_utils.create_temporary_module(raw, doubled, nothing)
+    dr = driver.Builder().with_modules(module).with_adapters(adapter, export).build()
+
+    dr.execute(["doubled"], inputs={"external_input": 3})
+    cold = adapter.metrics.by_node()
+    assert {name: stats.misses for name, stats in cold.items()} == {"raw": 1, "doubled": 1}
+    assert cold["doubled"].bytes_written == adapter.disk.sizes_by_node()["doubled"]
+
+    dr.execute(["doubled"], inputs={"external_input": 3})
+    warm = adapter.metrics.summary()
+    assert (warm.hits, warm.misses, warm.bytes_read) == (1, 0, 0)  # from memory
+
+    second = TieredCacheAdapter(path=str(tmp_path), metrics=adapter.metrics)
+    _driver(second).execute(["doubled"], inputs={"external_input": 3})
+    from_disk = adapter.metrics.by_node()["doubled"]
+    assert from_disk.bytes_read == adapter.disk.sizes_by_node()["doubled"]
+    assert from_disk.time_saved != 0.0  # estimated from the first run
+
+    assert [run_id for run_id, _ in exported] == adapter.metrics.run_ids[:2]
+    assert exported[0][1]["summary"]["misses"] == 2
+
+
+def test_tiered_cache_adapter_concurrent_runs(tmp_path):
+    """Runs sharing the adapter keep their own fingerprints, so they can't read each other's."""
+    both_running = threading.Barrier(2, timeout=5)
+
+    def a(x: int) -> int:
+        both_running.wait()
+        return x
+
+    def b(a: int) -> int:
+        return a * 10
+
+    adapter = TieredCacheAdapter(path=str(tmp_path))
+    dr = (
+        driver.Builder()
+        .with_modules(ad_hoc_utils.create_temporary_module(a, b))
+        .with_adapters(adapter)
+        .build()
+    )
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda x: dr.execute(["b"], inputs={"x": x})["b"], [1, 2]))
+    assert results == [10, 20]
+    # and so are their metrics
+    assert len(adapter.metrics.run_ids) == 2
+    for run_id in adapter.metrics.run_ids:
+        assert {name: stats.misses for name, stats in adapter.metrics.by_node(run_id).items()} == {
+            "a": 1,
+            "b": 1,
+        }
+
+
+def test_tiered_cache_adapter_concurrent_runs_with_cache_hits(tmp_path):
+    """A run whose keys are loaded before execution (see do_load_cached_results) while another is
+    executing doesn't change the keys of the one executing."""
+    a_started, release_a = threading.Event(), threading.Event()
+
+    def a(x: int) -> int:
+        if x == 1:
+            a_started.set()
+            release_a.wait(timeout=5)
+        return x
+
+    def b(a: int) -> int:
+        return a * 10
+
+    dr = (
+        driver.Builder()
+        .with_modules(ad_hoc_utils.create_temporary_module(a, b))
+        .with_adapters(TieredCacheAdapter(path=str(tmp_path)))
+        .build()
+    )
+    assert dr.execute(["b"], inputs={"x": 2}) == {"b": 20}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(dr.execute, ["b"], inputs={"x": 1})
+        assert a_started.wait(timeout=5)
+        # Loaded from the cache while the first run is executing a
+        assert dr.execute(["b"], inputs={"x": 2}) == {"b": 20}
+        release_a.set()
+        assert first.result() == {"b": 10}
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hamilton.caching import fingerprinting
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        1,
+        1.5,
+        "a",
+        b"a",
+        [1, "a", None],
+        (1, 2),
+        {"a": 1, "b": [1, 2]},
+        {1, 2, 3},
+        {"a", "b", "c"},
+        [[1, 2], {"a": np.arange(3)}],
+        {1: "a", "b": 2},  # keys that can't be compared
+        np.arange(10),
+        np.array(["2020-01-01"], dtype="datetime64[D]"),
+        np.array([{"a": 1}], dtype=object),
+        pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+        pd.Series([1.0, 2.0], name="a"),
+        pd.DataFrame({"a": [[1], [2]]}),  # unhashable cells
+    ],
+)
+def test_hash_value_is_deterministic(value):
+    assert fingerprinting.hash_value(value) == fingerprinting.hash_value(value)
+
+
+@pytest.mark.parametrize(
+    "left,right",
+    [
+        (1, "1"),
+        (1, 1.0),
+        ([1, 2], (1, 2)),
+        ([1, 2], [2, 1]),
+        ([[1, 2]], [(1, 2)]),
+        ([np.arange(2)], [np.arange(3)]),
+        ({"a": 1}, {"a": 2}),
+        (b"a", "a"),
+        (np.arange(4), np.arange(4).reshape(2, 2)),
+        (np.arange(4, dtype="int64"), np.arange(4, dtype="float64")),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"b": [1, 2]})),
+        (pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [1, 2]}, index=[1, 2])),
+        (pd.Series([1, 2], name="a"), pd.Series([1, 2], name="b")),
+    ],
+)
+def test_hash_value_distinguishes(left, right):
+    assert fingerprinting.hash_value(left) != fingerprinting.hash_value(right)
+
+
+def test_hash_value_mapping_ignores_insertion_order():
+    assert fingerprinting.hash_value({"a": 1, "b": 2}) == fingerprinting.hash_value(
+        {"b": 2, "a": 1}
+    )
+
+
+def test_hash_value_by_content():
+    df = pd.DataFrame({"a": np.arange(100), "b": np.arange(100) * 0.5})
+    assert fingerprinting.hash_value(df) == fingerprinting.hash_value(df.copy())
+    arr = np.arange(100)
+    assert fingerprinting.hash_value(arr[::2]) == fingerprinting.hash_value(arr[::2].copy())
+
+
+def test_hash_value_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    assert fingerprinting.hash_value(table) == fingerprinting.hash_value(
+        pa.table({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    )
+    array = pa.array([1, 2, 3])
+    assert fingerprinting.hash_value(array.slice(1)) != fingerprinting.hash_value(array)
+
+
+def test_combine_is_order_sensitive():
+    assert fingerprinting.combine("a", "b") != fingerprinting.combine("b", "a")
+
+
+def test_hash_value_containers_by_content():
+    assert fingerprinting.hash_value({"b", "a"}) == fingerprinting.hash_value({"a", "b"})
+    arr = np.arange(100)
+    assert fingerprinting.hash_value([arr[::2], {"a": 1}]) == fingerprinting.hash_value(
+        [arr[::2].copy(), {"a": 1}]
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [list(range(1_000_000)), {f"key_{i}": i for i in range(200_000)}, set(range(200_000))],
+    ids=["list", "dict", "set"],
+)
+def test_hash_value_large_container_of_primitives_in_one_pass(value, monkeypatch):
+    """Containers of primitives are pickled as a whole, rather than hashing each element."""
+    digests = []
+    sha256 = fingerprinting.hashlib.sha256
+
+    def counting_sha256(*args):
+        digests.append(args)
+        return sha256(*args)
+
+    monkeypatch.setattr(fingerprinting.hashlib, "sha256", counting_sha256)
+    fingerprinting.hash_value(value)
+    assert len(digests) == 1
@@ -0,0 +1,57 @@
+import pickle
+
+from hamilton.caching.metrics import CacheMetrics, CacheStats
+
+
+def test_cache_stats():
+    stats = CacheStats(hits=1, misses=3, bytes_read=10) + CacheStats(hits=2, bytes_read=5)
+    assert stats == CacheStats(hits=3, misses=3, bytes_read=15)
+    assert stats.hit_rate == 0.5
+    assert CacheStats().hit_rate is None
+    assert stats.to_dict()["hit_rate"] == 0.5
+
+
+def test_cache_metrics_by_run_and_node():
+    metrics = CacheMetrics()
+    metrics.record_miss("run-1", "a", compute_time=2.0)
+    metrics.record_store("run-1", "a", store_time=0.1, bytes_written=100)
+    metrics.record_miss("run-1", "b", compute_time=1.0)
+    metrics.record_hit("run-2", "a", load_time=0.5, bytes_read=100)
+    metrics.record_hit("run-2", "a", load_time=0.5, bytes_read=100)
+    metrics.record_hit("run-2", "c", load_time=0.1)
+
+    assert metrics.run_ids == ["run-1", "run-2"]
+    assert metrics.by_node("run-1") == {
+        "a": CacheStats(misses=1, bytes_written=100, store_time=0.1, compute_time=2.0),
+        "b": CacheStats(misses=1, compute_time=1.0),
+    }
+    # defaults to the last run -- c was never computed, so saves nothing
+    assert metrics.by_node() == {
+        "a": CacheStats(hits=2, bytes_read=200, load_time=1.0, time_saved=3.0),
+        "c": CacheStats(hits=1, load_time=0.1),
+    }
+    assert metrics.summary().hits == 3
+    assert metrics.to_dict("run-1")["summary"]["misses"] == 2
+    assert metrics.by_node("unknown") == {}
+
+
+def test_cache_metrics_max_runs():
+    metrics = CacheMetrics(max_runs=2)
+    for run_id in ["run-1", "run-2", "run-3"]:
+        metrics.record_miss(run_id, "a", compute_time=1.0)
+    assert metrics.run_ids == ["run-2", "run-3"]
+    # the compute time estimates are kept
+    assert metrics.estimated_compute_time("a") == 1.0
+    metrics.clear()
+    assert metrics.run_ids == []
+    assert metrics.estimated_compute_time("a") is None
+
+
+def test_cache_metrics_copies_start_empty():
+    metrics = CacheMetrics(max_runs=5)
+    metrics.record_miss("run-1", "a", compute_time=1.0)
+    copy = pickle.loads(pickle.dumps(metrics))
+    assert copy.max_runs == 5
+    assert copy.run_ids == []
+    copy.record_hit("run-1", "a", load_time=0.1)
+    assert metrics.by_node()["a"].hits == 0
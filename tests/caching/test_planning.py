@@ -0,0 +1,200 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from hamilton import ad_hoc_utils, driver, graph
+from hamilton.caching import planning
+from hamilton.caching.stores import MISSING
+from hamilton.htypes import Collect, Parallelizable
+from hamilton.lifecycle import base as lifecycle_base
+from hamilton.lifecycle.default import CacheAdapter
+
+calls = []
+
+
+def raw(external_input: int) -> list:
+    calls.append("raw")
+    return list(range(external_input))
+
+
+def features(raw: list) -> list:
+    calls.append("features")
+    return [x * 2 for x in raw]
+
+
+def model(features: list) -> int:
+    calls.append("model")
+    return sum(features)
+
+
+def report(model: int, raw: list) -> str:
+    calls.append("report")
+    return f"{model} from {len(raw)} rows"
+
+
+def _graph() -> graph.FunctionGraph:
+    module = ad_hoc_utils.create_temporary_module(raw, features, model, report)
+    return graph.FunctionGraph.from_modules(module, config={})
+
+
+def test_get_cache_keys_match_execution(tmp_path):
+    cache_path = str(tmp_path / "cache")
+    adapter = CacheAdapter(cache_path=cache_path)
+    module = ad_hoc_utils.create_temporary_module(raw, features, model, report)
+    dr = driver.Builder().with_modules(module).with_adapters(adapter).build()
+    dr.execute(["report"], inputs={"external_input": 3})
+    runtime_keys = {name: key for (_, name), key in adapter.fingerprints.items()}
+
+    keys = planning.get_cache_keys(
+        _graph(), ["report"], {"external_input": 3}, {}, ["raw", "features", "model", "report"]
+    )
+    assert keys["external_input"] is not None
+    assert {name: keys[name] for name in runtime_keys} == runtime_keys
+
+
+def test_get_cache_keys_stop_at_uncached_nodes():
+    keys = planning.get_cache_keys(
+        _graph(), ["report"], {"external_input": 3}, {}, ["raw", "model", "report"]
+    )
+    # features is fingerprinted by value at runtime, so nothing downstream of it has a key
+    assert set(keys) == {"external_input", "raw"}
+
+
+def test_load_cached_results_prunes_upstream_of_hits():
+    fg = _graph()
+    looked_up = []
+
+    def load(node_):
+        looked_up.append(node_.name)
+        return "cached" if node_.name == "model" else MISSING
+
+    results = planning.load_cached_results(fg, ["report"], {}, load)
+    assert results == {"model": "cached"}
+    # features is only consumed by model (a hit), so it's never looked up
+    assert sorted(looked_up) == ["model", "raw", "report"]
+
+
+def test_warm_run_only_loads_final_results(tmp_path):
+    calls.clear()
+    cache_path = str(tmp_path / "cache")
+    module = ad_hoc_utils.create_temporary_module(raw, features, model, report)
+    dr = driver.Builder().with_modules(module).with_adapters(CacheAdapter(cache_path=cache_path))
+    assert dr.build().execute(["report"], inputs={"external_input": 3})["report"] == "6 from 3 rows"
+    assert calls == ["raw", "features", "model", "report"]
+
+    calls.clear()
+    adapter = CacheAdapter(cache_path=cache_path)
+    dr = driver.Builder().with_modules(module).with_adapters(adapter).build()
+    assert dr.execute(["report"], inputs={"external_input": 3})["report"] == "6 from 3 rows"
+    assert calls == []
+    assert adapter.used_cache_keys == {}
+
+    # model's input changed, but raw is still a hit
+    calls.clear()
+    assert dr.execute(["report"], inputs={"external_input": 3}, overrides={"features": [1]}) == {
+        "report": "1 from 3 rows"
+    }
+    assert calls == ["model", "report"]
+
+
+def test_warm_run_only_loads_final_results_task_based(tmp_path):
+    calls.clear()
+    cache_path = str(tmp_path / "cache")
+    module = ad_hoc_utils.create_temporary_module(raw, features, model, report)
+
+    def _driver(adapter: CacheAdapter) -> driver.Driver:
+        return (
+            driver.Builder()
+            .with_modules(module)
+            .with_adapters(adapter)
+            .enable_dynamic_execution(allow_experimental_mode=True)
+            .build()
+        )
+
+    dr = _driver(CacheAdapter(cache_path=cache_path))
+    assert dr.execute(["report"], inputs={"external_input": 3})["report"] == "6 from 3 rows"
+    assert calls == ["raw", "features", "model", "report"]
+
+    calls.clear()
+    dr = _driver(CacheAdapter(cache_path=cache_path))
+    assert dr.execute(["report"], inputs={"external_input": 3})["report"] == "6 from 3 rows"
+    assert calls == []
+
+
+def test_cache_keys_reuse_upstream_node_resolution(tmp_path):
+    module = ad_hoc_utils.create_temporary_module(raw, features, model, report)
+    adapter = CacheAdapter(cache_path=str(tmp_path / "cache"))
+    dr = driver.Builder().with_modules(module).with_adapters(adapter).build()
+    traversals = []
+    get_upstream_nodes = dr.graph.get_upstream_nodes
+
+    def _get_upstream_nodes(*args, **kwargs):
+        traversals.append(args)
+        return get_upstream_nodes(*args, **kwargs)
+
+    dr.graph.get_upstream_nodes = _get_upstream_nodes
+    for _ in range(3):
+        assert dr.execute(["report"], inputs={"external_input": 3})["report"] == "6 from 3 rows"
+    # resolved once by the driver, and planning the cache lookups reuses that
+    assert len(traversals) == 1
+
+
+def items(external_input: int) -> Parallelizable[int]:
+    calls.append("items")
+    for i in range(external_input):
+        yield i
+
+
+def doubled(items: int) -> int:
+    calls.append("doubled")
+    return items * 2
+
+
+def total(doubled: Collect[int]) -> int:
+    calls.append("total")
+    return sum(doubled)
+
+
+def reported(total: int) -> str:
+    calls.append("reported")
+    return f"total={total}"
+
+
+class _FixedResults(lifecycle_base.BaseDoLoadCachedResults):
+    def __init__(self, results: Dict[str, Any]):
+        self.results = results
+
+    def do_load_cached_results(
+        self,
+        *,
+        run_id: str,
+        graph: graph.FunctionGraph,
+        final_vars: List[str],
+        inputs: Dict[str, Any],
+        overrides: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        return self.results
+
+
+@pytest.mark.parametrize(
+    "loaded,expected_calls",
+    [
+        ({"total": 100}, ["reported"]),
+        # per-item results can't stand in for the whole block
+        ({"doubled": 100}, ["items", "doubled", "doubled", "doubled", "total", "reported"]),
+        ({"items": 100}, ["items", "doubled", "doubled", "doubled", "total", "reported"]),
+    ],
+)
+def test_task_based_execution_loads_cached_results(loaded, expected_calls):
+    calls.clear()
+    module = ad_hoc_utils.create_temporary_module(items, doubled, total, reported)
+    dr = (
+        driver.Builder()
+        .with_modules(module)
+        .with_adapters(_FixedResults(loaded))
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .build()
+    )
+    expected = "total=100" if "total" in loaded else "total=6"
+    assert dr.execute(["reported"], inputs={"external_input": 3}) == {"reported": expected}
+    assert calls == expected_calls
@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hamilton.caching import serialization
+
+
+@pytest.mark.parametrize(
+    "value,format_",
+    [
+        (np.arange(10), "npy"),
+        (np.array([{"a": 1}], dtype=object), "pickle"),
+        (pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}), "feather"),
+        (pd.DataFrame({1: [1]}, index=pd.Index(["r"], name="i")), "feather"),
+        (pd.DataFrame({"a": [1, "x"]}), "pickle"),  # mixed types, can't be written to arrow
+        ({"a": 1}, "pickle"),
+        (None, "pickle"),
+    ],
+)
+def test_save_load_round_trip(value, format_, tmp_path):
+    pytest.importorskip("pyarrow")
+    stored = serialization.save(value, os.path.join(str(tmp_path), "result"))
+    assert stored.format == format_
+    assert os.listdir(str(tmp_path)) == [f"result.{format_}"]
+    loaded = serialization.load(stored)
+    if isinstance(value, pd.DataFrame):
+        pd.testing.assert_frame_equal(loaded, value)
+    elif isinstance(value, np.ndarray):
+        np.testing.assert_array_equal(loaded, value)
+    else:
+        assert loaded == value
+
+
+def test_numpy_is_memory_mapped(tmp_path):
+    stored = serialization.save(np.arange(10), os.path.join(str(tmp_path), "result"))
+    loaded = serialization.load(stored)
+    assert isinstance(loaded, np.memmap)
+    loaded[0] = 100  # copy-on-write
+    np.testing.assert_array_equal(serialization.load(stored), np.arange(10))
+
+
+def test_get_formats():
+    assert serialization.get_formats(dict) == ("pickle",)
+    assert serialization.get_formats(np.ndarray) == ("npy", "pickle")
+    assert serialization.get_formats(np.ndarray, ("parquet",)) == ("pickle",)
@@ -0,0 +1,50 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hamilton.caching.singleflight import SingleFlight
+
+
+def test_single_flight_deduplicates_concurrent_calls():
+    in_flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: in_flight.do("key", compute), range(8)))
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    assert len(in_flight) == 0
+
+
+def test_single_flight_distinct_keys():
+    in_flight = SingleFlight()
+    assert in_flight.do("a", lambda: 1) == 1
+    assert in_flight.do("b", lambda: 2) == 2
+    # nothing is kept once completed
+    assert in_flight.do("a", lambda: 3) == 3
+
+
+def test_single_flight_shares_exceptions():
+    in_flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(in_flight.do, "key", fail)
+        started.wait()
+        follower = pool.submit(in_flight.do, "key", lambda: "not called")
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+    assert len(in_flight) == 0
@@ -0,0 +1,235 @@
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from hamilton.caching.stores import MISSING, DiskStore, MemoryStore
+
+VALUE = b"x" * 5  # 20 bytes, pickled
+
+
+def test_memory_store_get_set():
+    store = MemoryStore()
+    assert store.get("a") is MISSING
+    store.set("a", None, "node_a", 10)
+    assert store.get("a") is None
+    assert "a" in store
+    assert store.size_bytes == 10
+
+
+def test_memory_store_lru_eviction():
+    store = MemoryStore(max_size_bytes=30, eviction_policy="lru")
+    store.set("a", 1, "node_a", 10)
+    store.set("b", 2, "node_b", 10)
+    store.set("c", 3, "node_c", 10)
+    store.get("a")
+    store.set("d", 4, "node_d", 10)
+    assert "b" not in store
+    assert {"a", "c", "d"} == {key for key in ["a", "b", "c", "d"] if key in store}
+    assert store.size_bytes == 30
+
+
+def test_memory_store_lfu_eviction():
+    store = MemoryStore(max_entries=2, eviction_policy="lfu")
+    store.set("a", 1, "node_a", 10)
+    store.set("b", 2, "node_b", 10)
+    store.get("a")
+    store.get("a")
+    store.get("b")
+    store.set("c", 3, "node_c", 10)
+    assert "b" not in store
+    assert "a" in store and "c" in store
+
+
+def test_memory_store_ttl():
+    store = MemoryStore(max_entries=2, eviction_policy="ttl", ttl=0.05)
+    store.set("a", 1, "node_a", 10)
+    time.sleep(0.1)
+    assert store.get("a") is MISSING
+    store.set("b", 2, "node_b", 10)
+    store.get("b")
+    store.set("c", 3, "node_c", 10)
+    store.set("d", 4, "node_d", 10)
+    assert "b" not in store  # oldest, even though it was accessed
+
+
+def test_memory_store_does_not_store_oversized_results():
+    store = MemoryStore(max_size_bytes=10)
+    store.set("a", 1, "node_a", 11)
+    assert "a" not in store
+
+
+def test_memory_store_sizes_by_node():
+    store = MemoryStore()
+    store.set("a", 1, "node_a", 10)
+    store.set("b", 2, "node_a", 5)
+    store.set("c", 3, "node_c", 1)
+    assert store.sizes_by_node() == {"node_a": 15, "node_c": 1}
+
+
+def test_memory_store_copies_start_empty():
+    store = MemoryStore(max_entries=2)
+    store.set("a", "data", "node_a", 10)
+    copy = pickle.loads(pickle.dumps(store))
+    assert len(copy) == 0
+    copy.set("a", "data", "node_a", 10)
+    copy.set("b", "data", "node_b", 10)
+    copy.set("c", "data", "node_c", 10)
+    assert len(copy) == 2
+
+
+def test_eviction_policy_validation():
+    with pytest.raises(ValueError):
+        MemoryStore(eviction_policy="fifo")
+    with pytest.raises(ValueError):
+        MemoryStore(eviction_policy="ttl")
+
+
+def test_disk_store_get_set(tmp_path):
+    store = DiskStore(str(tmp_path))
+    assert store.get("abc") is MISSING
+    store.set("abc", {"a": 1}, "node_a")
+    assert store.get("abc") == {"a": 1}
+    # a new store on the same directory sees the same entries
+    assert DiskStore(str(tmp_path)).get("abc") == {"a": 1}
+    store.delete("abc")
+    assert "abc" not in store
+    assert os.listdir(os.path.join(str(tmp_path), "ab")) == []
+
+
+def test_disk_store_stores_by_format(tmp_path):
+    store = DiskStore(str(tmp_path))
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    size = store.set("abc", df, "node_a")
+    assert os.listdir(os.path.join(str(tmp_path), "ab")) == ["abc.feather"]
+    loaded, loaded_size = store.load("abc")
+    pd.testing.assert_frame_equal(loaded, df)
+    assert loaded_size == size == store.sizes_by_node()["node_a"]
+
+
+def test_disk_store_lru_eviction(tmp_path):
+    store = DiskStore(str(tmp_path), max_size_bytes=60, eviction_policy="lru")
+    store.set("aa", VALUE, "node_a")
+    store.set("bb", VALUE, "node_b")
+    store.set("cc", VALUE, "node_c")
+    store.get("aa")
+    store.set("dd", VALUE, "node_d")
+    assert "bb" not in store
+    assert len(store) == 3
+    assert store.size_bytes == 60
+    assert store.sizes_by_node() == {"node_a": 20, "node_c": 20, "node_d": 20}
+
+
+def test_disk_store_lfu_eviction(tmp_path):
+    store = DiskStore(str(tmp_path), max_size_bytes=40, eviction_policy="lfu")
+    store.set("aa", VALUE, "node_a")
+    store.set("bb", VALUE, "node_b")
+    store.get("aa")
+    store.get("aa")
+    store.get("bb")
+    store.set("cc", VALUE, "node_c")
+    assert "bb" not in store
+    assert "aa" in store
+
+
+def test_disk_store_ttl(tmp_path):
+    store = DiskStore(str(tmp_path), eviction_policy="ttl", ttl=0.05)
+    store.set("aa", "data", "node_a")
+    time.sleep(0.1)
+    assert store.get("aa") is MISSING
+    assert len(store) == 0
+
+
+def test_disk_store_is_picklable(tmp_path):
+    store = DiskStore(str(tmp_path))
+    store.set("aa", "data", "node_a")
+    assert pickle.loads(pickle.dumps(store)).get("aa") == "data"
+
+
+def _write_entries(store: DiskStore, prefix: str):
+    for i in range(20):
+        store.set(f"{prefix}{i:02d}", VALUE, prefix)
+
+
+def test_disk_store_shared_between_processes(tmp_path):
+    store = DiskStore(str(tmp_path), max_size_bytes=600)
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_write_entries, args=(store, prefix)) for prefix in "abc"]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert len(store) == 30
+    assert store.size_bytes == 600
+
+
+def test_disk_store_claim(tmp_path):
+    store = DiskStore(str(tmp_path))
+    assert store.claim("aa")
+    # held by another thread
+    claimed = []
+    thread = threading.Thread(target=lambda: claimed.append(store.claim("aa")))
+    thread.start()
+    thread.join()
+    assert claimed == [False]
+    store.set("aa", "data", "node_a")
+    store.release("aa")
+    # stored already
+    assert not store.claim("aa")
+
+
+def test_disk_store_abandoned_claims(tmp_path):
+    store = DiskStore(str(tmp_path))
+    ctx = multiprocessing.get_context("spawn")
+    process = ctx.Process(target=store.claim, args=("aa",))
+    process.start()
+    process.join()
+    # the process that claimed it is gone
+    assert store.claim("aa")
+    store.release("aa")
+
+    store = DiskStore(str(tmp_path), claim_timeout=0.05)
+    thread = threading.Thread(target=store.claim, args=("bb",))
+    thread.start()
+    thread.join()
+    assert not store.claim("bb")
+    time.sleep(0.1)
+    assert store.claim("bb")
+
+
+def test_disk_store_wait(tmp_path):
+    store = DiskStore(str(tmp_path))
+    assert store.wait("aa") == (MISSING, 0)  # not claimed
+
+    def compute(key: str, value: str, store_it: bool):
+        assert store.claim(key)
+        time.sleep(0.1)
+        if store_it:
+            store.set(key, value, "node_a")
+        store.release(key)
+
+    thread = threading.Thread(target=compute, args=("aa", "data", True))
+    thread.start()
+    time.sleep(0.05)
+    value, size = store.wait("aa")
+    thread.join()
+    assert value == "data"
+    assert size > 0
+
+    # the computation failed
+    thread = threading.Thread(target=compute, args=("bb", "data", False))
+    thread.start()
+    time.sleep(0.05)
+    assert store.wait("bb") == (MISSING, 0)
+    thread.join()
+
+    thread = threading.Thread(target=compute, args=("cc", "data", True))
+    thread.start()
+    time.sleep(0.05)
+    assert store.wait("cc", timeout=0.01) == (MISSING, 0)
+    thread.join()
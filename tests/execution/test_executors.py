@@ -1,20 +1,30 @@
+import asyncio
+import dataclasses
 import os
+import threading
 import time
+from typing import Any, List, Set, Tuple
 
 import numpy as np
 import pytest
 
 import hamilton.ad_hoc_utils
 from hamilton import base, driver
+from hamilton.execution import shared_memory_transport, state
 from hamilton.execution.executors import (
+    AsyncioTaskExecutor,
     DefaultExecutionManager,
     MultiProcessingExecutor,
     MultiThreadingExecutor,
     SynchronousLocalTaskExecutor,
+    TaskFuture,
+    TaskFutureWrappingPythonFuture,
+    base_execute_task,
 )
 from hamilton.execution.grouping import (
     GroupByRepeatableBlocks,
     GroupNodesAllAsOne,
+    GroupNodesByCost,
     GroupNodesByLevel,
     GroupNodesIndividually,
     NodeGroupPurpose,
@@ -29,6 +39,7 @@ from tests.resources.dynamic_parallelism import (
     parallel_collect_multiple_arguments,
     parallel_complex,
     parallel_delayed,
+    parallel_large_results,
     parallel_linear_basic,
 )
 
@@ -128,6 +139,29 @@ def test_end_to_end_parallel_execute_group_by_repeatable_blocks(executor_factory
     assert result["final"] == parallel_linear_basic._calc()
 
 
+@pytest.mark.parametrize(
+    "executor_factory",
+    [
+        multi_processing_executor_factory,
+        multi_threading_executor_factory,
+        SynchronousLocalTaskExecutor,
+    ],
+)
+@pytest.mark.parametrize("default_cost", [None, 0.0])
+@pytest.mark.parametrize("module", [no_parallel, parallel_linear_basic])
+def test_end_to_end_execute_group_by_cost(executor_factory, default_cost, module):
+    dr = (
+        driver.Builder()
+        .with_modules(module)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor_factory())
+        .with_grouping_strategy(GroupNodesByCost(default_cost=default_cost))
+        .build()
+    )
+    result = dr.execute(["final"])
+    assert result["final"] == module._calc()
+
+
 @pytest.mark.parametrize(
     "executor_factory", [multi_processing_executor_factory, multi_threading_executor_factory]
 )
@@ -347,3 +381,760 @@ def test_parallel_end_to_end_with_empty_list():
     parallel_collect_multiple_arguments._reset_counter()
     res = dr.execute(["final"], overrides={"number_of_steps": 0})
     assert res["final"] == parallel_linear_basic._calc(0)
+
+
+def test_controller_does_not_busy_poll_while_tasks_are_in_flight(monkeypatch):
+    """The scheduler should block on task completion rather than spin, so the controller loop
+    should only wake up when a task completes."""
+    counts = {"wakeups": 0, "completions": 0}
+    get_graph_state = state.ExecutionState.get_graph_state
+    update_task_state = state.ExecutionState.update_task_state
+
+    def _get_graph_state(self):
+        counts["wakeups"] += 1  # checked once per iteration of the controller loop
+        return get_graph_state(self)
+
+    def _update_task_state(self, *args, **kwargs):
+        counts["completions"] += 1
+        return update_task_state(self, *args, **kwargs)
+
+    monkeypatch.setattr(state.ExecutionState, "get_graph_state", _get_graph_state)
+    monkeypatch.setattr(state.ExecutionState, "update_task_state", _update_task_state)
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_delayed)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        # enough room for all the tasks, as tasks waiting for room are polled for
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=10))
+        .with_grouping_strategy(GroupByRepeatableBlocks())
+        .build()
+    )
+    result = dr.execute(["final"], inputs={"delay_seconds": 0.1, "number_of_steps": 10})
+    assert result["final"] == sum(i**2 + i**3 for i in range(10))
+    # at least one task completes per iteration, plus the final check and the log when done
+    assert counts["wakeups"] <= counts["completions"] + 2
+
+
+class _PolledTaskFuture(TaskFuture):
+    """Task future that does not support callbacks, forcing the scheduler to poll"""
+
+    def __init__(self, future):
+        self.future = future
+
+    def get_state(self):
+        return TaskFutureWrappingPythonFuture(self.future).get_state()
+
+    def get_result(self):
+        return TaskFutureWrappingPythonFuture(self.future).get_result()
+
+
+class _PolledExecutor(MultiThreadingExecutor):
+    def submit_task(self, task):
+        future = self.pool.submit(base_execute_task, task)
+        self.active_futures.append(future)
+        return _PolledTaskFuture(future)
+
+
+def test_scheduler_polls_futures_without_callback_support():
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_delayed)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(_PolledExecutor(max_tasks=2))
+        .with_grouping_strategy(GroupByRepeatableBlocks())
+        .build()
+    )
+    result = dr.execute(["final"], inputs={"delay_seconds": 0.01, "number_of_steps": 10})
+    assert result["final"] == sum(i**2 + i**3 for i in range(10))
+
+
+class _TemporarilyFullExecutor(SynchronousLocalTaskExecutor):
+    """Executor whose capacity is taken by something else for the first few submissions"""
+
+    def __init__(self, rejections: int):
+        self.rejections = rejections
+
+    def can_submit_task(self) -> bool:
+        self.rejections -= 1
+        return self.rejections < 0
+
+
+def test_scheduler_waits_for_executor_that_is_temporarily_full():
+    executor = _TemporarilyFullExecutor(rejections=5)
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_delayed)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor)
+        .with_grouping_strategy(GroupByRepeatableBlocks())
+        .build()
+    )
+    # Nothing is in flight while the remote executor rejects tasks
+    result = dr.execute(["final"], inputs={"delay_seconds": 0.0, "number_of_steps": 3})
+    assert result["final"] == sum(i**2 + i**3 for i in range(3))
+    assert executor.rejections < 0
+
+
+def fan_out_width() -> int:
+    return 1
+
+
+def fan_out_item(fan_out_width: int) -> Parallelizable[int]:
+    for i in range(fan_out_width):
+        yield i
+
+
+def fan_out_doubled(fan_out_item: int) -> int:
+    return fan_out_item * 2
+
+
+def fan_out_total(fan_out_doubled: Collect[int]) -> int:
+    return sum(fan_out_doubled)
+
+
+def _time_fan_out(module, width: int, repeats: int = 1) -> float:
+    """Best CPU time of scheduling a fan-out -- the best of a few runs, and CPU rather than wall time,
+    as they are less sensitive to load"""
+    dr = (
+        driver.Builder()
+        .with_modules(module)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_local_executor(SynchronousLocalTaskExecutor())
+        .build()
+    )
+    times = []
+    for _ in range(repeats):
+        t0 = time.process_time()
+        res = dr.execute(["fan_out_total"], overrides={"fan_out_width": width})
+        times.append(time.process_time() - t0)
+        assert res["fan_out_total"] == width * (width - 1)
+    return min(times)
+
+
+@pytest.mark.benchmark
+def test_scheduling_scales_near_linearly_with_fan_out_width():
+    """Benchmarks scheduling over 1k, 10k and 100k wide fan-outs. Task lookup is indexed, so the time
+    per item should stay roughly flat -- a scan of the task pool per update would grow it linearly.
+    Locally this takes ~0.2s/~1.4s/~15s of CPU for 1k/10k/100k (~0.6s at 1k and ~18s at 5k with a
+    scan)."""
+    module = hamilton.ad_hoc_utils.create_temporary_module(
+        fan_out_width, fan_out_item, fan_out_doubled, fan_out_total
+    )
+    _time_fan_out(module, 100)  # warm up
+    per_item_1k = _time_fan_out(module, 1_000, repeats=3) / 1_000
+    per_item_10k = _time_fan_out(module, 10_000, repeats=2) / 10_000
+    per_item_100k = _time_fan_out(module, 100_000) / 100_000
+    # Quadratic scheduling would be ~10x/~100x the time per item
+    assert per_item_10k < per_item_1k * 4
+    assert per_item_100k < per_item_1k * 8
+
+
+@pytest.mark.parametrize("number_of_steps", [0, 1, 6])
+@pytest.mark.parametrize("max_in_flight", [1, 2, 100])
+@pytest.mark.parametrize(
+    "executor_factory", [multi_threading_executor_factory, SynchronousLocalTaskExecutor]
+)
+def test_end_to_end_parallel_with_streaming_expansion(
+    executor_factory, max_in_flight, number_of_steps
+):
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_linear_basic)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor_factory())
+        .with_streaming_expansion(max_in_flight=max_in_flight)
+        .build()
+    )
+    res = dr.execute(["final"], overrides={"number_of_steps": number_of_steps})
+    assert res["final"] == parallel_linear_basic._calc(number_of_steps)
+
+
+STREAMING_EVENTS = []
+
+
+def streamed_item() -> Parallelizable[int]:
+    for i in range(10):
+        STREAMING_EVENTS.append(("yield", i))
+        yield i
+
+
+def streamed_item_processed(streamed_item: int) -> int:
+    STREAMING_EVENTS.append(("process", streamed_item))
+    return streamed_item
+
+
+def streamed_items_collected(streamed_item_processed: Collect[int]) -> List[int]:
+    return list(streamed_item_processed)
+
+
+def test_streaming_expansion_bounds_items_in_flight():
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                streamed_item, streamed_item_processed, streamed_items_collected
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(SynchronousLocalTaskExecutor())
+        .with_streaming_expansion(max_in_flight=2)
+        .build()
+    )
+    STREAMING_EVENTS.clear()
+    res = dr.execute(["streamed_items_collected"])
+    assert sorted(res["streamed_items_collected"]) == list(range(10))
+    # Work starts before the generator is exhausted, and we never pull more than 2 items ahead
+    in_flight = 0
+    for event, _ in STREAMING_EVENTS:
+        in_flight += 1 if event == "yield" else -1
+        assert 0 <= in_flight <= 2
+    assert STREAMING_EVENTS.index(("process", 0)) < STREAMING_EVENTS.index(("yield", 9))
+
+
+def failing_streamed_item() -> Parallelizable[int]:
+    for i in range(10):
+        if i == 3:
+            raise ValueError("Generator failed")
+        yield i
+
+
+def failing_streamed_item_processed(failing_streamed_item: int) -> int:
+    return failing_streamed_item
+
+
+def failing_streamed_items_collected(failing_streamed_item_processed: Collect[int]) -> List[int]:
+    return list(failing_streamed_item_processed)
+
+
+class _TaskResultRecorder(lifecycle_base.BasePostTaskExecute):
+    def __init__(self):
+        self.results = []
+
+    def post_task_execute(self, *, task_id: str, success: bool, error: Exception, **kwargs):
+        self.results.append((task_id, success, error))
+
+
+@pytest.mark.parametrize("stream_collect", [False, True])
+def test_streaming_expansion_generator_fails_partway(stream_collect):
+    recorder = _TaskResultRecorder()
+    builder = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                failing_streamed_item,
+                failing_streamed_item_processed,
+                failing_streamed_items_collected,
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=2))
+        .with_adapters(recorder)
+        .with_streaming_expansion(max_in_flight=2)
+    )
+    if stream_collect:
+        builder = builder.with_streaming_collect()
+    with pytest.raises(ValueError, match="Generator failed"):
+        builder.build().execute(["failing_streamed_items_collected"])
+    # The expander task first reported success, as it returned its generator, then its failure
+    expander_results = [
+        (success, error)
+        for task_id, success, error in recorder.results
+        if task_id == "expand-failing_streamed_item"
+    ]
+    assert expander_results[0] == (True, None)
+    assert expander_results[-1][0] is False
+    assert str(expander_results[-1][1]) == "Generator failed"
+
+
+def test_streaming_expansion_cannot_request_expander():
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                streamed_item, streamed_item_processed, streamed_items_collected
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(SynchronousLocalTaskExecutor())
+        .with_streaming_expansion(max_in_flight=2)
+        .build()
+    )
+    with pytest.raises(ValueError, match="Cannot request Parallelizable"):
+        dr.execute(["streamed_item", "streamed_items_collected"])
+
+
+def test_streaming_expansion_requires_positive_bound():
+    with pytest.raises(ValueError):
+        driver.Builder().enable_dynamic_execution(
+            allow_experimental_mode=True
+        ).with_streaming_expansion(max_in_flight=0)
+
+
+@pytest.mark.parametrize("number_of_steps", [0, 1, 6])
+@pytest.mark.parametrize("max_in_flight", [None, 2])
+@pytest.mark.parametrize(
+    "executor_factory", [multi_threading_executor_factory, SynchronousLocalTaskExecutor]
+)
+def test_end_to_end_parallel_with_streaming_collect(
+    executor_factory, max_in_flight, number_of_steps
+):
+    builder = (
+        driver.Builder()
+        .with_modules(parallel_linear_basic)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor_factory())
+        .with_streaming_collect()
+    )
+    if max_in_flight is not None:
+        builder = builder.with_streaming_expansion(max_in_flight=max_in_flight)
+    res = builder.build().execute(["final"], overrides={"number_of_steps": number_of_steps})
+    assert res["final"] == parallel_linear_basic._calc(number_of_steps)
+
+
+def test_end_to_end_streaming_collect_with_inputs_in_collect():
+    dr = (
+        driver.Builder()
+        .with_modules(inputs_in_collect)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_streaming_collect()
+        .build()
+    )
+    res = dr.execute(["collect_plus_one"])
+    assert res["collect_plus_one"] == 47
+
+
+def delayed_item() -> Parallelizable[int]:
+    for i in range(6):
+        yield i
+
+
+def delayed_item_processed(delayed_item: int) -> int:
+    # Later items finish first
+    time.sleep((6 - delayed_item) * 0.02)
+    return delayed_item
+
+
+def delayed_items_collected(delayed_item_processed: Collect[int]) -> List[int]:
+    return list(delayed_item_processed)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_streaming_collect_order(ordered):
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                delayed_item, delayed_item_processed, delayed_items_collected
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=6))
+        .with_streaming_collect(ordered=ordered)
+        .build()
+    )
+    res = dr.execute(["delayed_items_collected"])["delayed_items_collected"]
+    assert sorted(res) == list(range(6))
+    if ordered:
+        assert res == list(range(6))
+    else:
+        assert res != list(range(6))
+
+
+def test_streaming_collect_consumes_results_as_they_complete():
+    # The collector sees each result before the next item is yielded, as we only allow one in
+    # flight, and the results are evicted, so the result cache never holds more than one
+    STREAMING_EVENTS.clear()
+
+    def streamed_items_collected(streamed_item_processed: Collect[int]) -> List[int]:
+        out = []
+        for item in streamed_item_processed:
+            STREAMING_EVENTS.append(("collect", item))
+            out.append(item)
+        return out
+
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                streamed_item,
+                streamed_item_processed,
+                streamed_items_collected,
+                module_name="streaming_collect_module",
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_streaming_expansion(max_in_flight=1)
+        .with_streaming_collect(ordered=True)
+        .build()
+    )
+    res = dr.execute(["streamed_items_collected"])
+    assert res["streamed_items_collected"] == list(range(10))
+    assert STREAMING_EVENTS.index(("collect", 0)) < STREAMING_EVENTS.index(("yield", 2))
+
+
+def test_collected_results_evicted_from_result_cache():
+    cache = {}
+    result_cache = state.DictBasedResultCache(cache)
+    result_cache.write({"foo": 1, "bar": 2}, "0", "expand-foo")
+    result_cache.evict(["foo"], "0", "expand-foo")
+    assert cache == {"expand-foo:0:bar": 2}
+
+
+def failing_item_processed(streamed_item: int) -> int:
+    if streamed_item == 3:
+        raise ValueError("Failed on purpose")
+    return streamed_item
+
+
+def failing_items_collected(failing_item_processed: Collect[int]) -> List[int]:
+    return list(failing_item_processed)
+
+
+def test_streaming_collect_fails_if_a_task_fails():
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                streamed_item, failing_item_processed, failing_items_collected
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=2))
+        .with_streaming_collect()
+        .build()
+    )
+    with pytest.raises(Exception):
+        dr.execute(["failing_items_collected"])
+
+
+def _shared_segments() -> set:
+    return set(os.listdir("/dev/shm")) if os.path.exists("/dev/shm") else set()
+
+
+def _execute_large_results(min_shared_memory_bytes, base: np.ndarray, number_of_chunks: int):
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_large_results)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(
+            MultiProcessingExecutor(max_tasks=2, min_shared_memory_bytes=min_shared_memory_bytes)
+        )
+        .build()
+    )
+    return dr.execute(["total"], inputs={"base": base, "number_of_chunks": number_of_chunks})
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Requires POSIX shared memory")
+def test_multiprocessing_executor_with_shared_memory():
+    segments_before = _shared_segments()
+    res = _execute_large_results(1000, np.ones(10_000), 4)
+    assert res == {"total": 60_000.0}
+    # Everything gets unlinked
+    assert _shared_segments() - segments_before == set()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Requires POSIX shared memory")
+def test_multiprocessing_executor_passes_large_values_through_shared_memory(monkeypatch):
+    shared_inputs, shared_results = [], []
+    share_values = shared_memory_transport.share_values
+    attach_values = shared_memory_transport.attach_values
+
+    def _shared(values: dict) -> List[str]:
+        handles = (shared_memory_transport.SharedArray, shared_memory_transport.SharedDataFrame)
+        return [name for name, value in values.items() if isinstance(value, handles)]
+
+    def _share_values(values, min_size_bytes, segments):
+        shared = share_values(values, min_size_bytes, segments)
+        shared_inputs.extend(_shared(shared))
+        return shared
+
+    def _attach_values(values, on_attach):
+        shared_results.extend(_shared(values))
+        return attach_values(values, on_attach)
+
+    # Only patched in this process: records what is sent to/received from the workers
+    monkeypatch.setattr(shared_memory_transport, "share_values", _share_values)
+    monkeypatch.setattr(shared_memory_transport, "attach_values", _attach_values)
+    res = _execute_large_results(1000, np.ones(10_000), 4)
+    assert res == {"total": 60_000.0}
+    assert "base" in shared_inputs
+    assert "scaled_frame" in shared_results
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(os.name == "nt", reason="Requires POSIX shared memory")
+def test_multiprocessing_executor_shared_memory_faster_than_pickling():
+    """Benchmarks passing large arrays to/from workers. Through shared memory, each is copied
+    once, rather than being pickled, piped, and unpickled. Locally, with 8 tasks passing 200MB
+    arrays in and out, this was ~14s pickling vs ~3.5s with shared memory."""
+    base = np.ones(5_000_000)
+    _execute_large_results(None, base, 1)  # warm up
+    t0 = time.perf_counter()
+    _execute_large_results(None, base, 4)
+    pickled = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _execute_large_results(2**20, base, 4)
+    shared = time.perf_counter() - t0
+    assert shared < pickled
+
+
+@dataclasses.dataclass(frozen=True)
+class _Deferred(state.DeferredResult):
+    """Deferred result that logs which results get resolved"""
+
+    name: str
+    value: Any
+    resolved: List[str]
+
+    def resolve(self) -> Any:
+        self.resolved.append(self.name)
+        return self.value
+
+
+class _DeferringExecutor(SynchronousLocalTaskExecutor):
+    """Executor that defers its results, passing them to its own tasks without resolving them,
+    as an object store would"""
+
+    def __init__(self):
+        self.resolved = []
+
+    def submit_task(self, task: TaskImplementation) -> TaskFuture:
+        passed = {
+            key: value.value
+            for key, value in task.dynamic_inputs.items()
+            if isinstance(value, _Deferred)
+        }
+        task = dataclasses.replace(task, dynamic_inputs={**task.dynamic_inputs, **passed})
+        results = {
+            key: _Deferred(key, value, self.resolved)
+            for key, value in base_execute_task(task).items()
+        }
+        return TaskFuture(get_state=lambda: state.TaskState.SUCCESSFUL, get_result=lambda: results)
+
+
+def deferred_item(number_of_items: int) -> Parallelizable[int]:
+    for i in range(number_of_items):
+        yield i
+
+
+def deferred_scaled(deferred_item: int) -> np.ndarray:
+    return np.ones(10) * deferred_item
+
+
+def deferred_summed(deferred_scaled: np.ndarray) -> float:
+    return float(deferred_scaled.sum())
+
+
+def deferred_total(deferred_summed: Collect[float]) -> float:
+    return sum(deferred_summed)
+
+
+def test_deferred_results_passed_between_tasks():
+    executor = _DeferringExecutor()
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor)
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
+    # Every node is its own task, but only the final output is resolved
+    assert executor.resolved == ["final"]
+
+
+@pytest.mark.parametrize("stream_collect", [False, True])
+def test_deferred_results_resolved_when_collected(stream_collect):
+    executor = _DeferringExecutor()
+    builder = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                deferred_item, deferred_scaled, deferred_summed, deferred_total
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor)
+    )
+    if stream_collect:
+        builder = builder.with_streaming_collect()
+    res = builder.build().execute(["deferred_total"], inputs={"number_of_items": 4})
+    assert res == {"deferred_total": 60.0}
+    # the collector runs locally
+    assert executor.resolved == ["deferred_summed"] * 4
+
+
+def async_items(number_of_items: int) -> Parallelizable[int]:
+    for i in range(number_of_items):
+        yield i
+
+
+# Fetches in flight, how many have to be in flight at once before any of them returns, and how
+# long they then stay in flight for
+_fetching = {"in_flight": 0, "peak": 0, "wait_for": 1, "released": False, "hold_seconds": 0}
+
+
+def _reset_fetching(wait_for: int = 1, hold_seconds: float = 0):
+    _fetching.update(
+        in_flight=0, peak=0, wait_for=wait_for, released=False, hold_seconds=hold_seconds
+    )
+
+
+async def async_fetched(async_items: int) -> int:
+    _fetching["in_flight"] += 1
+    _fetching["peak"] = max(_fetching["peak"], _fetching["in_flight"])
+    try:
+        # Only reached if that many run concurrently -- we give up eventually rather than hang
+        deadline = time.monotonic() + 30
+        while not _fetching["released"]:
+            if _fetching["in_flight"] >= _fetching["wait_for"]:
+                _fetching["released"] = True
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"Only {_fetching['in_flight']} fetches ran concurrently")
+            else:
+                await asyncio.sleep(0.001)
+        await asyncio.sleep(_fetching["hold_seconds"])
+        return async_items
+    finally:
+        _fetching["in_flight"] -= 1
+
+
+def sync_parsed(async_fetched: int) -> int:
+    return async_fetched * 2
+
+
+async def async_stored(sync_parsed: int) -> Tuple[str, int]:
+    await asyncio.sleep(0)
+    return threading.current_thread().name, sync_parsed
+
+
+def async_all_stored(async_stored: Collect[Tuple[str, int]]) -> List[Tuple[str, int]]:
+    return list(async_stored)
+
+
+def async_threads(async_all_stored: List[Tuple[str, int]]) -> Set[str]:
+    return {thread_name for thread_name, _ in async_all_stored}
+
+
+def async_total(async_all_stored: List[Tuple[str, int]]) -> int:
+    return sum(value for _, value in async_all_stored)
+
+
+def _async_driver(executor, *adapters, grouping_strategy=None):
+    _reset_fetching()
+    builder = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                async_items,
+                async_fetched,
+                sync_parsed,
+                async_stored,
+                async_all_stored,
+                async_threads,
+                async_total,
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor)
+        .with_adapters(*adapters)
+    )
+    if grouping_strategy is not None:
+        builder = builder.with_grouping_strategy(grouping_strategy)
+    return builder.build()
+
+
+def test_asyncio_task_executor_runs_coroutines_concurrently():
+    dr = _async_driver(AsyncioTaskExecutor(max_sync_workers=1))
+    # none of the 200 branches return before all of them are in flight
+    _reset_fetching(wait_for=200)
+    results = dr.execute(["async_total", "async_threads"], inputs={"number_of_items": 200})
+    assert _fetching["peak"] == 200
+    assert results["async_total"] == sum(range(200)) * 2
+    assert results["async_threads"] == {"hamilton-asyncio"}
+
+
+def test_asyncio_task_executor_max_concurrency():
+    dr = _async_driver(AsyncioTaskExecutor(max_concurrency=2))
+    # held in flight, so that more would overlap if they weren't limited
+    _reset_fetching(wait_for=2, hold_seconds=0.1)
+    assert dr.execute(["async_total"], inputs={"number_of_items": 4}) == {"async_total": 12}
+    # two at a time
+    assert _fetching["peak"] == 2
+
+
+def test_asyncio_task_executor_sync_tasks():
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(AsyncioTaskExecutor())
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
+
+
+class _AsyncAndSyncNodeHooks(
+    lifecycle_base.BasePreNodeExecute, lifecycle_base.BasePostNodeExecuteAsync
+):
+    def __init__(self):
+        self.calls = []
+
+    def pre_node_execute(self, *, node_, **future_kwargs):
+        self.calls.append(("pre", node_.name))
+
+    async def post_node_execute(self, *, node_, success, **future_kwargs):
+        self.calls.append(("post", node_.name, success))
+
+
+def test_asyncio_task_executor_lifecycle_hooks():
+    hooks = _AsyncAndSyncNodeHooks()
+    dr = _async_driver(AsyncioTaskExecutor(), hooks)
+    assert dr.execute(["async_total"], inputs={"number_of_items": 2}) == {"async_total": 2}
+    assert hooks.calls.count(("pre", "async_fetched")) == 2
+    assert hooks.calls.count(("post", "async_fetched", True)) == 2
+    assert hooks.calls.count(("post", "sync_parsed", True)) == 2
+
+
+async def async_failing(number_of_items: int) -> int:
+    raise ValueError("Fetch failed")
+
+
+def test_asyncio_task_executor_failure():
+    hooks = _AsyncAndSyncNodeHooks()
+    dr = (
+        driver.Builder()
+        .with_modules(hamilton.ad_hoc_utils.create_temporary_module(async_failing))
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(AsyncioTaskExecutor())
+        .with_adapters(hooks)
+        .with_grouping_strategy(GroupNodesIndividually())
+        .build()
+    )
+    with pytest.raises(ValueError, match="Fetch failed"):
+        dr.execute(["async_failing"], inputs={"number_of_items": 1})
+    assert ("post", "async_failing", False) in hooks.calls
+
+
+def test_asyncio_task_executor_streaming_expansion():
+    # The async hooks make the expander run through base_execute_task_async, not base_execute_task
+    dr = (
+        driver.Builder()
+        .with_modules(
+            hamilton.ad_hoc_utils.create_temporary_module(
+                streamed_item, streamed_item_processed, streamed_items_collected
+            )
+        )
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_local_executor(AsyncioTaskExecutor())
+        .with_remote_executor(SynchronousLocalTaskExecutor())
+        .with_adapters(_AsyncAndSyncNodeHooks())
+        .with_streaming_expansion(max_in_flight=2)
+        .build()
+    )
+    STREAMING_EVENTS.clear()
+    res = dr.execute(["streamed_items_collected"])
+    assert sorted(res["streamed_items_collected"]) == list(range(10))
+    assert STREAMING_EVENTS.index(("process", 0)) < STREAMING_EVENTS.index(("yield", 9))
@@ -1,13 +1,25 @@
+import asyncio
+import sys
+import time
 from typing import Callable, Dict, List, Union
 
 import pytest
 
 from hamilton import node
 from hamilton.execution.graph_functions import (
+    ExecutionPlan,
+    ExecutionStepType,
+    SubdagExecutionStats,
+    compile_execution_plan,
     create_input_string,
+    execute_node,
+    execute_plan,
+    execute_plan_async,
+    execute_subdag,
     nodes_between,
     topologically_sort_nodes,
 )
+from hamilton.lifecycle import base as lifecycle_base
 
 
 def _create_dummy_dag(
@@ -221,3 +233,155 @@ def test_create_input_string_with_custom_object():
         " 'arg2': 'short string',\n"
         " 'arg3': 3.14}"
     )
+
+
+def test_compile_execution_plan():
+    nodes = _create_dummy_dag(
+        {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"], "e": ["a"]}, dict_output=True
+    )
+    plan = compile_execution_plan([nodes["d"]])
+    # e is not required to compute d, so it is not part of the plan
+    assert [step.node_.name for step in plan.steps] == ["a", "b", "c", "d"]
+    assert [step.kwarg_names for step in plan.steps] == [(), ("a",), ("a",), ("b", "c")]
+    # a is released after its last consumer (c) runs, b and c after d runs
+    assert [set(step.release_after) for step in plan.steps] == [set(), set(), {"a"}, {"b", "c"}]
+
+
+def test_compile_execution_plan_stops_at_overrides_and_computed():
+    nodes = _create_dummy_dag({"a": [], "b": ["a"], "c": ["b"], "d": ["c"]}, dict_output=True)
+    plan = compile_execution_plan([nodes["d"]], computed_keys={"b"})
+    assert [step.node_.name for step in plan.steps] == ["c", "d"]
+    plan = compile_execution_plan([nodes["d"]], override_keys={"c"})
+    assert [(step.node_.name, step.step_type) for step in plan.steps] == [
+        ("c", ExecutionStepType.OVERRIDE),
+        ("d", ExecutionStepType.EXECUTE),
+    ]
+    # We don't own the override, so we don't release it
+    assert all(len(step.release_after) == 0 for step in plan.steps)
+
+
+def test_execute_subdag_deep_chain_does_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    adjacency_map = {"n_0": []}
+    for i in range(1, depth):
+        adjacency_map[f"n_{i}"] = [f"n_{i - 1}"]
+    nodes = _create_dummy_dag(adjacency_map, dict_output=True)
+    results = execute_subdag([nodes[f"n_{depth - 1}"]], inputs={})
+    assert list(results) == [f"n_{depth - 1}"]
+
+
+def test_execute_subdag_releases_intermediates_in_chain():
+    adjacency_map = {"n_0": []}
+    for i in range(1, 100):
+        adjacency_map[f"n_{i}"] = [f"n_{i - 1}"]
+    nodes = _create_dummy_dag(adjacency_map, dict_output=True)
+    stats = SubdagExecutionStats()
+    results = execute_subdag([nodes["n_99"]], inputs={}, stats=stats)
+    assert list(results) == ["n_99"]
+    # At most a node and its single dependency are live at any one time
+    assert stats.max_num_results_held == 2
+    assert stats.max_bytes_held == 2 * sys.getsizeof(object())
+    assert stats.results_released == 99
+
+
+def test_execute_plan_async_releases_intermediates_as_execute_plan_does():
+    adjacency_map = {"n_0": []}
+    for i in range(1, 100):
+        adjacency_map[f"n_{i}"] = [f"n_{i - 1}"]
+    nodes = _create_dummy_dag(adjacency_map, dict_output=True)
+    plan = compile_execution_plan([nodes["n_99"]])
+    stats, async_stats = SubdagExecutionStats(), SubdagExecutionStats()
+    results = execute_plan(plan, inputs={}, stats=stats)
+    async_results = asyncio.run(execute_plan_async(plan, inputs={}, stats=async_stats))
+    assert list(async_results) == list(results) == ["n_99"]
+    assert async_stats == stats
+
+
+def test_execute_subdag_releases_intermediates_with_consumers_outside_plan():
+    # c consumes a but is not required, so should not keep a alive
+    nodes = _create_dummy_dag(
+        {"a": [], "b": ["a"], "c": ["a"], "d": ["b"], "e": ["d"]}, dict_output=True
+    )
+    stats = SubdagExecutionStats()
+    results = execute_subdag([nodes["e"]], inputs={}, stats=stats)
+    assert list(results) == ["e"]
+    assert stats.max_num_results_held == 2
+
+
+def test_execute_subdag_does_not_release_requested_overrides_or_computed():
+    nodes = _create_dummy_dag(
+        {"a": [], "b": ["a"], "c": ["b"], "d": ["c"], "e": ["d"]}, dict_output=True
+    )
+    computed = {"a": "precomputed"}
+    results = execute_subdag(
+        [nodes["b"], nodes["e"]], inputs={}, computed=computed, overrides={"c": "overridden"}
+    )
+    assert set(results) == {"a", "b", "c", "e"}
+    assert results["a"] == "precomputed"
+    assert results["c"] == "overridden"
+
+
+class _NoOpNodeHooks(lifecycle_base.BasePreNodeExecute, lifecycle_base.BasePostNodeExecute):
+    def pre_node_execute(self, **kwargs):
+        pass
+
+    def post_node_execute(self, **kwargs):
+        pass
+
+
+def _time_per_node(plan: ExecutionPlan, adapter: lifecycle_base.LifecycleAdapterSet) -> float:
+    timings = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        execute_plan(plan, inputs={}, adapter=adapter)
+        timings.append(time.perf_counter() - t0)
+    return min(timings) / len(plan.steps)
+
+
+@pytest.mark.benchmark
+def test_execute_node_overhead_by_number_of_adapters():
+    """Micro-benchmark of the per-node cost of the lifecycle machinery. With no adapters we should
+    not touch it at all, so should be no slower than with any."""
+    adjacency_map = {"n_0": []}
+    for i in range(1, 5000):
+        adjacency_map[f"n_{i}"] = [f"n_{i - 1}"]
+    nodes = _create_dummy_dag(adjacency_map, dict_output=True)
+    plan = compile_execution_plan([nodes["n_4999"]])
+    per_node = {
+        num_adapters: _time_per_node(
+            plan,
+            lifecycle_base.LifecycleAdapterSet(*[_NoOpNodeHooks() for _ in range(num_adapters)]),
+        )
+        for num_adapters in (0, 1, 5)
+    }
+    # Tolerant of noise -- five adapters cost several times what none do
+    assert per_node[0] < per_node[5]
+    assert per_node[0] < per_node[1] * 1.5
+
+
+def test_execute_node_without_adapters_skips_lifecycle_machinery(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Lifecycle machinery should not be touched without adapters")
+
+    for method in ("get_sync_hooks", "get_sync_method", "does_hook", "does_method"):
+        monkeypatch.setattr(lifecycle_base.LifecycleAdapterSet, method, fail)
+
+    def incremented(a: int) -> int:
+        return a + 1
+
+    node_ = node.Node.from_fn(incremented)
+    assert execute_node(node_, {"a": 1}, lifecycle_base.LifecycleAdapterSet()) == 2
+
+
+def test_execute_node_without_adapters_logs_and_raises(caplog):
+    def fails(a: int) -> int:
+        raise SentinelError()
+
+    node_ = node.Node.from_fn(fails)
+    with pytest.raises(SentinelError):
+        execute_node(node_, {"a": 1}, lifecycle_base.LifecycleAdapterSet())
+    assert "fails" in caplog.text
+
+
+class SentinelError(Exception):
+    pass
@@ -1,12 +1,19 @@
-from hamilton import ad_hoc_utils, graph, node
+import time
+from typing import List
+
+import pytest
+
+from hamilton import ad_hoc_utils, function_modifiers, graph, node
 from hamilton.execution import grouping
 from hamilton.execution.grouping import (
     GroupByRepeatableBlocks,
     GroupNodesAllAsOne,
+    GroupNodesByCost,
     GroupNodesByLevel,
     GroupNodesIndividually,
     NodeGroupPurpose,
 )
+from hamilton.function_modifiers import metadata
 from hamilton.graph import FunctionGraph
 from hamilton.lifecycle import base as lifecycle_base
 from hamilton.node import NodeType
@@ -73,6 +80,156 @@ def test_group_nodes_by_repeatable_blocks_complex():
     assert nodes_grouped_by_name["collect-steps"].spawning_task_base_id == "expand-steps"
 
 
+def _group_names(groups):
+    return sorted(sorted(node_.name for node_ in group.nodes) for group in groups)
+
+
+def test_group_nodes_by_cost_unknown_costs_fuses_chains():
+    fn_graph = FunctionGraph.from_modules(no_parallel, config={})
+    groups = GroupNodesByCost().group_nodes(list(fn_graph.nodes.values()))
+    assert _group_names(groups) == [
+        [
+            "final",
+            "step_squared",
+            "step_squared_plus_step_cubed",
+            "sum_step_squared_plus_step_cubed",
+        ],
+        ["number_of_steps", "steps"],
+        ["step_cubed"],
+    ]
+    assert {group.purpose for group in groups} == {NodeGroupPurpose.EXECUTE_BLOCK}
+
+
+def test_group_nodes_by_cost_cheap_nodes_fused():
+    fn_graph = FunctionGraph.from_modules(no_parallel, config={})
+    groups = GroupNodesByCost(default_cost=0.0).group_nodes(list(fn_graph.nodes.values()))
+    assert len(groups) == 1
+
+
+def test_group_nodes_by_cost_expensive_branches_kept_apart():
+    fn_graph = FunctionGraph.from_modules(no_parallel, config={})
+    costs = {"step_squared": 1.0, "step_cubed": 1.0}
+    groups = GroupNodesByCost(costs=costs, default_cost=0.0).group_nodes(
+        list(fn_graph.nodes.values())
+    )
+    assert _group_names(groups) == [
+        [
+            "final",
+            "step_squared",
+            "step_squared_plus_step_cubed",
+            "sum_step_squared_plus_step_cubed",
+        ],
+        ["number_of_steps", "steps"],
+        ["step_cubed"],
+    ]
+
+
+def test_group_nodes_by_cost_cheap_node_does_not_delay_consumers():
+    def a() -> int:
+        return 1
+
+    def slow(a: int) -> int:
+        return a
+
+    def cheap(a: int, slow: int) -> int:
+        return a + slow
+
+    def other(a: int) -> int:
+        return a
+
+    module = ad_hoc_utils.create_temporary_module(a, slow, cheap, other)
+    fn_graph = FunctionGraph.from_modules(module, config={})
+    strategy = GroupNodesByCost(costs={"slow": 1.0, "other": 1.0}, default_cost=0.0)
+    groups = strategy.group_nodes(list(fn_graph.nodes.values()))
+    # cheap can't join a's group, or other would wait for slow
+    assert _group_names(groups) == [["a"], ["cheap", "slow"], ["other"]]
+
+
+def test_group_nodes_by_estimated_cost():
+    def a() -> int:
+        return 1
+
+    @metadata.estimated_cost(seconds=1.0)
+    def b(a: int) -> int:
+        return a
+
+    @metadata.estimated_cost(seconds=1.0)
+    def c(a: int) -> int:
+        return a
+
+    module = ad_hoc_utils.create_temporary_module(a, b, c)
+    fn_graph = FunctionGraph.from_modules(module, config={})
+    groups = GroupNodesByCost(default_cost=0.0).group_nodes(list(fn_graph.nodes.values()))
+    assert _group_names(groups) == [["a"], ["b"], ["c"]]
+
+
+def test_group_nodes_by_cost_ignores_generic_cost_tag():
+    @function_modifiers.tag(cost="high")
+    def a() -> int:
+        return 1
+
+    module = ad_hoc_utils.create_temporary_module(a)
+    (node_,) = FunctionGraph.from_modules(module, config={}).nodes.values()
+    assert GroupNodesByCost(default_cost=0.5).node_cost(node_) == 0.5
+
+
+def test_group_nodes_by_cost_parallel_blocks():
+    fn_graph = FunctionGraph.from_modules(parallel_complex, config={})
+    nodes_grouped_by_name = {
+        group.base_id: group
+        for group in GroupNodesByCost(default_cost=0.0).group_nodes(list(fn_graph.nodes.values()))
+    }
+    assert len(nodes_grouped_by_name["block-steps"].nodes) == 5
+    assert nodes_grouped_by_name["collect-steps"].purpose == NodeGroupPurpose.GATHER
+    assert nodes_grouped_by_name["expand-steps"].purpose == NodeGroupPurpose.EXPAND_UNORDERED
+    # the cheap nodes on either side of the block are fused
+    assert [node_.name for node_ in nodes_grouped_by_name["number_of_steps"].nodes] == [
+        "number_of_steps",
+        "param_external_to_block",
+        "second_param_external_to_block",
+    ]
+    assert len(nodes_grouped_by_name["final"].nodes) == 1
+
+
+def _chain(length: int) -> List[node.Node]:
+    source = "def n0() -> int:\n    return 0\n" + "".join(
+        f"def n{i}(n{i - 1}: int) -> int:\n    return n{i - 1}\n" for i in range(1, length)
+    )
+    module = ad_hoc_utils.module_from_source(source)
+    return list(FunctionGraph.from_modules(module, config={}).nodes.values())
+
+
+def _fan_in(width: int) -> List[node.Node]:
+    source = (
+        "def root() -> int:\n    return 0\n"
+        + "".join(f"def n{i}(root: int) -> int:\n    return root\n" for i in range(width))
+        + f"def total({', '.join(f'n{i}: int' for i in range(width))}) -> int:\n    return 0\n"
+    )
+    module = ad_hoc_utils.module_from_source(source)
+    return list(FunctionGraph.from_modules(module, config={}).nodes.values())
+
+
+def _time_grouping(grouper: grouping.GroupingStrategy, nodes: List[node.Node]) -> float:
+    timings = []
+    for _ in range(3):
+        t0 = time.process_time()
+        grouper.group_nodes(nodes)
+        timings.append(time.process_time() - t0)
+    return min(timings)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("default_cost", [None, 0.0, 1.0])
+@pytest.mark.parametrize("graph_of_size", [_chain, _fan_in])
+def test_group_nodes_by_cost_scales_near_linearly(graph_of_size, default_cost):
+    """Grouping a graph twice the size should take about twice the time. Locally, a chain of 4000
+    nodes takes ~0.05s-0.1s to group (~0.01s individually)."""
+    grouper = GroupNodesByCost(default_cost=default_cost)
+    small = _time_grouping(grouper, graph_of_size(2000))
+    large = _time_grouping(grouper, graph_of_size(4000))
+    assert large < small * 3
+
+
 def test_create_task_plan():
     fn_graph = FunctionGraph.from_modules(parallel_linear_basic, config={})
     node_grouper = GroupByRepeatableBlocks()
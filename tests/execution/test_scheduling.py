@@ -0,0 +1,139 @@
+import json
+import pickle
+
+import pytest
+
+from hamilton import ad_hoc_utils, driver
+from hamilton.execution import grouping, scheduling
+from hamilton.execution.executors import MultiProcessingExecutor, MultiThreadingExecutor
+from hamilton.graph import FunctionGraph
+from hamilton.lifecycle import base as lifecycle_base
+
+from tests.resources.dynamic_parallelism import no_parallel, parallel_linear_basic
+
+calls = []
+
+
+def short() -> int:
+    calls.append("short")
+    return 1
+
+
+def long_start() -> int:
+    calls.append("long_start")
+    return 2
+
+
+def long_end(long_start: int) -> int:
+    calls.append("long_end")
+    return long_start * 2
+
+
+def final(short: int, long_end: int) -> int:
+    return short + long_end
+
+
+def _task_plan(module, grouping_strategy=None):
+    fn_graph = FunctionGraph.from_modules(module, config={})
+    grouping_strategy = grouping_strategy or grouping.GroupNodesIndividually()
+    groups = grouping_strategy.group_nodes(list(fn_graph.nodes.values()))
+    return grouping.create_task_plan(groups, ["final"], {}, lifecycle_base.LifecycleAdapterSet())
+
+
+def test_node_runtime_profile_smoothing():
+    profile = scheduling.NodeRuntimeProfile(smoothing=0.5)
+    profile.record("a", 1.0)
+    assert profile["a"] == 1.0
+    profile.record("a", 3.0)
+    assert profile["a"] == 2.0
+    assert profile.count("a") == 2
+    assert dict(profile) == {"a": 2.0}
+    with pytest.raises(ValueError):
+        scheduling.NodeRuntimeProfile(smoothing=0)
+
+
+def test_node_runtime_profile_persisted(tmp_path):
+    path = str(tmp_path / "profile.json")
+    profile = scheduling.NodeRuntimeProfile(path)
+    profile.record("a", 1.0)
+    profile.save()
+    assert json.load(open(path)) == {"nodes": {"a": {"runtime": 1.0, "count": 1}}}
+    assert dict(scheduling.NodeRuntimeProfile(path)) == {"a": 1.0}
+
+
+def test_node_runtime_profile_copies_record_to_journal(tmp_path):
+    profile = scheduling.NodeRuntimeProfile(str(tmp_path / "profile.json"), smoothing=1.0)
+    copy = pickle.loads(pickle.dumps(profile))
+    copy.record("a", 2.0)
+    assert len(copy) == 0
+    assert len(profile) == 0
+    profile.save()
+    assert dict(profile) == {"a": 2.0}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["profile.json"]
+
+
+@pytest.mark.parametrize(
+    "executor", [MultiThreadingExecutor(max_tasks=2), MultiProcessingExecutor(max_tasks=2)]
+)
+def test_node_runtime_profiler(tmp_path, executor):
+    path = str(tmp_path / "profile.json")
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_linear_basic)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(executor)
+        .with_adapters(scheduling.NodeRuntimeProfiler(scheduling.NodeRuntimeProfile(path)))
+        .build()
+    )
+    dr.execute(["final"])
+    profile = scheduling.NodeRuntimeProfile(path)
+    # the nodes in the parallel block run in the executor, once per item
+    assert profile.count("step_squared") == parallel_linear_basic.number_of_steps()
+    assert profile.count("final") == 1
+    assert all(runtime >= 0 for runtime in profile.values())
+
+
+def test_critical_path_prioritizer():
+    module = ad_hoc_utils.create_temporary_module(short, long_start, long_end, final)
+    costs = {"short": 2.0, "long_start": 1.0, "long_end": 3.0}
+    priorities = scheduling.CriticalPathPrioritizer(costs).prioritize(_task_plan(module))
+    assert priorities == {"short": 2.0, "long_start": 4.0, "long_end": 3.0, "final": 0.0}
+
+
+def test_critical_path_prioritizer_parallel_block_counts_once():
+    tasks = _task_plan(parallel_linear_basic, grouping.GroupByRepeatableBlocks())
+    costs = {node_.name: 1.0 for task in tasks for node_ in task.nodes}
+    priorities = scheduling.CriticalPathPrioritizer(costs).prioritize(tasks)
+    block_size = len({task.base_id: task for task in tasks}["block-steps"].nodes)
+    assert priorities["number_of_steps"] == block_size + 4
+
+
+@pytest.mark.parametrize("short_runtime,first_call", [(0.1, "long_start"), (3.0, "short")])
+def test_critical_path_scheduling_starts_longest_branch_first(short_runtime, first_call):
+    calls.clear()
+    module = ad_hoc_utils.create_temporary_module(short, long_start, long_end, final)
+    profile = scheduling.NodeRuntimeProfile()
+    for node_name, runtime in {"short": short_runtime, "long_start": 1.0, "long_end": 1.0}.items():
+        profile.record(node_name, runtime)
+    dr = (
+        driver.Builder()
+        .with_modules(module)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_remote_executor(MultiThreadingExecutor(max_tasks=1))
+        .with_grouping_strategy(grouping.GroupNodesIndividually())
+        .with_task_prioritizer(scheduling.CriticalPathPrioritizer(profile))
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": 5}
+    assert calls[0] == first_call
+
+
+def test_critical_path_scheduling_without_profile():
+    dr = (
+        driver.Builder()
+        .with_modules(no_parallel)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_task_prioritizer(scheduling.CriticalPathPrioritizer({}))
+        .build()
+    )
+    assert dr.execute(["final"]) == {"final": no_parallel._calc()}
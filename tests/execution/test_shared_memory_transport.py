@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hamilton.execution import shared_memory_transport
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Requires POSIX shared memory")
+
+
+def _round_trip(value, min_size_bytes=0):
+    segments = []
+    shared = shared_memory_transport.share_value(value, min_size_bytes, segments)
+    for shm in segments:
+        shm.close()
+    return shared, shared_memory_transport.attach_value(shared, shared_memory_transport.unlink)
+
+
+def test_share_numpy_array():
+    shared, out = _round_trip(np.arange(100, dtype=np.float32).reshape(10, 10))
+    assert isinstance(shared, shared_memory_transport.SharedArray)
+    np.testing.assert_array_equal(out, np.arange(100, dtype=np.float32).reshape(10, 10))
+
+
+def test_share_dataframe():
+    df = pd.DataFrame({"a": np.arange(10), "b": np.arange(10) * 2.0}, index=pd.RangeIndex(10, 20))
+    shared, out = _round_trip(df)
+    assert isinstance(shared, shared_memory_transport.SharedDataFrame)
+    pd.testing.assert_frame_equal(out, df)
+
+
+def test_share_arrow_table():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"a": np.arange(10), "b": ["x"] * 10})
+    shared, out = _round_trip(table)
+    assert isinstance(shared, shared_memory_transport.SharedArrowTable)
+    assert out.equals(table)
+
+
+def test_share_list_element_wise():
+    shared, out = _round_trip([np.arange(10), 1])
+    assert isinstance(shared[0], shared_memory_transport.SharedArray)
+    assert shared[1] == 1
+    np.testing.assert_array_equal(out[0], np.arange(10))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        np.arange(10),  # too small
+        np.array([{"a": 1}] * 1000, dtype=object),
+        pd.DataFrame({"a": ["x"] * 1000}),
+        pd.DataFrame({"a": np.arange(1000)}, index=np.arange(1000) * 2),
+        "foo",
+    ],
+)
+def test_does_not_share_unsupported_or_small_values(value):
+    segments = []
+    assert shared_memory_transport.share_value(value, 1000, segments) is value
+    assert segments == []
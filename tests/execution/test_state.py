@@ -0,0 +1,157 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hamilton import driver
+from hamilton.execution import grouping, state
+from hamilton.lifecycle import base as lifecycle_base
+
+from tests.resources.dynamic_parallelism import parallel_linear_basic
+
+
+def _spilled_files(result_cache: state.DiskSpillingResultCache) -> list:
+    return sorted(os.listdir(result_cache.directory))
+
+
+def test_disk_spilling_result_cache_keeps_small_results_in_memory(tmp_path):
+    result_cache = state.DiskSpillingResultCache(
+        {}, directory=str(tmp_path), max_memory_bytes=0, spill_threshold_bytes=1000
+    )
+    result_cache.write({"foo": 1, "bar": "baz"}, "0", "expand-foo")
+    assert _spilled_files(result_cache) == []
+    assert result_cache.read(["foo", "bar"], "0", "expand-foo") == {"foo": 1, "bar": "baz"}
+
+
+@pytest.mark.parametrize(
+    "value,extension",
+    [
+        (np.arange(1000), ".npy"),
+        (pd.DataFrame({"a": np.arange(1000), "b": np.arange(1000) * 2.0}), ".arrow"),
+        (list(range(1000)), ".pkl"),
+        (np.array([{"a": 1}] * 1000, dtype=object), ".pkl"),
+    ],
+)
+def test_disk_spilling_result_cache_spills_by_type(value, extension, tmp_path):
+    pytest.importorskip("pyarrow")
+    result_cache = state.DiskSpillingResultCache(
+        {}, directory=str(tmp_path), max_memory_bytes=0, spill_threshold_bytes=100
+    )
+    result_cache.write({"foo": value})
+    assert [os.path.splitext(f)[1] for f in _spilled_files(result_cache)] == [extension]
+    assert "foo" not in result_cache.cache
+    read = result_cache.read(["foo"])["foo"]
+    if isinstance(value, pd.DataFrame):
+        pd.testing.assert_frame_equal(read, value)
+    elif isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        np.testing.assert_array_equal(read, value)
+        # memory-mapped, not loaded
+        assert isinstance(read, np.memmap)
+    else:
+        assert list(read) == list(value)
+
+
+def test_estimate_size_counts_objects_in_dataframes():
+    numbers = pd.DataFrame({"a": np.arange(10_000)})
+    assert state.estimate_size(numbers) == numbers.memory_usage(index=True).sum()
+    # more rows than we sample, with strings of the same size, so the estimate is exact
+    strings = numbers.assign(b=[f"{i:0100d}" for i in range(10_000)])
+    strings.index = strings["b"]
+    assert state.estimate_size(strings) == strings.memory_usage(index=True, deep=True).sum()
+    assert state.estimate_size(strings) > 10 * strings.memory_usage(index=True).sum()
+
+
+def test_disk_spilling_result_cache_spills_least_recently_used(tmp_path):
+    array_size = np.arange(1000).nbytes
+    result_cache = state.DiskSpillingResultCache(
+        {}, directory=str(tmp_path), max_memory_bytes=array_size * 2, spill_threshold_bytes=100
+    )
+    result_cache.write({"a": np.arange(1000), "b": np.arange(1000)})
+    result_cache.read(["a"])  # b is now least recently used
+    result_cache.write({"c": np.arange(1000)})
+    assert set(result_cache.cache) == {"a", "c"}
+    np.testing.assert_array_equal(result_cache.read(["b"])["b"], np.arange(1000))
+
+
+def test_disk_spilling_result_cache_never_spills_initial_results(tmp_path):
+    result_cache = state.DiskSpillingResultCache(
+        {"input": np.arange(1000)},
+        directory=str(tmp_path),
+        max_memory_bytes=0,
+        spill_threshold_bytes=100,
+    )
+    result_cache.write({"foo": np.arange(1000)})
+    assert set(result_cache.cache) == {"input"}
+
+
+def test_disk_spilling_result_cache_evict_removes_spilled_files(tmp_path):
+    result_cache = state.DiskSpillingResultCache(
+        {}, directory=str(tmp_path), max_memory_bytes=0, spill_threshold_bytes=100
+    )
+    result_cache.write({"foo": np.arange(1000)}, "0", "expand-foo")
+    assert len(_spilled_files(result_cache)) == 1
+    result_cache.evict(["foo"], "0", "expand-foo")
+    assert _spilled_files(result_cache) == []
+    assert result_cache.read(["foo"], "0", "expand-foo", optional=True) == {}
+
+
+def test_disk_spilling_result_cache_cleans_up_directory(tmp_path):
+    result_cache = state.DiskSpillingResultCache(
+        {}, directory=str(tmp_path), max_memory_bytes=0, spill_threshold_bytes=100
+    )
+    result_cache.write({"foo": np.arange(1000)})
+    directory = result_cache.directory
+    del result_cache
+    assert not os.path.exists(directory)
+
+
+def test_end_to_end_with_disk_spilling_result_cache(tmp_path):
+    dr = (
+        driver.Builder()
+        .with_modules(parallel_linear_basic)
+        .enable_dynamic_execution(allow_experimental_mode=True)
+        .with_result_cache(
+            functools.partial(
+                state.DiskSpillingResultCache,
+                directory=str(tmp_path),
+                max_memory_bytes=0,
+                spill_threshold_bytes=0,
+            )
+        )
+        .build()
+    )
+    res = dr.execute(["final"])
+    assert res["final"] == parallel_linear_basic._calc()
+
+
+def test_task_queue_by_priority():
+    tasks = [
+        grouping.TaskImplementation(
+            base_id=base_id,
+            spawning_task_base_id=None,
+            nodes=[],
+            purpose=grouping.NodeGroupPurpose.EXECUTE_BLOCK,
+            outputs_to_compute=[],
+            overrides={},
+            adapter=lifecycle_base.LifecycleAdapterSet(),
+            base_dependencies=[],
+            group_id=None,
+            realized_dependencies={},
+            spawning_task_id=None,
+        )
+        for base_id in ["a", "b", "c", "d"]
+    ]
+    fifo = state.TaskQueue()
+    prioritized = state.TaskQueue({"b": 2.0, "c": 1.0})
+    for task in tasks:
+        fifo.append(task)
+        prioritized.append(task)
+    assert [fifo.popleft().base_id for _ in range(4)] == ["a", "b", "c", "d"]
+    assert [prioritized.popleft().base_id for _ in range(3)] == ["b", "c", "a"]
+    # rejected tasks go back in front of the ones of the same priority
+    prioritized.appendleft(tasks[0])
+    assert sorted(task.base_id for task in prioritized) == ["a", "d"]
+    assert [prioritized.popleft().base_id for _ in range(2)] == ["a", "d"]
+    assert len(prioritized) == 0
@@ -3,7 +3,14 @@ import pytest
 
 from hamilton import function_modifiers, node
 from hamilton.function_modifiers import base as fm_base
-from hamilton.function_modifiers.metadata import RAY_REMOTE_TAG_NAMESPACE, ray_remote_options
+from hamilton.function_modifiers.metadata import (
+    DASK_SUBMIT_TAG_NAMESPACE,
+    ESTIMATED_COST_TAG,
+    RAY_REMOTE_TAG_NAMESPACE,
+    dask_submit_options,
+    estimated_cost,
+    ray_remote_options,
+)
 
 
 def test_tags():
@@ -238,3 +245,22 @@ def test_decorate_node_with_ray_remote_options():
     node_map = {node_.name: node_ for node_ in nodes}
     node_ = node_map["foo"]
     assert node_.tags[f"{RAY_REMOTE_TAG_NAMESPACE}.resources"] == '{"GPU": 1}'
+
+
+def test_decorate_node_with_dask_submit_options():
+    @dask_submit_options(resources={"GPU": 1}, priority=10)
+    def foo() -> pd.DataFrame:
+        return pd.DataFrame.from_records([{"foo": 1, "bar": 2.0, "baz": "3"}])
+
+    (node_,) = function_modifiers.base.resolve_nodes(foo, {})
+    assert node_.tags[f"{DASK_SUBMIT_TAG_NAMESPACE}.resources"] == '{"GPU": 1}'
+    assert node_.tags[f"{DASK_SUBMIT_TAG_NAMESPACE}.priority"] == "10"
+
+
+def test_decorate_node_with_estimated_cost():
+    @estimated_cost(seconds=2)
+    def foo() -> int:
+        return 1
+
+    (node_,) = function_modifiers.base.resolve_nodes(foo, {})
+    assert node_.tags[ESTIMATED_COST_TAG] == "2.0"
@@ -244,7 +244,10 @@ def test_modify_function_graph_with_extractor_factories():
     assert "input_data_1" in fn_graph_modified.nodes
     assert "input_data_2" in fn_graph_modified.nodes
     res = fn_graph_modified.execute(
-        nodes=[fn_graph_modified.nodes["first_node"], fn_graph_modified.nodes["second_node"]]
+        nodes=[
+            fn_graph_modified.nodes[name]
+            for name in ["first_node", "second_node", "input_data_1", "input_data_2"]
+        ]
     )
     assert res["input_data_1"] == {"test_extractor_factory_1": "ran_correctly"}
     assert res["input_data_2"] == {"test_extractor_factory_2": "ran_correctly"}
@@ -1,4 +1,5 @@
 import inspect
+import os
 import pathlib
 import shelve
 
@@ -138,3 +139,96 @@ def test_commit_nodes_history(hook: CacheAdapter):
     # need to reopen the hook cache
     with shelve.open(hook.cache_path) as cache:
         assert cache.get(CacheAdapter.nodes_history_key) == hook.nodes_history
+
+
+def test_fingerprints_are_passed_down(tmp_path: pathlib.Path, monkeypatch):
+    """Only external inputs are hashed -- downstream keys are derived from upstream keys."""
+    import pandas as pd
+
+    from hamilton import ad_hoc_utils, driver
+    from hamilton.caching import fingerprinting
+
+    def raw(external_input: int) -> pd.DataFrame:
+        return pd.DataFrame({"a": range(external_input)})
+
+    def doubled(raw: pd.DataFrame) -> pd.DataFrame:
+        return raw * 2
+
+    def total(doubled: pd.DataFrame, raw: pd.DataFrame) -> int:
+        return int(doubled["a"].sum() + raw["a"].sum())
+
+    hashed = []
+    hash_value = fingerprinting.hash_value
+
+    def tracking_hash_value(obj, *args, **kwargs):
+        hashed.append(obj)
+        return hash_value(obj, *args, **kwargs)
+
+    monkeypatch.setattr(fingerprinting, "hash_value", tracking_hash_value)
+    module = ad_hoc_utils.create_temporary_module(raw, doubled, total)
+    cache_path = str((tmp_path / "cache.db").resolve())
+    dr = (
+        driver.Builder()
+        .with_modules(module)
+        .with_adapters(CacheAdapter(cache_path=cache_path))
+        .build()
+    )
+
+    assert dr.execute(["total"], inputs={"external_input": 10})["total"] == 135
+    assert hashed == [10]
+
+    hashed.clear()
+    hook = CacheAdapter(cache_path=cache_path)
+    dr = driver.Builder().with_modules(module).with_adapters(hook).build()
+    assert dr.execute(["total"], inputs={"external_input": 10})["total"] == 135
+    assert hashed == [10]
+    assert hook.used_cache_keys == {}  # all cache hits
+
+
+def test_dataframe_results_are_stored_by_format(hook: CacheAdapter, tmp_path: pathlib.Path):
+    """Dataframes are stored as files next to the shelve, which references them."""
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    from hamilton.caching import serialization
+
+    def df(external_input: int) -> pd.DataFrame:
+        return pd.DataFrame({"a": range(external_input)})
+
+    hook.run_before_graph_execution(graph=graph_types.HamiltonGraph([]))  # needed to open cache
+    hook.cache_vars = ["df"]
+    node_kwargs = dict(external_input=3)
+    result = hook.run_to_execute_node(node_name="df", node_kwargs=node_kwargs, node_callable=df)
+    hook.run_after_node_execution(node_name="df", node_kwargs=node_kwargs, result=result)
+    (cache_key,) = [key for key in hook.cache if key != CacheAdapter.nodes_history_key]
+    assert isinstance(hook.cache[cache_key], serialization.StoredResult)
+    assert os.listdir(hook.results_path) == [f"{cache_key}.feather"]
+
+    from_cache = hook.run_to_execute_node(node_name="df", node_kwargs=node_kwargs, node_callable=df)
+    assert hook.used_cache_keys == {}  # cache hit
+    pd.testing.assert_frame_equal(from_cache, result)
+
+
+def test_metrics(tmp_path: pathlib.Path):
+    from hamilton import ad_hoc_utils, driver
+
+    def raw(external_input: int) -> list:
+        return list(range(external_input))
+
+    def total(raw: list) -> int:
+        return sum(raw)
+
+    module = ad_hoc_utils.create_temporary_module(raw, total)
+    cache_path = str((tmp_path / "cache.db").resolve())
+    hook = CacheAdapter(cache_path=cache_path)
+    dr = driver.Builder().with_modules(module).with_adapters(hook).build()
+    dr.execute(["total"], inputs={"external_input": 3})
+    cold = hook.metrics.summary()
+    assert (cold.hits, cold.misses) == (0, 2)
+
+    dr.execute(["total"], inputs={"external_input": 3})
+    warm = hook.metrics.by_node()
+    # raw is upstream of a hit, so it isn't even loaded
+    assert list(warm) == ["total"]
+    assert (warm["total"].hits, warm["total"].misses) == (1, 0)
+    assert len(hook.metrics.run_ids) == 2
@@ -171,3 +171,13 @@ def test_evict_from_driver(
 
     assert output["eviction_counter"] == 1
     assert hook.cache[h_diskcache.DiskCacheAdapter.nodes_history_key] == dict(A=[node_a_hash])
+
+
+def test_metrics(hook: h_diskcache.DiskCacheAdapter, node_a: node.Node):
+    module = ad_hoc_utils.create_temporary_module(node_a.callable)
+    dr = driver.Builder().with_modules(module).with_adapters(hook).build()
+    dr.execute(["A"], inputs={"external_input": 3})
+    assert (hook.metrics.by_node()["A"].hits, hook.metrics.by_node()["A"].misses) == (0, 1)
+
+    dr.execute(["A"], inputs={"external_input": 3})
+    assert (hook.metrics.by_node()["A"].hits, hook.metrics.by_node()["A"].misses) == (1, 0)
@@ -0,0 +1,17 @@
+import numpy as np
+
+
+def large(size: int) -> np.ndarray:
+    return np.ones(size)
+
+
+def doubled(large: np.ndarray) -> np.ndarray:
+    return large * 2
+
+
+def tripled(doubled: np.ndarray) -> np.ndarray:
+    return doubled * 3
+
+
+def large_total(tripled: np.ndarray) -> float:
+    return float(tripled.sum())
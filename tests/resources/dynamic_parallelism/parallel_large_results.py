@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from hamilton.htypes import Collect, Parallelizable
+
+
+def chunk(base: np.ndarray, number_of_chunks: int) -> Parallelizable[int]:
+    for i in range(number_of_chunks):
+        yield i
+
+
+def scaled(chunk: int, base: np.ndarray) -> np.ndarray:
+    return base * chunk
+
+
+def scaled_frame(scaled: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({"scaled": scaled})
+
+
+def total(scaled_frame: Collect[pd.DataFrame]) -> float:
+    return float(sum(item["scaled"].sum() for item in scaled_frame))
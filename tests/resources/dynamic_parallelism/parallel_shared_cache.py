@@ -0,0 +1,21 @@
+import os
+import time
+
+from hamilton.htypes import Collect, Parallelizable
+
+
+def item(number_of_items: int) -> Parallelizable[int]:
+    for _ in range(number_of_items):
+        yield 7  # every branch computes the same thing
+
+
+def expensive(item: int, log_dir: str) -> int:
+    # leaves a file behind, so that computations can be counted across processes
+    with open(os.path.join(log_dir, f"{os.getpid()}-{time.time_ns()}"), "w"):
+        pass
+    time.sleep(0.5)
+    return item * 2
+
+
+def total(expensive: Collect[int]) -> int:
+    return sum(expensive)
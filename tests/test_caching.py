@@ -1,12 +1,15 @@
+import json
 import logging
-from typing import Any
+import os
+from typing import Any, Tuple
 
 import pandas as pd
 import pytest
 
-from hamilton import base
+from hamilton import ad_hoc_utils, base
 from hamilton.driver import Driver
 from hamilton.experimental import h_cache
+from hamilton.function_modifiers import tag
 
 from tests import nodes
 
@@ -202,3 +205,158 @@ def test_dispatch(tmp_path, caplog):
     pd.testing.assert_frame_equal(actual, expected)
     # both the forced node and the node dependent on it is computed
     assert {"json df", "parquet df", "combined"} == {rec.message for rec in caplog.records}
+
+
+def test_caching_invalidated_by_inputs(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    cache_path = str(tmp_path)
+
+    def _execute(initial: str) -> h_cache.CachingGraphAdapter:
+        adapter = h_cache.CachingGraphAdapter(
+            cache_path,
+            base.DictResult(),
+            readers={"str": read_str},
+            writers={"str": write_str},
+        )
+        dr = Driver({"initial": initial}, nodes, adapter=adapter)
+        assert dr.execute(["both"])["both"] == {
+            "lower": initial.lower(),
+            "upper": initial.upper(),
+        }
+        return adapter
+
+    adapter = _execute("Hello, World!")
+    assert adapter.expected_hits == set()
+    assert {"lowercased", "uppercased", "both"} == {rec.message for rec in caplog.records}
+
+    caplog.clear()
+    # a new adapter decides what to load from cache before executing, from the manifest
+    adapter = _execute("Hello, World!")
+    assert adapter.expected_hits == {"lowercased", "uppercased", "both"}
+    assert not {rec.message for rec in caplog.records}
+
+    caplog.clear()
+    adapter = _execute("Goodbye, World!")
+    assert adapter.expected_hits == set()
+    assert {"lowercased", "uppercased", "both"} == {rec.message for rec in caplog.records}
+
+
+def test_caching_metrics(tmp_path):
+    cache_path = str(tmp_path)
+
+    def _execute() -> h_cache.CachingGraphAdapter:
+        adapter = h_cache.CachingGraphAdapter(
+            cache_path,
+            base.DictResult(),
+            readers={"str": read_str},
+            writers={"str": write_str},
+        )
+        Driver({"initial": "Hello, World!"}, nodes, adapter=adapter).execute(["both"])
+        return adapter
+
+    cold = _execute().metrics.by_node()
+    assert {name: stats.misses for name, stats in cold.items()} == {
+        "lowercased": 1,
+        "uppercased": 1,
+        "both": 1,
+    }
+    assert cold["both"].bytes_written == os.path.getsize(os.path.join(cache_path, "both.json"))
+
+    # upstream of a hit, lowercased and uppercased aren't loaded
+    warm = _execute().metrics.by_node()
+    assert list(warm) == ["both"]
+    assert (warm["both"].hits, warm["both"].bytes_read) == (1, cold["both"].bytes_written)
+
+
+def test_caching_invalidated_by_upstream_code(tmp_path, caplog):
+    """Changing a node that isn't cached invalidates the cached nodes downstream of it."""
+    caplog.set_level(logging.INFO)
+    cache_path = str(tmp_path)
+
+    def stripped_v1(initial: str) -> str:
+        return initial.strip()
+
+    def stripped_v2(initial: str) -> str:
+        return initial.strip(" !")
+
+    @tag(cache="str")
+    def lowercased(stripped: str) -> str:
+        logging.info("lowercased")
+        return stripped.lower()
+
+    def _execute(stripped) -> Tuple[str, h_cache.CachingGraphAdapter]:
+        stripped.__name__ = "stripped"
+        module = ad_hoc_utils.create_temporary_module(stripped, lowercased)
+        adapter = h_cache.CachingGraphAdapter(
+            cache_path,
+            base.DictResult(),
+            readers={"str": read_str},
+            writers={"str": write_str},
+        )
+        dr = Driver({"initial": " Hello, World! "}, module, adapter=adapter)
+        caplog.clear()
+        return dr.execute(["lowercased"])["lowercased"], adapter
+
+    assert _execute(stripped_v1)[0] == "hello, world!"
+    assert {"lowercased"} == {rec.message for rec in caplog.records}
+    result, adapter = _execute(stripped_v1)
+    assert result == "hello, world!"
+    assert adapter.expected_hits == {"lowercased"}
+    assert not caplog.records
+    result, adapter = _execute(stripped_v2)
+    assert result == "hello, world"
+    assert adapter.expected_hits == set()
+    assert {"lowercased"} == {rec.message for rec in caplog.records}
+
+
+def test_caching_manifest_merged_across_runs(tmp_path):
+    """Runs sharing a cache directory keep each other's manifest entries."""
+    cache_path = str(tmp_path)
+
+    def _adapter() -> h_cache.CachingGraphAdapter:
+        return h_cache.CachingGraphAdapter(
+            cache_path,
+            base.DictResult(),
+            readers={"str": read_str},
+            writers={"str": write_str},
+        )
+
+    # both adapters read the (empty) manifest before either run writes to it
+    lower_adapter, upper_adapter = _adapter(), _adapter()
+    Driver({"initial": "Hello"}, nodes, adapter=lower_adapter).execute(["lowercased"])
+    Driver({"initial": "Hello"}, nodes, adapter=upper_adapter).execute(["uppercased"])
+    with open(os.path.join(cache_path, h_cache.MANIFEST_FILE), encoding="utf8") as file:
+        assert set(json.load(file)) == {"lowercased", "uppercased"}
+
+    adapter = _adapter()
+    Driver({"initial": "Hello"}, nodes, adapter=adapter).execute(["lowercased", "uppercased"])
+    assert adapter.expected_hits == {"lowercased", "uppercased"}
+
+
+def test_caching_fingerprints_only_upstream_of_cached_nodes(tmp_path, monkeypatch):
+    hashed = []
+    hash_value = h_cache.fingerprinting.hash_value
+
+    def _hash_value(obj, *args, **kwargs):
+        hashed.append(obj)
+        return hash_value(obj, *args, **kwargs)
+
+    monkeypatch.setattr(h_cache.fingerprinting, "hash_value", _hash_value)
+
+    def unused_input(uncached_input: str) -> str:
+        return uncached_input
+
+    @tag(cache="str")
+    def cached(cached_input: str) -> str:
+        return cached_input
+
+    module = ad_hoc_utils.create_temporary_module(unused_input, cached)
+    adapter = h_cache.CachingGraphAdapter(
+        str(tmp_path),
+        base.DictResult(),
+        readers={"str": read_str},
+        writers={"str": write_str},
+    )
+    dr = Driver({"cached_input": "a", "uncached_input": "b"}, module, adapter=adapter)
+    assert dr.execute(["unused_input", "cached"]) == {"unused_input": "b", "cached": "a"}
+    assert hashed == ["a"]
@@ -64,3 +64,18 @@ def test_convert_output_values_error():
             [tests.resources.test_default_args.A, tests.resources.cyclic_functions.A],
             {tests.resources.test_default_args.__name__},
         )
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = common.LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a is now the most recently used
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.cache_info() == common.CacheInfo(hits=3, misses=1, maxsize=2, currsize=2)
+    cache.clear()
+    assert cache.cache_info() == common.CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
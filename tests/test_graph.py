@@ -473,6 +473,16 @@ def test_execute():
     assert actual["A"] == 8
 
 
+def test_function_graph_execution_plan_is_cached():
+    fg = graph.FunctionGraph.from_modules(tests.resources.dummy_functions, config={})
+    nodes = [fg.nodes["B"], fg.nodes["C"]]
+    plan = fg.get_execution_plan(nodes, input_keys={"b", "c"})
+    assert fg.get_execution_plan(nodes, input_keys={"c", "b"}) is plan
+    assert fg.get_execution_plan(nodes, input_keys={"b", "c"}, override_keys={"A"}) is not plan
+    assert fg.execute(nodes, inputs={"b": 2, "c": 5}) == {"B": 49, "C": 14, "b": 2, "c": 5}
+    assert fg.execute(nodes, inputs={"b": 3, "c": 5}) == {"B": 64, "C": 16, "b": 3, "c": 5}
+
+
 def test_get_required_functions():
     """Exercises getting the subset of the graph for computation on the toy example we have constructed."""
     nodes = create_testing_nodes()
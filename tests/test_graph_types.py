@@ -1,3 +1,4 @@
+import gc
 import inspect
 import json
 import sys
@@ -5,7 +6,7 @@ import textwrap
 
 import pytest
 
-from hamilton import driver, graph_types, node
+from hamilton import ad_hoc_utils, driver, graph_types, node
 from hamilton.node import Node, NodeType
 
 from tests import nodes as test_nodes
@@ -253,3 +254,62 @@ def test_different_hash_comment(func_a: str, func_a_comment: str, strip: bool):
     func_a_hash = graph_types.hash_source_code(func_a, strip=strip)
     func_a_comment = graph_types.hash_source_code(func_a_comment, strip=strip)
     assert (func_a_hash == func_a_comment) is (True if strip else False)
+
+
+def test_hash_source_code_memoized_by_code_object(monkeypatch):
+    """Source is read once per code object and strip setting, then reused."""
+
+    def foo(i: int) -> int:
+        """Docs"""
+        return i
+
+    calls = []
+    getsource = inspect.getsource
+
+    def counting_getsource(obj):
+        calls.append(obj)
+        return getsource(obj)
+
+    monkeypatch.setattr(inspect, "getsource", counting_getsource)
+    stripped = graph_types.hash_source_code(foo, strip=True)
+    assert graph_types.hash_source_code(foo, strip=True) == stripped
+    assert len(calls) == 1
+    assert graph_types.hash_source_code(foo, strip=False) != stripped
+    assert len(calls) == 2
+    n = Node("foo", int, "", foo, node_source=NodeType.STANDARD, originating_functions=(foo,))
+    assert graph_types.HamiltonNode.from_node(n).version == stripped
+    assert len(calls) == 2
+
+
+def test_hash_source_code_wrapped_functions_are_distinct():
+    """Wrappers share a code object, so we have to key by the wrapped function's code."""
+    import functools
+
+    def wrap(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    def foo(i: int) -> int:
+        return i
+
+    def bar(i: int) -> int:
+        return i + 1
+
+    assert graph_types.hash_source_code(wrap(foo)) == graph_types.hash_source_code(foo)
+    assert graph_types.hash_source_code(wrap(bar)) == graph_types.hash_source_code(bar)
+    assert graph_types.hash_source_code(wrap(foo)) != graph_types.hash_source_code(wrap(bar))
+
+
+def test_hash_source_code_does_not_keep_code_alive():
+    """Temporary modules (E.G. in long-running services) should not be pinned by the memoization."""
+    module = ad_hoc_utils.module_from_source("def foo(i: int) -> int:\n    return i\n")
+    code_id = id(module.foo.__code__)
+    graph_types.hash_source_code(module.foo, strip=True)
+    assert code_id in graph_types._SOURCE_HASHES
+    del sys.modules[module.__name__]
+    del module
+    gc.collect()
+    assert code_id not in graph_types._SOURCE_HASHES
@@ -640,3 +640,27 @@ def test_variable_from_node():
     assert v.tags == n.tags
     assert v.documentation == n.documentation == "This is a doctstring"
     assert v.originating_functions == n.originating_functions
+
+
+def test_driver_memoizes_upstream_node_resolution():
+    dr = Builder().with_modules(tests.resources.very_simple_dag).build()
+    assert dr.execute(["b"], inputs={"a": 1}) == {"b": 1}
+    assert dr.execute(["b"], inputs={"a": 2}) == {"b": 2}
+    cache_info = dr.upstream_node_cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (1, 1, 1)
+    # Different shape (different input keys) is a miss
+    assert dr.execute(["b"], inputs={"a": 1}, overrides={"b": 3}) == {"b": 3}
+    assert dr.upstream_node_cache_info().misses == 2
+
+
+def test_driver_memoized_upstream_node_resolution_still_validates():
+    dr = Builder().with_modules(tests.resources.very_simple_dag).build()
+    dr.execute(["b"], inputs={"a": 1})
+    # Type validation depends on the value, so is run on a cache hit as well
+    with pytest.raises(ValueError, match="Type requirement mismatch"):
+        dr.execute(["b"], inputs={"a": "not_an_int"})
+    with pytest.raises(ValueError, match="Required input a not provided"):
+        dr.execute(["b"], inputs={})
+    with pytest.raises(ValueError, match="Required input a not provided"):
+        dr.execute(["b"], inputs={})
+    assert dr.upstream_node_cache_info().hits == 2
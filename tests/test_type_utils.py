@@ -8,6 +8,7 @@ import pytest
 
 from hamilton import htypes
 from hamilton.htypes import check_instance
+from hamilton.lifecycle.default import FunctionInputOutputTypeChecker
 
 
 class X:
@@ -404,3 +405,46 @@ def test_with_random_object():
     assert not check_instance(
         RandomObject(), Union[int, str, list, dict, None, float, bool, bytes, complex, type(None)]
     )
+
+
+def test_compile_instance_check_is_cached():
+    check = htypes.compile_instance_check(List[Dict[str, int]])
+    assert check is htypes.compile_instance_check(List[Dict[str, int]])
+    assert check([{"a": 1}])
+    assert not check([{"a": "1"}])
+    assert htypes.compile_instance_check(List[int], 10) is not htypes.compile_instance_check(
+        List[int]
+    )
+
+
+def test_check_instance_with_subclass_elements():
+    assert check_instance([X(), Y()], List[X])
+    assert not check_instance([X(), Y()], List[Y])
+    assert check_instance({Y(): [True, 1]}, Dict[X, List[int]])
+
+
+def test_check_instance_with_sample_size():
+    values = list(range(1000))
+    assert not check_instance(values + ["a"], List[int])
+    # the last element isn't part of the sample
+    assert check_instance(values + ["a"], List[int], sample_size=10)
+    # samples are spread over the list
+    assert not check_instance(values[:500] + ["a"] * 500, List[int], sample_size=10)
+    assert not check_instance({"a": [1, "b"]}, Dict[str, List[int]], sample_size=10)
+    assert check_instance({**dict.fromkeys(range(100)), "a": None}, Dict[int, None], sample_size=10)
+
+
+@pytest.mark.parametrize("sample_size", [0, -1])
+def test_check_instance_rejects_invalid_sample_size(sample_size: int):
+    with pytest.raises(ValueError, match="sample_size"):
+        check_instance([1, 2, 3], List[int], sample_size)
+    with pytest.raises(ValueError, match="sample_size"):
+        FunctionInputOutputTypeChecker(sample_size=sample_size)
+
+
+def test_check_input_type_is_cached():
+    check = htypes.compile_input_type_check(Union[int, List[int]])
+    assert check is htypes.compile_input_type_check(Union[int, List[int]])
+    assert check(1)
+    assert check([1])
+    assert not check("1")